@@ -1,5 +1,6 @@
 from .retriever import get_retriever, get_retrievers
 from .query_processing import plan_research_outline
+from .ranking import fuse_search_results
 from .agent_creator import extract_json_with_regex, choose_agent
 from .web_scraping import scrape_urls
 from .report_generation import write_conclusion, summarize_url, generate_draft_section_titles, generate_report, write_report_introduction
@@ -10,6 +11,7 @@ __all__ = [
     "get_retriever",
     "get_retrievers",
     "plan_research_outline",
+    "fuse_search_results",
     "extract_json_with_regex",
     "scrape_urls",
     "write_conclusion",
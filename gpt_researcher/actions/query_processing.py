@@ -7,19 +7,22 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-async def get_search_results(query: str, retriever: Any) -> List[Dict[str, Any]]:
+# Characters of each search result's snippet given to the LLM when planning the research
+PLANNING_SNIPPET_LENGTH = 500
+
+def planning_context(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Get web search results for a given query.
-    
-    Args:
-        query: The search query
-        retriever: The retriever instance
-    
-    Returns:
-        A list of search results
+    Keeps the title, href and snippet of each search result. Retrievers may return whole pages
+    (`raw_content`, or a full text `body`), which must not be sent to the LLM when planning.
     """
-    search_retriever = retriever(query)
-    return search_retriever.search()
+    return [
+        {
+            "title": result.get("title", ""),
+            "href": result.get("href") or result.get("url", ""),
+            "body": (result.get("body") or "")[:PLANNING_SNIPPET_LENGTH],
+        }
+        for result in search_results
+    ]
 
 async def generate_sub_queries(
     query: str,
@@ -105,7 +108,7 @@ async def plan_research_outline(
     
     Args:
         query: Original query
-        retriever: Retriever instance
+        search_results: Results of the planning search, reduced to their snippets for the prompt
         agent_role_prompt: Agent role prompt
         cfg: Configuration object
         parent_query: Parent query
@@ -120,7 +123,7 @@ async def plan_research_outline(
         query,
         parent_query,
         report_type,
-        search_results,
+        planning_context(search_results),
         cfg,
         cost_callback
     )
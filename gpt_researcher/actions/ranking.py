@@ -0,0 +1,57 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..scraper.cache import normalize_url
+from ..utils.text import cosine_similarity, tokenize
+
+# Reciprocal rank fusion constant; damps the advantage of the very top ranks
+RRF_K = 60
+# Share of the final score given to how well the search snippet matches the query
+SNIPPET_WEIGHT = 0.3
+
+
+def fuse_search_results(
+    query: str,
+    results_per_retriever: Sequence[List[Dict[str, Any]]],
+    weights: Optional[Sequence[float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Merges the ranked results of several retrievers into a single ranking.
+
+    Every url scores the weighted reciprocal rank fusion of its positions in the retrievers'
+    results, normalized to [0, 1], blended with the similarity of its best search snippet to the
+    query. Results for the same (normalized) url are merged, keeping the first one seen.
+
+    Args:
+        query: The query the results were searched for
+        results_per_retriever: The results of each retriever, best first
+        weights: The weight of each retriever, 1.0 for all if not given
+
+    Returns:
+        The merged search results, best first, each with its fused `score`
+    """
+    weights = list(weights) if weights is not None else [1.0] * len(results_per_retriever)
+    max_rrf = sum(weight for weight in weights if weight > 0) / (RRF_K + 1)
+    query_tokens = tokenize(query)
+
+    fused: Dict[str, Dict[str, Any]] = {}
+    for weight, search_results in zip(weights, results_per_retriever):
+        for rank, result in enumerate(search_results, start=1):
+            url = result.get("href") or result.get("url")
+            if not url:
+                continue
+            key = normalize_url(url)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = {"result": result, "rrf": 0.0, "similarity": 0.0}
+            entry["rrf"] += weight / (RRF_K + rank)
+            body = result.get("body") or (result.get("raw_content") or "")[:1000]
+            snippet = f"{result.get('title') or ''} {body}"
+            entry["similarity"] = max(entry["similarity"], cosine_similarity(query_tokens, tokenize(snippet)))
+
+    ranked = []
+    for entry in fused.values():
+        rrf = entry["rrf"] / max_rrf if max_rrf > 0 else 0.0
+        score = (1 - SNIPPET_WEIGHT) * rrf + SNIPPET_WEIGHT * entry["similarity"]
+        ranked.append({**entry["result"], "score": score})
+    ranked.sort(key=lambda result: result["score"], reverse=True)
+    return ranked
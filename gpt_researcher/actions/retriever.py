@@ -64,6 +64,10 @@ def get_retriever(retriever):
             from gpt_researcher.retrievers import CustomRetriever
 
             retriever = CustomRetriever
+        case "local_index":
+            from gpt_researcher.retrievers import LocalIndexSearch
+
+            retriever = LocalIndexSearch
 
         case _:
             retriever = None
@@ -6,9 +6,9 @@ from ..utils.logger import get_formatted_logger
 
 logger = get_formatted_logger()
 
-def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+async def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
-    Scrapes the urls
+    Scrapes the urls concurrently on the running event loop
     Args:
         urls: List of urls
         cfg: Config (optional)
@@ -26,8 +26,8 @@ def scrape_urls(urls, cfg=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, An
     )
 
     try:
-        scraper = Scraper(urls, user_agent, cfg.scraper)
-        scraped_data = scraper.run()
+        scraper = Scraper(urls, user_agent, cfg.scraper, cfg)
+        scraped_data = await scraper.run()
         for item in scraped_data:
             if 'image_urls' in item:
                 images.extend([img for img in item['image_urls']])
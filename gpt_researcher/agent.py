@@ -2,7 +2,7 @@ from typing import Optional, List, Dict, Any, Set
 import json
 
 from .config import Config
-from .memory import Memory
+from .memory import Memory, EmbeddingCache
 from .utils.enum import ReportSource, ReportType, Tone
 from .llm_provider import GenericLLMProvider
 from .vector_store import VectorStoreWrapper
@@ -79,7 +79,11 @@ class GPTResearcher:
         self.research_costs = 0.0
         self.retrievers = get_retrievers(self.headers, self.cfg)
         self.memory = Memory(
-            self.cfg.embedding_provider, self.cfg.embedding_model, **self.cfg.embedding_kwargs
+            self.cfg.embedding_provider,
+            self.cfg.embedding_model,
+            embedding_cache=EmbeddingCache.from_config(self.cfg),
+            cost_callback=self.add_costs,
+            **self.cfg.embedding_kwargs,
         )
         self.log_handler = log_handler
 
@@ -222,5 +222,7 @@ class Config:
             return env_value
         elif origin is list or origin is List:
             return json.loads(env_value)
+        elif origin is dict or origin is Dict:
+            return json.loads(env_value)
         else:
             raise ValueError(f"Unsupported type {type_hint} for key {key}")
@@ -1,11 +1,21 @@
-from typing import Union
+from typing import Dict, Union
 from typing_extensions import TypedDict
 
 
 class BaseConfig(TypedDict):
     RETRIEVER: str
+    RETRIEVER_TIMEOUT: int
+    RETRIEVER_WEIGHTS: Dict[str, float]
+    MAX_SCRAPE_URLS_PER_QUERY: int
+    PREFETCH_PLANNING_URLS: int
+    ACADEMIC_ABSTRACTS_FIRST: bool
+    ACADEMIC_FULL_TEXT_PAPERS: int
+    RETRIEVER_RAW_CONTENT: bool
+    RETRIEVER_QUOTAS: Dict[str, Dict[str, float]]
     EMBEDDING: str
     SIMILARITY_THRESHOLD: float
+    SIMILARITY_FALLBACK_RESULTS: int
+    CONTEXT_PREFILTER_CHUNKS: int
     FAST_LLM: str
     SMART_LLM: str
     STRATEGIC_LLM: str
@@ -26,6 +36,30 @@ class BaseConfig(TypedDict):
     LANGUAGE: str
     AGENT_ROLE: Union[str, None]
     SCRAPER: str
+    SCRAPER_MAX_CONNECTIONS: int
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int
+    SCRAPER_HOST_REQUESTS_PER_SECOND: float
+    SCRAPER_HOST_FAILURE_THRESHOLD: int
+    SCRAPER_HOST_COOLDOWN: int
+    SCRAPER_ADAPTIVE_TIMEOUT: bool
+    SCRAPER_DOWNLOAD_TIMEOUT: Union[int, None]
+    SCRAPER_QUORUM: int
+    SCRAPER_PARSE_WORKERS: int
+    SCRAPER_PARSE_BATCH_SIZE: int
+    SCRAPER_CACHE_PATH: Union[str, None]
+    SCRAPER_CACHE_TTL: int
+    SCRAPER_CACHE_MAX_SIZE_MB: int
+    SEARCH_CACHE_PATH: Union[str, None]
+    SEARCH_CACHE_TTL: int
+    SEARCH_CACHE_MAX_SIZE_MB: int
+    EMBEDDING_CACHE_PATH: Union[str, None]
+    EMBEDDING_CACHE_MAX_SIZE_MB: int
+    BROWSER_POOL_SIZE: int
+    BROWSER_MAX_PAGES_PER_DRIVER: int
+    PDF_MAX_PAGES: int
+    PDF_MAX_SIZE_MB: int
+    PDF_EXTRACT_WORKERS: int
     MAX_SUBTOPICS: int
     REPORT_SOURCE: Union[str, None]
     DOC_PATH: str
+    DOC_INDEX_PATH: Union[str, None]
@@ -2,8 +2,18 @@ from .base import BaseConfig
 
 DEFAULT_CONFIG: BaseConfig = {
     "RETRIEVER": "tavily",
+    "RETRIEVER_TIMEOUT": 30,
+    "RETRIEVER_WEIGHTS": {},
+    "MAX_SCRAPE_URLS_PER_QUERY": 5,
+    "PREFETCH_PLANNING_URLS": 0,
+    "ACADEMIC_ABSTRACTS_FIRST": False,
+    "ACADEMIC_FULL_TEXT_PAPERS": 2,
+    "RETRIEVER_RAW_CONTENT": False,
+    "RETRIEVER_QUOTAS": {},
     "EMBEDDING": "openai:text-embedding-3-large",
     "SIMILARITY_THRESHOLD": 0.42,
+    "SIMILARITY_FALLBACK_RESULTS": 3,
+    "CONTEXT_PREFILTER_CHUNKS": 0,
     "FAST_LLM": "openai:o3-mini-2025-01-31",
     "SMART_LLM": "openai:gpt-4o-2024-11-20",
     "STRATEGIC_LLM": "openai:o1-2024-12-17", # Can be used with gpt-o1
@@ -22,9 +32,33 @@ DEFAULT_CONFIG: BaseConfig = {
     "REPORT_FORMAT": "APA",
     "MAX_ITERATIONS": 4,
     "AGENT_ROLE": None,
-    "SCRAPER": "bs",
+    "SCRAPER": "lxml",
+    "SCRAPER_MAX_CONNECTIONS": 100,
+    "SCRAPER_MAX_CONNECTIONS_PER_HOST": 6,
+    "SCRAPER_HOST_REQUESTS_PER_SECOND": 4.0,
+    "SCRAPER_HOST_FAILURE_THRESHOLD": 3,
+    "SCRAPER_HOST_COOLDOWN": 60,
+    "SCRAPER_ADAPTIVE_TIMEOUT": True,
+    "SCRAPER_DOWNLOAD_TIMEOUT": 60,
+    "SCRAPER_QUORUM": 0,
+    "SCRAPER_PARSE_WORKERS": 0,
+    "SCRAPER_PARSE_BATCH_SIZE": 8,
+    "SCRAPER_CACHE_PATH": None,
+    "SCRAPER_CACHE_TTL": 86400,
+    "SCRAPER_CACHE_MAX_SIZE_MB": 512,
+    "SEARCH_CACHE_PATH": None,
+    "SEARCH_CACHE_TTL": 21600,
+    "SEARCH_CACHE_MAX_SIZE_MB": 64,
+    "EMBEDDING_CACHE_PATH": None,
+    "EMBEDDING_CACHE_MAX_SIZE_MB": 256,
+    "BROWSER_POOL_SIZE": 3,
+    "BROWSER_MAX_PAGES_PER_DRIVER": 50,
+    "PDF_MAX_PAGES": 50,
+    "PDF_MAX_SIZE_MB": 20,
+    "PDF_EXTRACT_WORKERS": 1,
     "MAX_SUBTOPICS": 3,
     "LANGUAGE": "english",
     "REPORT_SOURCE": "local",
-    "DOC_PATH": "./my-docs"
+    "DOC_PATH": "./my-docs",
+    "DOC_INDEX_PATH": None
 }
@@ -1,18 +1,115 @@
-import os
 import asyncio
-from typing import Optional
-from .retriever import SearchAPIRetriever, SectionRetriever
-from langchain.retrievers import (
-    ContextualCompressionRetriever,
-)
-from langchain.retrievers.document_compressors import (
-    DocumentCompressorPipeline,
-    EmbeddingsFilter,
-)
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from ..vector_store import VectorStoreWrapper
 from ..utils.costs import estimate_embedding_cost
 from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
+from ..utils.text import bm25_matrix
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+DEFAULT_SIMILARITY_THRESHOLD = 0.42
+DEFAULT_FALLBACK_RESULTS = 3
+
+
+def charge_embedding_cost(embeddings, texts: List[str], cost_callback=None) -> None:
+    """
+    Charges the estimated cost of embedding the texts, unless the embeddings charge for the texts
+    they actually send to the provider themselves (`CachedEmbeddings` with `on_embed`).
+    """
+    if cost_callback and getattr(embeddings, "on_embed", None) is None:
+        cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=texts))
+
+
+def format_chunks(chunks: List[Dict]) -> str:
+    """
+    Formats ranked chunks (`url`, `title`, `score` and `content`) as research context.
+    """
+    return f"\n".join(f"Source: {chunk.get('url', '')}\n"
+                      f"Title: {chunk.get('title', '')}\n"
+                      f"Relevance: {chunk['score']:.2f}\n"
+                      f"Content: {chunk['content']}\n"
+                      for chunk in chunks)
+
+
+def similarity_matrix(query_vectors, chunk_vectors) -> np.ndarray:
+    """
+    Cosine similarities of every query to every chunk, as a (queries x chunks) float32 matrix
+    computed with a single matrix product.
+    """
+    queries = _normalize_rows(np.asarray(query_vectors, dtype=np.float32))
+    chunks = _normalize_rows(np.ascontiguousarray(chunk_vectors, dtype=np.float32))
+    return queries @ chunks.T
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int, threshold: float, fallback: int = 0) -> np.ndarray:
+    """
+    Indices of the (at most) k highest scores above the threshold, best first. When no score
+    clears the threshold, the `fallback` highest positive scores are returned instead.
+    """
+    candidates = np.flatnonzero(scores > threshold)
+    if not len(candidates) and fallback > 0:
+        candidates = np.flatnonzero(scores > 0)
+        k = min(k, fallback)
+    if k <= 0:
+        return candidates[:0]
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def lexical_candidates(queries: List[str], chunks: List[str], max_chunks: int) -> List[int]:
+    """
+    Indices of the chunks worth embedding: the union of the `max_chunks` best BM25 matches of
+    every query. A query without any keyword match keeps every chunk, since only embeddings can
+    tell which of them are relevant.
+    """
+    candidates = set()
+    for query_scores in bm25_matrix(queries, chunks):
+        if not query_scores.any():
+            return list(range(len(chunks)))
+        candidates.update(top_k_indices(query_scores, max_chunks, 0.0).tolist())
+    return sorted(candidates)
+
+
+def _split_chunks(texts: List[str]) -> Tuple[List[str], List[int]]:
+    """
+    Returns the unique chunks of the texts and the index of the text each one was first found in.
+    """
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = {}
+    for i, text in enumerate(texts):
+        for chunk in splitter.split_text(text or ""):
+            chunks.setdefault(chunk, i)
+    return list(chunks), list(chunks.values())
+
+
+async def _rank_chunks(embeddings, chunks: List[str], queries: List[str], max_results: int,
+                       threshold: float, fallback: int = 0) -> List[List[Tuple[int, float]]]:
+    """
+    Ranks the chunks for every query, returning the (chunk index, score) of its best chunks.
+    """
+    if not chunks:
+        return [[] for _ in queries]
+    # Queries are embedded concurrently as queries: some models embed queries and documents differently
+    chunk_vectors, query_vectors = await asyncio.gather(
+        embeddings.aembed_documents(chunks),
+        asyncio.gather(*[embeddings.aembed_query(query) for query in queries]),
+    )
+    scores = similarity_matrix(query_vectors, chunk_vectors)
+    return [
+        [(int(i), float(query_scores[i])) for i in top_k_indices(query_scores, max_results, threshold, fallback)]
+        for query_scores in scores
+    ]
 
 
 class VectorstoreCompressor:
@@ -36,40 +133,51 @@ class VectorstoreCompressor:
 
 
 class ContextCompressor:
-    def __init__(self, documents, embeddings, max_results=5, **kwargs):
+    """
+    Selects the chunks of the documents most similar to one or more queries.
+
+    The documents are split and every unique chunk is embedded once, however many queries are
+    asked. Chunk and query vectors are stacked into float32 matrices and scored for all queries
+    with a single matrix product, then the best `max_results` chunks of each query are kept.
+    When no chunk clears the similarity threshold, the best `fallback_results` are kept instead.
+    With `prefilter_chunks`, only the best BM25 matches of every query are embedded.
+    """
+
+    def __init__(self, documents, embeddings, max_results=5, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                 fallback_results=DEFAULT_FALLBACK_RESULTS, prefilter_chunks=0, **kwargs):
         self.max_results = max_results
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
-        self.similarity_threshold = os.environ.get("SIMILARITY_THRESHOLD", 0.35)
-
-    def __get_contextual_retriever(self):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SearchAPIRetriever(
-            pages=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
-
-    def __pretty_print_docs(self, docs, top_n):
-        return f"\n".join(f"Source: {d.metadata.get('source')}\n"
-                          f"Title: {d.metadata.get('title')}\n"
-                          f"Content: {d.page_content}\n"
-                          for i, d in enumerate(docs) if i < top_n)
+        self.similarity_threshold = float(similarity_threshold)
+        self.fallback_results = fallback_results
+        self.prefilter_chunks = prefilter_chunks
+
+    async def async_get_contexts(self, queries: List[str], max_results=5, cost_callback=None) -> List[str]:
+        """
+        Returns the context of every query: its `max_results` most similar chunks, best first.
+        """
+        chunks, page_indices = _split_chunks([page.get("raw_content") for page in self.documents])
+        if not chunks or not queries:
+            return ["" for _ in queries]
+        if self.prefilter_chunks and len(chunks) > self.prefilter_chunks:
+            candidates = lexical_candidates(queries, chunks, self.prefilter_chunks)
+            chunks, page_indices = [chunks[i] for i in candidates], [page_indices[i] for i in candidates]
+        charge_embedding_cost(self.embeddings, chunks + list(queries), cost_callback)
+
+        pages = [self.documents[i] for i in page_indices]
+        ranked = await _rank_chunks(self.embeddings, chunks, queries, max_results,
+                                    self.similarity_threshold, self.fallback_results)
+        return [
+            format_chunks([
+                {"url": pages[i].get("url", ""), "title": pages[i].get("title", ""), "score": score, "content": chunks[i]}
+                for i, score in query_ranked
+            ])
+            for query_ranked in ranked
+        ]
 
     async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
-        if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query)
-        return self.__pretty_print_docs(relevant_docs, max_results)
+        return (await self.async_get_contexts([query], max_results, cost_callback))[0]
 
 
 class WrittenContentCompressor:
@@ -77,29 +185,17 @@ class WrittenContentCompressor:
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
-        self.similarity_threshold = similarity_threshold
-
-    def __get_contextual_retriever(self):
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SectionRetriever(
-            sections=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
-
-    def __pretty_docs_list(self, docs, top_n):
-        return [f"Title: {d.metadata.get('section_title')}\nContent: {d.page_content}\n" for i, d in enumerate(docs) if i < top_n]
+        self.similarity_threshold = float(similarity_threshold)
+
+    def __pretty_docs_list(self, chunks, sections, ranked):
+        return [f"Title: {sections[i].get('section_title', '')}\nContent: {chunks[i]}\n" for i, _ in ranked]
 
     async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
-        if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query)
-        return self.__pretty_docs_list(relevant_docs, max_results)
+        chunks, section_indices = _split_chunks([section.get("written_content") for section in self.documents])
+        if not chunks:
+            return []
+        charge_embedding_cost(self.embeddings, chunks + [query], cost_callback)
+
+        sections = [self.documents[i] for i in section_indices]
+        ranked = await _rank_chunks(self.embeddings, chunks, [query], max_results, self.similarity_threshold)
+        return self.__pretty_docs_list(chunks, sections, ranked[0])
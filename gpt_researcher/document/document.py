@@ -28,19 +28,31 @@ class DocumentLoader:
 
         docs = []
         for pages in await asyncio.gather(*tasks):
-            for page in pages:
-                if page.page_content:
-                    docs.append({
-                        "raw_content": page.page_content,
-                        "url": os.path.basename(page.metadata['source'])
-                    })
-                    
+            docs.extend(self._to_documents(pages))
+
         if not docs:
             raise ValueError("🤷 Failed to load any documents!")
 
         return docs
 
+    def load_file(self, file_path: str) -> list:
+        """Loads the documents of a single file, e.g. to index files that changed."""
+        file_extension = os.path.splitext(file_path)[1].strip(".")
+        return self._to_documents(self._load_pages(file_path, file_extension))
+
+    def _to_documents(self, pages) -> list:
+        return [
+            {
+                "raw_content": page.page_content,
+                "url": os.path.basename(page.metadata['source'])
+            }
+            for page in pages if page.page_content
+        ]
+
     async def _load_document(self, file_path: str, file_extension: str) -> list:
+        return self._load_pages(file_path, file_extension)
+
+    def _load_pages(self, file_path: str, file_extension: str) -> list:
         ret_data = []
         try:
             loader_dict = {
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from .document import DocumentLoader
+from ..context.compression import CHUNK_OVERLAP, CHUNK_SIZE, charge_embedding_cost, top_k_indices
+from ..vector_store.vector_index import VectorIndex
+
+# Chunks embedded and written to the index at once, bounding the memory of an update
+UPSERT_BATCH_SIZE = 2048
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentIndex:
+    """
+    Keeps the chunks of the local documents embedded in a persistent VectorIndex, so a research
+    over `DOC_PATH` only parses and embeds the files that changed since the last one, and
+    retrieves relevant chunks without loading the documents.
+    """
+
+    _instances: Dict[Tuple[str, str], "DocumentIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, doc_path: str, index_path: str):
+        self.doc_path = os.path.abspath(doc_path)
+        self.index_path = index_path
+        self.vector_index = VectorIndex(os.path.join(index_path, "vectors"))
+        self.files_path = os.path.join(index_path, "files.json")
+        self.files = self._read_files()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg) -> Optional["DocumentIndex"]:
+        """
+        Returns the process wide index of `DOC_PATH` stored at `DOC_INDEX_PATH`, or None when no
+        index path is configured.
+        """
+        index_path = getattr(cfg, "doc_index_path", None)
+        if not index_path or not cfg.doc_path:
+            return None
+        key = (os.path.abspath(cfg.doc_path), os.path.abspath(index_path))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cfg.doc_path, index_path)
+            return cls._instances[key]
+
+    def update(self, embeddings, model_id: str, cost_callback: Optional[Callable] = None) -> int:
+        """
+        Embeds the chunks of the new and changed files of the folder and drops the chunks of
+        changed and removed files. Everything is reindexed when the embedding model changed.
+        Returns:
+            The number of chunks embedded.
+        """
+        with self._lock:
+            if self.files["model"] != model_id:
+                if self.files["files"]:
+                    logger.info(f"Reindexing {self.doc_path}: embedding model changed to {model_id}")
+                self.vector_index.clear()
+                self.files = {"model": model_id, "files": {}}
+            files = self.files["files"]
+            current = {path: _file_signature(path) for path in _folder_files(self.doc_path)}
+            changed = [path for path, signature in current.items() if files.get(path, {}).get("signature") != signature]
+            removed = [path for path in files if path not in current]
+            if not changed and not removed:
+                return 0
+
+            for path in removed:
+                self.vector_index.delete(_chunk_ids(path, range(files.pop(path)["chunks"])))
+            self._write_files()
+
+            loader = DocumentLoader(self.doc_path)
+            splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+            pending: List[Tuple[int, Dict[str, Any]]] = []
+            pending_files: Dict[str, int] = {}
+            embedded = 0
+            for path in changed:
+                chunks = [
+                    {"url": document["url"], "title": document.get("title", ""), "content": chunk}
+                    for document in loader.load_file(path)
+                    for chunk in splitter.split_text(document["raw_content"])
+                ]
+                # Chunks are stored under ids derived from the file, so a changed file overwrites its
+                # chunks and only the ones past its new length are deleted
+                previous = files.get(path, {}).get("chunks", 0)
+                if previous > len(chunks):
+                    self.vector_index.delete(_chunk_ids(path, range(len(chunks), previous)))
+                if not chunks:
+                    # Unsupported and unreadable files are tried again by the next update
+                    files.pop(path, None)
+                    continue
+                pending.extend(zip(_chunk_ids(path, range(len(chunks))), chunks))
+                pending_files[path] = len(chunks)
+                if len(pending) >= UPSERT_BATCH_SIZE:
+                    embedded += self._upsert(pending, embeddings, cost_callback)
+                    self._commit_files(pending_files, current)
+                    pending, pending_files = [], {}
+            embedded += self._upsert(pending, embeddings, cost_callback)
+            self._commit_files(pending_files, current)
+            logger.info(
+                f"Indexed {embedded} chunks from {len(changed)} files of {self.doc_path}, removed {len(removed)} files"
+            )
+            return embedded
+
+    def search(self, query_vectors, max_results: int = 10, similarity_threshold: float = 0.0,
+               fallback_results: int = 0) -> List[List[Dict[str, Any]]]:
+        """
+        Returns the best chunks (`url`, `title`, `content`, `score`) of every query above the
+        similarity threshold, or the best `fallback_results` when none clears it.
+        """
+        results = self.vector_index.search(query_vectors, k=max_results)
+        metadata = self.vector_index.get({chunk_id for hits in results for chunk_id, _ in hits})
+        chunks = []
+        for hits in results:
+            scores = np.array([score for _, score in hits], dtype=np.float32)
+            chunks.append([
+                {**metadata[hits[i][0]], "score": hits[i][1]}
+                for i in top_k_indices(scores, max_results, similarity_threshold, fallback_results)
+                if hits[i][0] in metadata
+            ])
+        return chunks
+
+    def _upsert(self, pending: List[Tuple[int, Dict[str, Any]]], embeddings, cost_callback: Optional[Callable]) -> int:
+        if not pending:
+            return 0
+        texts = [chunk["content"] for _, chunk in pending]
+        charge_embedding_cost(embeddings, texts, cost_callback)
+        vectors = embeddings.embed_documents(texts)
+        self.vector_index.upsert([chunk_id for chunk_id, _ in pending], vectors, [chunk for _, chunk in pending])
+        return len(pending)
+
+    def _commit_files(self, chunk_counts: Dict[str, int], signatures: Dict[str, List[int]]) -> None:
+        for path, count in chunk_counts.items():
+            self.files["files"][path] = {"signature": signatures[path], "chunks": count}
+        self._write_files()
+
+    def _read_files(self) -> Dict[str, Any]:
+        try:
+            with open(self.files_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"model": None, "files": {}}
+
+    def _write_files(self) -> None:
+        tmp_path = f"{self.files_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.files, f)
+        os.replace(tmp_path, self.files_path)
+
+
+def _chunk_ids(path: str, positions) -> List[int]:
+    """
+    Stable 63 bit ids of the chunks of a file, by position.
+    """
+    return [
+        int.from_bytes(hashlib.blake2b(f"{path}\0{position}".encode("utf-8"), digest_size=8).digest(), "big") >> 1
+        for position in positions
+    ]
+
+
+def _file_signature(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _folder_files(path: str) -> List[str]:
+    paths = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        paths.extend(os.path.join(root, file) for file in sorted(files) if not file.startswith("."))
+    return paths
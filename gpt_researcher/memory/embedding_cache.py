@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from ..utils.disk_cache import DiskCache
+
+DEFAULT_EMBEDDING_CACHE_MAX_SIZE_MB = 256
+
+
+def embedding_model_id(embedding_provider: str, model: str, **embedding_kwargs: Any) -> str:
+    """
+    Identifies the vectors an embedding model produces. Model kwargs (e.g. `dimensions`) are part
+    of the id since they change the vectors.
+    """
+    model_id = f"{embedding_provider}:{model}"
+    if embedding_kwargs:
+        kwargs = json.dumps(embedding_kwargs, sort_keys=True, default=str)
+        model_id += f":{hashlib.sha256(kwargs.encode('utf-8')).hexdigest()[:16]}"
+    return model_id
+
+
+class EmbeddingCache:
+    """
+    Process wide store of text embeddings keyed by embedding model and a hash of the text, so a
+    chunk embedded for one sub-query, or one research, is not sent to the embedding API again.
+
+    Vectors are kept as float32 in an in-memory LRU bounded by size, and written through to a
+    DiskCache when a path is configured, a batch of vectors per transaction. The async callers
+    read and write the DiskCache in worker threads. Texts that are being embedded are tracked as well:
+    concurrent callers that need the same text wait for the first request instead of repeating it.
+    """
+
+    _instances: Dict[Optional[str], "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None, max_size_mb: float = DEFAULT_EMBEDDING_CACHE_MAX_SIZE_MB):
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.store = DiskCache(path, max_size_bytes=self.max_size_bytes) if path else None
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._size = 0
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, cfg) -> Optional["EmbeddingCache"]:
+        """
+        Returns the process wide cache, persisted under `EMBEDDING_CACHE_PATH` when it is set, or
+        None when `EMBEDDING_CACHE_MAX_SIZE_MB` is 0.
+        """
+        max_size_mb = getattr(cfg, "embedding_cache_max_size_mb", DEFAULT_EMBEDDING_CACHE_MAX_SIZE_MB)
+        if not max_size_mb or max_size_mb <= 0:
+            return None
+        path = getattr(cfg, "embedding_cache_path", None)
+        if path and (os.path.isdir(path) or not os.path.splitext(path)[1]):
+            path = os.path.join(path, "embeddings.sqlite")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path, max_size_mb=max_size_mb)
+            return cls._instances[path]
+
+    @staticmethod
+    def key(model_id: str, kind: str, text: str) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{model_id}:{kind}:{digest}"
+
+    def claim(self, keys: List[str]) -> Tuple[Dict[str, np.ndarray], List[str], Dict[str, Future]]:
+        """
+        Looks up the keys. Returns the cached vectors, the keys the caller must embed and then
+        `resolve` (or `fail`), and the futures of keys another caller is already embedding.
+        """
+        found, owned, waiting = self._claim(keys)
+        try:
+            stored = self._read_stored(owned)
+        except BaseException as e:
+            self.fail(owned, e)
+            raise
+        return found, self._use_stored(found, owned, stored), waiting
+
+    async def aclaim(self, keys: List[str]) -> Tuple[Dict[str, np.ndarray], List[str], Dict[str, Future]]:
+        """
+        Like `claim`, reading the persisted vectors in a worker thread.
+        """
+        found, owned, waiting = self._claim(keys)
+        try:
+            stored = await asyncio.to_thread(self._read_stored, owned) if self.store is not None and owned else {}
+        except BaseException as e:
+            self.fail(owned, e)
+            raise
+        return found, self._use_stored(found, owned, stored), waiting
+
+    def resolve(self, keys: List[str], vectors: List[List[float]]) -> Dict[str, np.ndarray]:
+        """
+        Stores the vectors embedded for claimed keys and hands them to the callers waiting for them.
+        """
+        resolved = self._resolve(keys, vectors)
+        self._write_stored(resolved)
+        return resolved
+
+    async def aresolve(self, keys: List[str], vectors: List[List[float]]) -> Dict[str, np.ndarray]:
+        """
+        Like `resolve`, persisting the vectors in a worker thread.
+        """
+        resolved = self._resolve(keys, vectors)
+        if self.store is not None:
+            await asyncio.to_thread(self._write_stored, resolved)
+        return resolved
+
+    def fail(self, keys: List[str], error: BaseException) -> None:
+        """
+        Releases claimed keys whose embedding failed; the callers waiting for them get the error.
+        """
+        with self._lock:
+            futures = [self._pending.pop(key) for key in keys if key in self._pending]
+        for future in futures:
+            future.set_exception(error)
+
+    def _claim(self, keys: List[str]) -> Tuple[Dict[str, np.ndarray], List[str], Dict[str, Future]]:
+        found, owned, waiting = {}, [], {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vector = self._vectors.get(key)
+                if vector is not None:
+                    self._vectors.move_to_end(key)
+                    found[key] = vector
+                    self.hits += 1
+                elif key in self._pending:
+                    waiting[key] = self._pending[key]
+                    self.coalesced += 1
+                else:
+                    self._pending[key] = Future()
+                    owned.append(key)
+        return found, owned, waiting
+
+    def _read_stored(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if self.store is None or not keys:
+            return {}
+        return {
+            key: np.frombuffer(entry.value, dtype=np.float32)
+            for key, entry in self.store.get_many(keys).items()
+        }
+
+    def _use_stored(self, found: Dict[str, np.ndarray], owned: List[str], stored: Dict[str, np.ndarray]) -> List[str]:
+        """
+        Completes the claimed keys found on disk, returning the ones left to embed.
+        """
+        if stored:
+            self._complete(stored)
+            found.update(stored)
+            owned = [key for key in owned if key not in stored]
+        with self._lock:
+            self.hits += len(stored)
+            self.disk_hits += len(stored)
+            self.misses += len(owned)
+        return owned
+
+    def _resolve(self, keys: List[str], vectors: List[List[float]]) -> Dict[str, np.ndarray]:
+        if len(vectors) != len(keys):
+            error = ValueError(f"Expected {len(keys)} embeddings, got {len(vectors)}")
+            self.fail(keys, error)
+            raise error
+        resolved = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(keys, vectors)}
+        self._complete(resolved)
+        return resolved
+
+    def _write_stored(self, vectors: Dict[str, np.ndarray]) -> None:
+        if self.store is not None and vectors:
+            self.store.set_many({key: vector.tobytes() for key, vector in vectors.items()})
+
+    def _complete(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for key, vector in vectors.items():
+                previous = self._vectors.pop(key, None)
+                if previous is not None:
+                    self._size -= previous.nbytes + len(key)
+                self._vectors[key] = vector
+                self._size += vector.nbytes + len(key)
+            while self._size > self.max_size_bytes and len(self._vectors) > 1:
+                evicted_key, evicted = self._vectors.popitem(last=False)
+                self._size -= evicted.nbytes + len(evicted_key)
+                self.evictions += 1
+            futures = [(self._pending.pop(key), vector) for key, vector in vectors.items() if key in self._pending]
+        for future, vector in futures:
+            future.set_result(vector)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "entries": len(self._vectors),
+            "size_bytes": self._size,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings that look texts up in an EmbeddingCache and only send the missing ones, in one
+    batch, to the wrapped embeddings. `on_embed` is called with the texts that are sent, so
+    costs can be charged for those alone.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_id: str,
+                 on_embed: Optional[Callable[[List[str]], None]] = None):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_id = model_id
+        self.on_embed = on_embed
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed("document", texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed("query", [text], lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._aembed("document", texts, self.embeddings.aembed_documents)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        async def embed(texts):
+            return [await self.embeddings.aembed_query(texts[0])]
+
+        return (await self._aembed("query", [text], embed))[0]
+
+    def _embed(self, kind: str, texts: List[str], embed: Callable) -> List[List[float]]:
+        keys = [self.cache.key(self.model_id, kind, text) for text in texts]
+        texts_by_key = dict(zip(keys, texts))
+        found, owned, waiting = self.cache.claim(keys)
+        if owned:
+            try:
+                vectors = embed(self._sent([texts_by_key[key] for key in owned]))
+            except BaseException as e:
+                self.cache.fail(owned, e)
+                raise
+            found.update(self.cache.resolve(owned, vectors))
+        if waiting:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                found.update({key: future.result() for key, future in waiting.items()})
+            else:
+                # Blocking here would stall the event loop the other request may be running on
+                vectors = embed(self._sent([texts_by_key[key] for key in waiting]))
+                found.update({key: np.asarray(vector, dtype=np.float32) for key, vector in zip(waiting, vectors)})
+        return [found[key].tolist() for key in keys]
+
+    async def _aembed(self, kind: str, texts: List[str], embed: Callable) -> List[List[float]]:
+        keys = [self.cache.key(self.model_id, kind, text) for text in texts]
+        texts_by_key = dict(zip(keys, texts))
+        found, owned, waiting = await self.cache.aclaim(keys)
+        if owned:
+            try:
+                vectors = await embed(self._sent([texts_by_key[key] for key in owned]))
+            except BaseException as e:
+                self.cache.fail(owned, e)
+                raise
+            found.update(await self.cache.aresolve(owned, vectors))
+        for key, future in waiting.items():
+            found[key] = await asyncio.wrap_future(future)
+        return [found[key].tolist() for key in keys]
+
+    def _sent(self, texts: List[str]) -> List[str]:
+        if self.on_embed is not None:
+            self.on_embed(texts)
+        return texts
@@ -1,5 +1,8 @@
 import os
-from typing import Any
+from typing import Any, Callable, Optional
+
+from .embedding_cache import CachedEmbeddings, EmbeddingCache, embedding_model_id
+from ..utils.costs import estimate_embedding_cost
 
 OPENAI_EMBEDDING_MODEL = os.environ.get(
     "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
@@ -25,7 +28,9 @@ _SUPPORTED_PROVIDERS = {
 
 
 class Memory:
-    def __init__(self, embedding_provider: str, model: str, **embdding_kwargs: Any):
+    def __init__(self, embedding_provider: str, model: str, *,
+                 embedding_cache: Optional[EmbeddingCache] = None,
+                 cost_callback: Optional[Callable[[float], None]] = None, **embdding_kwargs: Any):
         _embeddings = None
         match embedding_provider:
             case "custom":
@@ -115,6 +120,16 @@ class Memory:
             case _:
                 raise Exception("Embedding not found.")
 
+        # Chunks already embedded by any research in the process are served from the cache, and
+        # only the texts sent to the provider are charged
+        self.model_id = embedding_model_id(embedding_provider, model, **embdding_kwargs)
+        self.embedding_cache = embedding_cache
+        if embedding_cache is not None:
+            on_embed = None
+            if cost_callback is not None:
+                def on_embed(texts):
+                    cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=texts))
+            _embeddings = CachedEmbeddings(_embeddings, embedding_cache, self.model_id, on_embed=on_embed)
         self._embeddings = _embeddings
 
     def get_embeddings(self):
@@ -1,3 +1,6 @@
+import asyncio
+import re
+
 import arxiv
 
 
@@ -35,6 +38,24 @@ class ArxivSearch:
                 "title": result.title,
                 "href": result.pdf_url,
                 "body": result.summary,
+                "paper_id": self._paper_id(result),
             })
         
-        return search_result
\ No newline at end of file
+        return search_result
+
+    @staticmethod
+    def _paper_id(result) -> str:
+        """
+        Identifies a paper by its arXiv id without the version suffix (e.g. `2101.00001` for
+        `2101.00001v2`), the form Semantic Scholar reports, so both retrievers share its id.
+        """
+        return f"arxiv:{re.sub(r'v[0-9]+$', '', result.get_short_id())}"
+
+    async def asearch(self, max_results=5):
+        """
+        Performs the search without blocking the event loop. The arxiv client is blocking, so
+        it runs in a worker thread.
+        :param max_results:
+        :return:
+        """
+        return await asyncio.to_thread(self.search, max_results=max_results)
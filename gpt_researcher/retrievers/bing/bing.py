@@ -6,6 +6,8 @@ import requests
 import json
 import logging
 
+from ..utils import request_json
+
 
 class BingSearch():
     """
@@ -35,16 +37,10 @@ class BingSearch():
                 "Bing API key not found. Please set the BING_API_KEY environment variable.")
         return api_key
 
-    def search(self, max_results=7) -> list[dict[str]]:
+    def _request(self, max_results):
         """
-        Searches the query
-        Returns:
-
+        Builds the url, headers and query parameters of a search request.
         """
-        print("Searching with query {0}...".format(self.query))
-        """Useful for general internet search queries using the Bing API."""
-
-        # Search the query
         url = "https://api.bing.microsoft.com/v7.0/search"
 
         headers = {
@@ -60,7 +56,19 @@ class BingSearch():
             "textFormat": "HTML",
             "safeSearch": "Strict"
         }
+        return url, headers, params
+
+    def search(self, max_results=7) -> list[dict[str]]:
+        """
+        Searches the query
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        """Useful for general internet search queries using the Bing API."""
 
+        # Search the query
+        url, headers, params = self._request(max_results)
         resp = requests.get(url, headers=headers, params=params)
 
         # Preprocess the results
@@ -68,6 +76,32 @@ class BingSearch():
             return []
         try:
             search_results = json.loads(resp.text)
+        except Exception as e:
+            self.logger.error(
+                f"Error parsing Bing search results: {e}. Resulting in empty response.")
+            return []
+        return self._parse_results(search_results)
+
+    async def asearch(self, max_results=7) -> list[dict[str]]:
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        url, headers, params = self._request(max_results)
+        try:
+            search_results = await request_json(
+                "GET", url, params=params, headers=headers, provider="bing", api_key=self.api_key
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error parsing Bing search results: {e}. Resulting in empty response.")
+            return []
+        return self._parse_results(search_results)
+
+    def _parse_results(self, search_results) -> list[dict[str]]:
+        try:
             results = search_results["webPages"]["value"]
         except Exception as e:
             self.logger.error(
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..utils.disk_cache import DiskCache
+
+DEFAULT_SEARCH_CACHE_TTL = 6 * 60 * 60
+DEFAULT_SEARCH_CACHE_MAX_SIZE_MB = 64
+
+# Retriever attributes that change which results a query returns and so belong in the cache key
+OPTION_ATTRIBUTES = ("topic", "sort", "base_url", "endpoint", "params", "index_path", "include_raw_content")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a search query so that differences in case and whitespace share a cache entry.
+    """
+    return " ".join(query.split()).casefold()
+
+
+def retriever_options(retriever) -> Dict[str, str]:
+    """
+    Returns the options of a retriever instance that affect its search results.
+    """
+    return {
+        name: str(getattr(retriever, name))
+        for name in OPTION_ATTRIBUTES
+        if getattr(retriever, name, None) is not None
+    }
+
+
+class SearchCache:
+    """
+    Persistent cache of retriever search results.
+
+    Entries are keyed by retriever, normalized query, result count and the retriever options that
+    change the results, so a repeated search (e.g. the original query searched once for planning and
+    once more as a sub-query) is answered locally instead of by the metered search API.
+    """
+
+    _instances: Dict[str, "SearchCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, ttl: float = DEFAULT_SEARCH_CACHE_TTL,
+                 max_size_mb: float = DEFAULT_SEARCH_CACHE_MAX_SIZE_MB):
+        self.store = DiskCache(path, ttl=ttl, max_size_bytes=int(max_size_mb * 1024 * 1024))
+        self._hits_by_retriever: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, cfg) -> Optional["SearchCache"]:
+        """
+        Returns the process wide cache configured by `SEARCH_CACHE_PATH`, or None when disabled.
+        """
+        path = getattr(cfg, "search_cache_path", None)
+        if not path:
+            return None
+        if os.path.isdir(path) or not os.path.splitext(path)[1]:
+            path = os.path.join(path, "search.sqlite")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(
+                    path,
+                    ttl=getattr(cfg, "search_cache_ttl", DEFAULT_SEARCH_CACHE_TTL),
+                    max_size_mb=getattr(cfg, "search_cache_max_size_mb", DEFAULT_SEARCH_CACHE_MAX_SIZE_MB),
+                )
+            return cls._instances[path]
+
+    @staticmethod
+    def _key(retriever_name: str, query: str, max_results: Optional[int],
+             options: Optional[Dict[str, Any]] = None) -> str:
+        key = json.dumps(
+            [retriever_name, normalize_query(query), max_results, options or {}], sort_keys=True
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, retriever_name: str, query: str, max_results: Optional[int],
+            options: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the cached search results, or None on a miss.
+        """
+        entry = self.store.get(self._key(retriever_name, query, max_results, options))
+        if entry is None:
+            return None
+        self._hits_by_retriever[retriever_name] = self._hits_by_retriever.get(retriever_name, 0) + 1
+        return json.loads(entry.value)
+
+    def set(self, retriever_name: str, query: str, max_results: Optional[int],
+            results: List[Dict[str, Any]], options: Optional[Dict[str, Any]] = None) -> None:
+        self.store.set(
+            self._key(retriever_name, query, max_results, options),
+            json.dumps(results).encode("utf-8"),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters, the hits of every retriever and the size of the cache.
+        """
+        return {**self.store.stats(), "hits_by_retriever": dict(self._hits_by_retriever)}
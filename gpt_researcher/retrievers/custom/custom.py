@@ -1,13 +1,19 @@
 from typing import Any, Dict, List, Optional
+import aiohttp
 import requests
 import os
 
+from ..utils import request_json
+
 
 class CustomRetriever:
     """
     Custom API Retriever
     """
 
+    # Results carry the page text in `raw_content`, see `search`
+    include_raw_content = True
+
     def __init__(self, query: str):
         self.endpoint = os.getenv('RETRIEVER_ENDPOINT')
         if not self.endpoint:
@@ -49,4 +55,19 @@ class CustomRetriever:
             return response.json()
         except requests.RequestException as e:
             print(f"Failed to retrieve search results: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    async def asearch(self, max_results: int = 5) -> Optional[List[Dict[str, Any]]]:
+        """
+        Performs the search using the custom retriever endpoint without blocking the event loop.
+
+        :param max_results: Maximum number of results to return (not currently used)
+        :return: JSON response in the same format as `search`
+        """
+        try:
+            return await request_json(
+                "GET", self.endpoint, params={**self.params, 'query': self.query}, provider="custom"
+            )
+        except aiohttp.ClientError as e:
+            print(f"Failed to retrieve search results: {e}")
+            return None
@@ -1,3 +1,4 @@
+import asyncio
 from itertools import islice
 from ..utils import check_pkg
 
@@ -24,4 +25,13 @@ class Duckduckgo:
         except Exception as e:
             print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
             search_response = []
-        return search_response
\ No newline at end of file
+        return search_response
+
+    async def asearch(self, max_results=5):
+        """
+        Performs the search without blocking the event loop. The duckduckgo_search client is
+        blocking, so it runs in a worker thread.
+        :param max_results:
+        :return:
+        """
+        return await asyncio.to_thread(self.search, max_results=max_results)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from ..utils import check_pkg
 
@@ -7,6 +8,9 @@ class ExaSearch:
     Exa API Retriever
     """
 
+    # Set to also request the page text of the results, returned in `raw_content`
+    include_raw_content = False
+
     def __init__(self, query):
         """
         Initializes the ExaSearch object.
@@ -50,6 +54,20 @@ class ExaSearch:
         Returns:
             A list of search results.
         """
+        if self.include_raw_content:
+            results = self.client.search_and_contents(
+                self.query,
+                type=search_type,
+                use_autoprompt=use_autoprompt,
+                num_results=max_results,
+                text=True,
+                **filters
+            )
+            return [
+                {"href": result.url, "title": result.title, "body": result.text, "raw_content": result.text}
+                for result in results.results
+            ]
+
         results = self.client.search(
             self.query,
             type=search_type,
@@ -63,6 +81,24 @@ class ExaSearch:
         ]
         return search_response
 
+    async def asearch(
+        self, max_results=10, use_autoprompt=False, search_type="neural", **filters
+    ):
+        """
+        Searches the query without blocking the event loop. The Exa client is blocking, so it
+        runs in a worker thread.
+        Args:
+            max_results: The maximum number of results to return.
+            use_autoprompt: Whether to use autoprompting.
+            search_type: The type of search (e.g., "neural", "keyword").
+            **filters: Additional filters (e.g., date range, domains).
+        Returns:
+            A list of search results.
+        """
+        return await asyncio.to_thread(
+            self.search, max_results, use_autoprompt=use_autoprompt, search_type=search_type, **filters
+        )
+
     def find_similar(self, url, exclude_source_domain=False, **filters):
         """
         Finds similar documents to the provided URL using the Exa API.
@@ -2,9 +2,12 @@
 
 # libraries
 import os
+import aiohttp
 import requests
 import json
 
+from ..utils import request_json
+
 
 class GoogleSearch:
     """
@@ -69,6 +72,30 @@ class GoogleSearch:
             search_results = json.loads(resp.text)
         except Exception:
             return
+        return self._parse_results(search_results, max_results)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        url = "https://www.googleapis.com/customsearch/v1"
+        params = {"key": self.api_key, "cx": self.cx_key, "q": self.query, "start": 1}
+        try:
+            search_results = await request_json(
+                "GET", url, params=params, provider="google", api_key=self.api_key
+            )
+        except aiohttp.ClientResponseError as e:
+            print("Google search: unexpected response status: ", e.status)
+            return
+        except Exception:
+            return
+        return self._parse_results(search_results, max_results)
+
+    @staticmethod
+    def _parse_results(search_results, max_results):
         if search_results is None:
             return
 
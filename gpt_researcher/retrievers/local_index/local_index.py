@@ -0,0 +1,568 @@
+import asyncio
+import copy
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from lxml import html
+
+from ...scraper.lxml_scraper.lxml_scraper import extract_from_tree
+from ...utils.text import tokenize
+
+# BM25 term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+# Documents are indexed in segments of at most this many documents, bounding the memory of a build
+SEGMENT_MAX_DOCS = 200_000
+# Updates add segments; once there are more than this, the live documents are compacted
+MAX_SEGMENTS = 16
+# Seconds between checks of the corpus for changed files
+REFRESH_INTERVAL = 60
+SNIPPET_LENGTH = 500
+# Queries matching more than 1/DENSE_POSTINGS_RATIO of the documents are scored in a dense array
+DENSE_POSTINGS_RATIO = 16
+
+PAGE_EXTENSIONS = {".html", ".htm"}
+TEXT_EXTENSIONS = {".txt", ".md"}
+JSONL_EXTENSIONS = {".jsonl"}
+CORPUS_EXTENSIONS = PAGE_EXTENSIONS | TEXT_EXTENSIONS | JSONL_EXTENSIONS
+
+META_FILE = "meta.json"
+INDEX_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+_indexes: Dict[str, "LocalIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(index_path: str, corpus_path: Optional[str] = None) -> "LocalIndex":
+    """
+    Returns the process wide index stored at `index_path`, kept up to date with the corpus at
+    `corpus_path` when one is given (see `LocalIndex.refresh`).
+    """
+    index_path = os.path.abspath(index_path)
+    with _indexes_lock:
+        if index_path not in _indexes:
+            _indexes[index_path] = LocalIndex(index_path)
+        index = _indexes[index_path]
+    if corpus_path:
+        index.refresh(corpus_path)
+    return index
+
+
+class LocalIndexSearch:
+    """
+    Local Index Retriever
+
+    Searches a BM25 index of a local corpus of pages (`.html`, `.txt`, `.md`) and JSONL files, so
+    research works without network access and gives repeatable results.
+
+    The indexed text is all there is to read, so results always carry it in `raw_content`, marked
+    with `raw_content_complete` so it is used whatever its length instead of being scraped.
+    """
+
+    def __init__(self, query):
+        """
+        Initializes the LocalIndexSearch object.
+        Args:
+            query: The search query.
+        """
+        self.query = query
+        self.corpus_path = os.getenv("LOCAL_INDEX_CORPUS")
+        self.index_path = os.getenv("LOCAL_INDEX_PATH")
+        if not self.index_path and self.corpus_path:
+            self.index_path = f"{os.path.abspath(self.corpus_path).rstrip(os.sep)}.index"
+        if not self.index_path:
+            raise ValueError("LOCAL_INDEX_CORPUS or LOCAL_INDEX_PATH environment variable not set")
+
+    def search(self, max_results=10):
+        """
+        Searches the query in the local index. The corpus is indexed on the first search; later
+        searches check it for changed files in the background.
+        Args:
+            max_results: The maximum number of results to return.
+        Returns:
+            A list of search results.
+        """
+        index = get_index(self.index_path, self.corpus_path)
+        return [
+            {
+                "title": document["title"],
+                "href": document["href"],
+                "body": document["content"][:SNIPPET_LENGTH],
+                "raw_content": document["content"],
+                "raw_content_complete": True,
+            }
+            for document in index.search(self.query, max_results)
+        ]
+
+    async def asearch(self, max_results=10):
+        """
+        Searches without blocking the event loop. Searching is cheap, but the first search of a
+        process may have to index the corpus, so it runs in a worker thread.
+        Args:
+            max_results: The maximum number of results to return.
+        Returns:
+            A list of search results.
+        """
+        return await asyncio.to_thread(self.search, max_results=max_results)
+
+
+class LocalIndex:
+    """
+    On-disk BM25 inverted index made of immutable segments.
+
+    Each segment holds the postings of its documents as numpy arrays that are memory mapped at
+    search time, so only the postings of the query terms are read. Updates index new and changed
+    corpus files into new segments and mark the documents of changed and removed files as deleted
+    in the old ones; when segments pile up, the live documents are compacted into fresh segments.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.meta = self._read_meta()
+        self._segments: Dict[str, _Segment] = {}
+        # ([(segment, BM25 length norms, deleted mask)], first document id of every segment, live documents)
+        self._state: Tuple[List[Tuple[_Segment, np.ndarray, Optional[np.ndarray]]], np.ndarray, int] = (
+            [], np.zeros(0, dtype=np.int64), 0
+        )
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._checked_at: Dict[str, float] = {}
+        self._remove_orphans()
+        self._load()
+
+    @property
+    def num_docs(self) -> int:
+        return self._state[2]
+
+    def refresh(self, corpus_path: str) -> None:
+        """
+        Updates the index from the corpus unless it was checked in the last `REFRESH_INTERVAL`.
+
+        Only the first check of the corpus in the process is waited for, so the first search sees
+        the corpus. Later checks stat every file of the corpus, which is too slow for the search
+        path, so they run in a background thread while searches use the current segments.
+        """
+        corpus_path = os.path.abspath(corpus_path)
+        if time.monotonic() - self._checked_at.get(corpus_path, -math.inf) < REFRESH_INTERVAL:
+            return
+        if corpus_path not in self._checked_at:
+            with self._refresh_lock:
+                if corpus_path not in self._checked_at:
+                    self._update_checked(corpus_path)
+            return
+        if self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._background_refresh, args=(corpus_path,), daemon=True).start()
+
+    def _background_refresh(self, corpus_path: str) -> None:
+        try:
+            self._update_checked(corpus_path)
+        except Exception as e:
+            logger.warning(f"Failed to refresh local index {self.path} from {corpus_path}: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _update_checked(self, corpus_path: str) -> None:
+        self.update(corpus_path)
+        self._checked_at[corpus_path] = time.monotonic()
+
+    def update(self, corpus_path: str) -> int:
+        """
+        Indexes the new and changed files of the corpus (a directory or a single file) and drops
+        the documents of changed and removed files.
+        Returns:
+            The number of documents indexed.
+        """
+        with self._lock:
+            meta = copy.deepcopy(self.meta)
+            files = meta["files"]
+            current = {path: _file_signature(path) for path in _corpus_files(os.path.abspath(corpus_path))}
+            changed = [path for path, signature in current.items() if files.get(path, {}).get("signature") != signature]
+            removed = [path for path in files if path not in current]
+            if not changed and not removed:
+                return 0
+
+            deleted: Dict[str, np.ndarray] = {}
+            for path in changed + removed:
+                entry = files.pop(path, None)
+                for name, start, end in entry["ranges"] if entry else []:
+                    if name not in deleted:
+                        deleted[name] = self._segments[name].load_deleted().copy()
+                    deleted[name][start:end] = True
+
+            builder = _IndexBuilder(self.path, meta)
+            for path in changed:
+                for href, title, content in _read_documents(path):
+                    builder.add(path, href, title, content)
+                files[path] = {"signature": current[path], "ranges": builder.ranges.get(path, [])}
+            builder.flush()
+            meta["segments"].update(builder.segments)
+
+            dropped = []
+            for name, mask in deleted.items():
+                if mask.all():
+                    del meta["segments"][name]
+                    dropped.append(name)
+                else:
+                    _save_array(os.path.join(self.path, name), "deleted.npy", mask)
+            self._commit(meta, dropped)
+            logger.info(
+                f"Indexed {builder.num_docs} documents from {len(changed)} files into {self.path}, "
+                f"removed {len(removed)} files"
+            )
+
+            if len(meta["segments"]) > MAX_SEGMENTS:
+                self._compact()
+            return builder.num_docs
+
+    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns the stored documents (`href`, `title`, `content`, `score`) best matching the query.
+        """
+        segments, bases, num_docs = self._state
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not num_docs or max_results <= 0:
+            return []
+
+        # Live postings of every term in all segments, by document id across the index
+        postings = [[] for _ in terms]
+        for (segment, norms, deleted), base in zip(segments, bases):
+            for term_postings, span in zip(postings, segment.spans(terms)):
+                if span is None:
+                    continue
+                ids, term_scores = segment.score(span, norms)
+                if deleted is not None:
+                    live = ~deleted[ids]
+                    ids, term_scores = ids[live], term_scores[live]
+                term_postings.append((ids + base, term_scores))
+
+        # Document frequencies count the live documents of all segments, so every segment scores alike
+        doc_ids, scores = [], []
+        for term_postings in postings:
+            df = sum(len(ids) for ids, _ in term_postings)
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            for ids, term_scores in term_postings:
+                doc_ids.append(ids)
+                scores.append(idf * term_scores)
+        if not doc_ids:
+            return []
+        num_ids = int(bases[-1]) + len(segments[-1][1])
+        if len(doc_ids) == 1:
+            doc_ids, scores = doc_ids[0], scores[0]
+        elif sum(len(ids) for ids in doc_ids) * DENSE_POSTINGS_RATIO > num_ids:
+            # Frequent terms: add up scores in one array over all documents rather than sorting postings
+            all_ids = np.concatenate(doc_ids)
+            totals = np.bincount(all_ids, weights=np.concatenate(scores), minlength=num_ids)
+            # A document is listed once per matching term, so the best max_results * terms postings
+            # hold the best max_results documents
+            k = min(max_results * len(terms), len(all_ids))
+            doc_ids = np.unique(all_ids[np.argpartition(-totals[all_ids], k - 1)[:k]])
+            scores = totals[doc_ids]
+        else:
+            doc_ids, inverse = np.unique(np.concatenate(doc_ids), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(scores))
+        if not len(doc_ids):
+            return []
+
+        k = min(max_results, len(doc_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        positions = np.searchsorted(bases, doc_ids[top], side="right") - 1
+        return [
+            {**segments[position][0].document(int(doc_id - bases[position])), "score": float(score)}
+            for position, doc_id, score in zip(positions, doc_ids[top], scores[top])
+        ]
+
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.path, META_FILE), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") == INDEX_VERSION:
+                return meta
+            logger.warning(f"Rebuilding local index {self.path} written by another version")
+        except FileNotFoundError:
+            pass
+        return {"version": INDEX_VERSION, "segments": {}, "files": {}, "next_segment": 1}
+
+    def _remove_orphans(self) -> None:
+        """
+        Removes the segments of builds that were interrupted before they were committed.
+        """
+        for name in os.listdir(self.path):
+            if name.startswith("seg-") and name not in self.meta["segments"]:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def _commit(self, meta: Dict[str, Any], dropped: List[str]) -> None:
+        """
+        Atomically replaces the index metadata, then loads the new segments and deletes the
+        dropped ones. Searches keep using the previous state until it is swapped in.
+        """
+        tmp_path = os.path.join(self.path, f"{META_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+        self.meta = meta
+        self._load()
+        for name in dropped:
+            self._segments.pop(name, None)
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def _load(self) -> None:
+        segments = []
+        total_length = 0
+        num_docs = 0
+        for name in self.meta["segments"]:
+            segment = self._segments.get(name)
+            if segment is None:
+                segment = self._segments[name] = _Segment(os.path.join(self.path, name))
+            deleted = segment.load_deleted()
+            live = ~deleted
+            num_docs += int(live.sum())
+            total_length += int(segment.lengths[live].sum())
+            segments.append((segment, deleted if deleted.any() else None))
+
+        avg_length = total_length / num_docs if num_docs else 1.0
+        bases = np.zeros(len(segments), dtype=np.int64)
+        np.cumsum([len(segment.lengths) for segment, _ in segments[:-1]], out=bases[1:])
+        # Swapped in as a whole, so concurrent searches see either the old or the new segments
+        self._state = (
+            [
+                (segment, (K1 * (1 - B + B * segment.lengths / avg_length)).astype(np.float32), deleted)
+                for segment, deleted in segments
+            ],
+            bases,
+            num_docs,
+        )
+
+    def _compact(self) -> None:
+        """
+        Rewrites the live documents of all segments into as few segments as possible.
+        """
+        meta = copy.deepcopy(self.meta)
+        old_segments = list(meta["segments"])
+        builder = _IndexBuilder(self.path, meta)
+        for segment, _, deleted in self._state[0]:
+            for doc_id, document in enumerate(segment.documents()):
+                if deleted is None or not deleted[doc_id]:
+                    builder.add(document["source"], document["href"], document["title"], document["content"])
+        builder.flush()
+        meta["segments"] = builder.segments
+        for path, entry in meta["files"].items():
+            entry["ranges"] = builder.ranges.get(path, [])
+        self._commit(meta, old_segments)
+        logger.info(f"Compacted local index {self.path} into {len(builder.segments)} segments")
+
+
+class _Segment:
+    """Read side of an immutable index segment; postings and documents stay memory mapped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "terms.txt"), encoding="utf-8") as f:
+            self.terms = {term: term_id for term_id, term in enumerate(f.read().split("\n"))}
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+        # Plain array views of the mappings; slicing np.memmap itself is several times slower
+        self.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r").view(np.ndarray)
+        self.freqs = np.load(os.path.join(path, "freqs.npy"), mmap_mode="r").view(np.ndarray)
+        self.lengths = np.load(os.path.join(path, "lengths.npy"))
+        self.doc_offsets = np.load(os.path.join(path, "doc_offsets.npy"))
+        self.docs = np.memmap(os.path.join(path, "docs.jsonl"), dtype=np.uint8, mode="r").view(np.ndarray)
+
+    def load_deleted(self) -> np.ndarray:
+        try:
+            return np.load(os.path.join(self.path, "deleted.npy"))
+        except FileNotFoundError:
+            return np.zeros(len(self.lengths), dtype=bool)
+
+    def spans(self, terms: List[str]) -> List[Optional[Tuple[int, int]]]:
+        """
+        Returns the (start, end) positions of the postings of every term, None for missing terms.
+        """
+        spans = []
+        for term in terms:
+            term_id = self.terms.get(term)
+            spans.append(None if term_id is None else (int(self.offsets[term_id]), int(self.offsets[term_id + 1])))
+        return spans
+
+    def score(self, span: Tuple[int, int], norms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the ids of the documents in the postings span of a term and their BM25 term
+        frequency scores, which are yet to be weighted by the idf of the term.
+        """
+        start, end = span
+        ids = self.postings[start:end]
+        freqs = self.freqs[start:end].astype(np.float32)
+        return ids, (K1 + 1) * freqs / (freqs + norms[ids])
+
+    def document(self, doc_id: int) -> Dict[str, Any]:
+        return json.loads(self.docs[self.doc_offsets[doc_id]:self.doc_offsets[doc_id + 1]].tobytes())
+
+    def documents(self) -> Iterator[Dict[str, Any]]:
+        with open(os.path.join(self.path, "docs.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+class _SegmentWriter:
+    """Accumulates the postings of the documents of one segment in compact arrays."""
+
+    def __init__(self):
+        self.terms: Dict[str, int] = {}
+        self.term_ids = array("i")
+        self.doc_ids = array("i")
+        self.freqs = array("i")
+        self.lengths = array("i")
+        self.docs: List[bytes] = []
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.lengths)
+
+    def add(self, document: Dict[str, str]) -> int:
+        doc_id = len(self.lengths)
+        counts = Counter(tokenize(f"{document['title']}\n{document['content']}"))
+        for term, count in counts.items():
+            self.term_ids.append(self.terms.setdefault(term, len(self.terms)))
+            self.doc_ids.append(doc_id)
+            self.freqs.append(count)
+        self.lengths.append(sum(counts.values()))
+        self.docs.append(json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n")
+        return doc_id
+
+    def write(self, path: str) -> Dict[str, int]:
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        term_ids = np.array(self.term_ids, dtype=np.int32)
+        # Stable, so the postings of every term stay in document order
+        order = np.argsort(term_ids, kind="stable")
+        offsets = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(self.terms)), out=offsets[1:])
+        doc_offsets = np.zeros(len(self.docs) + 1, dtype=np.int64)
+        np.cumsum([len(doc) for doc in self.docs], out=doc_offsets[1:])
+
+        with open(os.path.join(tmp_path, "terms.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(self.terms))
+        np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+        np.save(os.path.join(tmp_path, "postings.npy"), np.array(self.doc_ids, dtype=np.int32)[order])
+        # BM25 saturates long before term frequencies overflow 16 bits
+        np.save(os.path.join(tmp_path, "freqs.npy"),
+                np.minimum(np.array(self.freqs, dtype=np.int32)[order], 65535).astype(np.uint16))
+        np.save(os.path.join(tmp_path, "lengths.npy"), np.array(self.lengths, dtype=np.int32))
+        np.save(os.path.join(tmp_path, "doc_offsets.npy"), doc_offsets)
+        with open(os.path.join(tmp_path, "docs.jsonl"), "wb") as f:
+            f.writelines(self.docs)
+        os.replace(tmp_path, path)
+        return {"num_docs": self.num_docs}
+
+
+class _IndexBuilder:
+    """Writes added documents into new segments, tracking the document ranges of every source."""
+
+    def __init__(self, index_path: str, meta: Dict[str, Any]):
+        self.index_path = index_path
+        self.meta = meta
+        self.segments: Dict[str, Dict[str, int]] = {}
+        self.ranges: Dict[str, List[List]] = {}
+        self.num_docs = 0
+        self._start_segment()
+
+    def _start_segment(self) -> None:
+        self.name = f"seg-{self.meta['next_segment']:06d}"
+        self.meta["next_segment"] += 1
+        self.writer = _SegmentWriter()
+
+    def add(self, source: str, href: str, title: str, content: str) -> None:
+        doc_id = self.writer.add({"href": href, "title": title, "content": content, "source": source})
+        ranges = self.ranges.setdefault(source, [])
+        if ranges and ranges[-1][0] == self.name and ranges[-1][2] == doc_id:
+            ranges[-1][2] += 1
+        else:
+            ranges.append([self.name, doc_id, doc_id + 1])
+        self.num_docs += 1
+        if self.writer.num_docs >= SEGMENT_MAX_DOCS:
+            self.flush()
+            self._start_segment()
+
+    def flush(self) -> None:
+        if self.writer.num_docs:
+            self.segments[self.name] = self.writer.write(os.path.join(self.index_path, self.name))
+            self.writer = _SegmentWriter()
+
+
+def _save_array(directory: str, name: str, values: np.ndarray) -> None:
+    tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+    np.save(tmp_path, values)
+    os.replace(tmp_path, os.path.join(directory, name))
+
+
+def _file_signature(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _corpus_files(corpus_path: str) -> List[str]:
+    if os.path.isfile(corpus_path):
+        return [corpus_path]
+    paths = []
+    for root, dirs, files in os.walk(corpus_path):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for file in sorted(files):
+            if os.path.splitext(file)[1].lower() in CORPUS_EXTENSIONS:
+                paths.append(os.path.join(root, file))
+    return paths
+
+
+def _read_documents(path: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yields the (href, title, content) of the documents of a corpus file. JSONL lines are objects
+    with a `url` or `href`, an optional `title` and the text in `raw_content`, `content`, `text`
+    or `body`.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    uri = Path(path).as_uri()
+    try:
+        if extension in JSONL_EXTENSIONS:
+            with open(path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping invalid JSON on line {line_number} of {path}: {e}")
+                        continue
+                    content = next(
+                        (record[key] for key in ("raw_content", "content", "text", "body") if record.get(key)), ""
+                    )
+                    if content:
+                        href = record.get("url") or record.get("href") or f"{uri}#L{line_number}"
+                        yield href, record.get("title") or "", content
+        elif extension in PAGE_EXTENSIONS:
+            with open(path, "rb") as f:
+                data = f.read()
+            if data.strip():
+                content, _, title = extract_from_tree(html.fromstring(data), uri)
+                if content:
+                    yield uri, title, content
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                content = f.read()
+            if content.strip():
+                title = next((line.strip("# \t") for line in content.splitlines() if line.strip()), "")
+                yield uri, title, content
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to index {path}: {e}")
@@ -1,14 +1,49 @@
+import asyncio
+import logging
 import os
+import threading
 import xml.etree.ElementTree as ET
 
 import requests
 
+from ..utils import get_session
+from ...utils.rate_limit import TokenBucket
+
+ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+
+# NCBI E-utilities allow 3 requests per second per IP, or 10 with an API key
+REQUESTS_PER_SECOND = 3
+REQUESTS_PER_SECOND_WITH_KEY = 10
+# Full text articles are large; fetch them in a few requests rather than one huge response
+FETCH_BATCH_SIZE = 20
+STREAM_CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(api_key=None) -> TokenBucket:
+    """
+    Returns the process wide rate limiter for the NCBI key tier of `api_key`.
+    """
+    with _rate_limiters_lock:
+        if api_key not in _rate_limiters:
+            rate = REQUESTS_PER_SECOND_WITH_KEY if api_key else REQUESTS_PER_SECOND
+            _rate_limiters[api_key] = TokenBucket(rate, capacity=1)
+        return _rate_limiters[api_key]
+
 
 class PubMedCentralSearch:
     """
     PubMed Central API Retriever
     """
 
+    # Set to return the full text parsed from the fetched articles in `raw_content`
+    include_raw_content = False
+
     def __init__(self, query):
         """
         Initializes the PubMedCentralSearch object.
@@ -17,24 +52,62 @@ class PubMedCentralSearch:
         """
         self.query = query
         self.api_key = self._retrieve_api_key()
+        self.rate_limiter = get_rate_limiter(self.api_key)
 
     def _retrieve_api_key(self):
         """
         Retrieves the NCBI API key from environment variables.
         Returns:
-            The API key.
-        Raises:
-            Exception: If the API key is not found.
+            The API key, or None to use the lower request rate NCBI allows without a key.
         """
-        try:
-            api_key = os.environ["NCBI_API_KEY"]
-        except KeyError:
-            raise Exception(
-                "NCBI API key not found. Please set the NCBI_API_KEY environment variable. "
-                "You can obtain your key from https://www.ncbi.nlm.nih.gov/account/"
+        api_key = os.environ.get("NCBI_API_KEY")
+        if not api_key:
+            logger.warning(
+                "NCBI API key not found, limiting PubMed Central to "
+                f"{REQUESTS_PER_SECOND} requests per second. Set the NCBI_API_KEY environment variable "
+                "to raise the limit. You can obtain your key from https://www.ncbi.nlm.nih.gov/account/"
             )
         return api_key
 
+    def _with_api_key(self, params):
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+
+    def _search_params(self, max_results):
+        return self._with_api_key({
+            "db": "pmc",
+            "term": f"{self.query} AND free fulltext[filter]",
+            "retmax": max_results,
+            "usehistory": "y",
+            "retmode": "json",
+            "sort": "relevance"
+        })
+
+    def _fetch_params(self, ids):
+        return self._with_api_key({
+            "db": "pmc",
+            "id": ",".join(ids),
+            "retmode": "xml",
+        })
+
+    def _batch_params(self, search_result, ids, start):
+        """
+        Builds the efetch parameters of the batch of `ids` starting at `start`. Batches are fetched
+        from the search history on the NCBI server when the search returned one.
+        """
+        batch_ids = ids[start:start + FETCH_BATCH_SIZE]
+        if search_result.get("webenv") and search_result.get("querykey"):
+            return self._with_api_key({
+                "db": "pmc",
+                "query_key": search_result["querykey"],
+                "WebEnv": search_result["webenv"],
+                "retstart": start,
+                "retmax": len(batch_ids),
+                "retmode": "xml",
+            })
+        return self._fetch_params(batch_ids)
+
     def search(self, max_results=10):
         """
         Searches the query using the PubMed Central API.
@@ -43,44 +116,109 @@ class PubMedCentralSearch:
         Returns:
             A list of search results.
         """
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-        params = {
-            "db": "pmc",
-            "term": f"{self.query} AND free fulltext[filter]",
-            "retmax": max_results,
-            "usehistory": "y",
-            "api_key": self.api_key,
-            "retmode": "json",
-            "sort": "relevance"
-        }
-        response = requests.get(base_url, params=params)
+        self.rate_limiter.acquire_sync()
+        response = requests.get(ESEARCH_URL, params=self._search_params(max_results))
 
         if response.status_code != 200:
             raise Exception(
                 f"Failed to retrieve data: {response.status_code} - {response.text}"
             )
 
-        results = response.json()
-        ids = results["esearchresult"]["idlist"]
+        search_result = response.json()["esearchresult"]
+        ids = search_result["idlist"]
+
+        articles = {}
+        for start in range(0, len(ids), FETCH_BATCH_SIZE):
+            articles.update(self._fetch_batch(self._batch_params(search_result, ids, start)))
+
+        return self._search_response(ids, articles, max_results, self.include_raw_content)
+
+    async def asearch(self, max_results=10):
+        """
+        Searches the query using the PubMed Central API without blocking the event loop.
+        Args:
+            max_results: The maximum number of results to return.
+        Returns:
+            A list of search results.
+        """
+        await self.rate_limiter.acquire()
+        async with get_session().get(ESEARCH_URL, params=self._search_params(max_results)) as response:
+            if response.status != 200:
+                raise Exception(
+                    f"Failed to retrieve data: {response.status} - {await response.text()}"
+                )
+            results = await response.json(content_type=None)
+
+        search_result = results["esearchresult"]
+        ids = search_result["idlist"]
+
+        articles = {}
+        batches = await asyncio.gather(*[
+            self._afetch_batch(self._batch_params(search_result, ids, start))
+            for start in range(0, len(ids), FETCH_BATCH_SIZE)
+        ])
+        for batch in batches:
+            articles.update(batch)
 
+        return self._search_response(ids, articles, max_results, self.include_raw_content)
+
+    @staticmethod
+    def _search_response(ids, articles, max_results, include_raw_content=False):
+        """
+        Builds the search results from the parsed articles, in the relevance order of the search.
+        """
         search_response = []
         for article_id in ids:
-            xml_content = self.fetch([article_id])
-            if self.has_body_content(xml_content):
-                article_data = self.parse_xml(xml_content)
-                if article_data:
-                    search_response.append(
-                        {
-                            "href": f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{article_id}/",
-                            "body": f"{article_data['title']}\n\n{article_data['abstract']}\n\n{article_data['body'][:500]}...",
-                        }
+            article_data = articles.get(article_id)
+            if article_data:
+                search_result = {
+                    "title": article_data["title"],
+                    "href": f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{article_id}/",
+                    "body": f"{article_data['title']}\n\n{article_data['abstract']}\n\n{article_data['body'][:500]}...",
+                    "paper_id": f"pmc:{article_id}",
+                }
+                if include_raw_content:
+                    search_result["raw_content"] = (
+                        f"{article_data['title']}\n\n{article_data['abstract']}\n\n{article_data['body']}"
                     )
-
+                search_response.append(search_result)
             if len(search_response) >= max_results:
                 break
-
         return search_response
 
+    def _fetch_batch(self, params):
+        """
+        Fetches a batch of articles, parsing the XML while it is downloaded.
+        Returns:
+            Dictionary of the parsed articles with body content by PMC id.
+        """
+        self.rate_limiter.acquire_sync()
+        with requests.get(EFETCH_URL, params=params, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(
+                    f"Failed to retrieve data: {response.status_code} - {response.text}"
+                )
+            reader = ArticleReader()
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                reader.feed(chunk)
+            return reader.close()
+
+    async def _afetch_batch(self, params):
+        """
+        Fetches a batch of articles without blocking the event loop, parsing the XML while it is
+        downloaded.
+        Returns:
+            Dictionary of the parsed articles with body content by PMC id.
+        """
+        await self.rate_limiter.acquire()
+        async with get_session().get(EFETCH_URL, params=params) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to retrieve data: {response.status} - {await response.text()}")
+            reader = ArticleReader()
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                reader.feed(chunk)
+            return reader.close()
+
     def fetch(self, ids):
         """
         Fetches the full text content for given article IDs.
@@ -89,14 +227,8 @@ class PubMedCentralSearch:
         Returns:
             XML content of the articles.
         """
-        base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-        params = {
-            "db": "pmc",
-            "id": ",".join(ids),
-            "retmode": "xml",
-            "api_key": self.api_key,
-        }
-        response = requests.get(base_url, params=params)
+        self.rate_limiter.acquire_sync()
+        response = requests.get(EFETCH_URL, params=self._fetch_params(ids))
 
         if response.status_code != 200:
             raise Exception(
@@ -113,24 +245,8 @@ class PubMedCentralSearch:
         Returns:
             Boolean indicating presence of body content.
         """
-        root = ET.fromstring(xml_content)
-        ns = {
-            "mml": "http://www.w3.org/1998/Math/MathML",
-            "xlink": "http://www.w3.org/1999/xlink",
-        }
-        article = root.find("article", ns)
-        if article is None:
-            return False
-
-        body_elem = article.find(".//body", namespaces=ns)
-        if body_elem is not None:
-            return True
-        else:
-            for sec in article.findall(".//sec", namespaces=ns):
-                for p in sec.findall(".//p", namespaces=ns):
-                    if p.text:
-                        return True
-        return False
+        article = ET.fromstring(xml_content).find("article")
+        return article is not None and _has_body_content(article)
 
     def parse_xml(self, xml_content):
         """
@@ -140,35 +256,81 @@ class PubMedCentralSearch:
         Returns:
             Dictionary containing title, abstract, and body text.
         """
-        root = ET.fromstring(xml_content)
-        ns = {
-            "mml": "http://www.w3.org/1998/Math/MathML",
-            "xlink": "http://www.w3.org/1999/xlink",
-        }
-
-        article = root.find("article", ns)
+        article = ET.fromstring(xml_content).find("article")
         if article is None:
             return None
+        return _parse_article(article)
+
+
+class ArticleReader:
+    """
+    Incremental parser of an efetch response holding many articles.
+
+    Every `<article>` is parsed as soon as its closing tag arrives and then dropped from the tree,
+    so memory stays flat however many articles the batch contains.
+    """
+
+    def __init__(self):
+        self.parser = ET.XMLPullParser(events=("start", "end"))
+        self.articles = {}
+        self._root = None
+
+    def feed(self, data):
+        self.parser.feed(data)
+        self._read_events()
+
+    def close(self):
+        """
+        Finishes parsing and returns the articles with body content by PMC id.
+        """
+        self.parser.close()
+        self._read_events()
+        return self.articles
+
+    def _read_events(self):
+        for event, elem in self.parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            if elem.tag != "article":
+                continue
+            article_id = _article_id(elem)
+            if article_id and _has_body_content(elem):
+                self.articles[article_id] = _parse_article(elem)
+            self._root.clear()
+
+
+def _article_id(article):
+    for elem in article.iterfind("front/article-meta/article-id"):
+        if elem.get("pub-id-type") in ("pmc", "pmcid") and elem.text:
+            return elem.text.strip().removeprefix("PMC")
+    return None
+
+
+def _has_body_content(article):
+    if article.find(".//body") is not None:
+        return True
+    for sec in article.findall(".//sec"):
+        for p in sec.findall(".//p"):
+            if p.text:
+                return True
+    return False
+
+
+def _parse_article(article):
+    title = article.findtext(".//title-group/article-title", default="")
+
+    abstract = article.find(".//abstract")
+    abstract_text = "".join(abstract.itertext()).strip() if abstract is not None else ""
+
+    body = []
+    body_elem = article.find(".//body")
+    paragraphs = body_elem.findall(".//p") if body_elem is not None else [
+        p for sec in article.findall(".//sec") for p in sec.findall(".//p")
+    ]
+    for p in paragraphs:
+        if p.text:
+            body.append(p.text.strip())
 
-        title = article.findtext(
-            ".//title-group/article-title", default="", namespaces=ns
-        )
-
-        abstract = article.find(".//abstract", namespaces=ns)
-        abstract_text = (
-            "".join(abstract.itertext()).strip() if abstract is not None else ""
-        )
-
-        body = []
-        body_elem = article.find(".//body", namespaces=ns)
-        if body_elem is not None:
-            for p in body_elem.findall(".//p", namespaces=ns):
-                if p.text:
-                    body.append(p.text.strip())
-        else:
-            for sec in article.findall(".//sec", namespaces=ns):
-                for p in sec.findall(".//p", namespaces=ns):
-                    if p.text:
-                        body.append(p.text.strip())
-
-        return {"title": title, "abstract": abstract_text, "body": "\n".join(body)}
+    return {"title": title, "abstract": abstract_text, "body": "\n".join(body)}
@@ -0,0 +1,215 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+import aiohttp
+
+from ..utils.rate_limit import TokenBucket
+
+# Providers without a configured requests_per_minute are not rate limited, only capped in concurrency
+DEFAULT_REQUESTS_PER_MINUTE = None
+DEFAULT_CONCURRENCY = 8
+# Statuses meaning the provider wants us to slow down; the request is retried after a pause
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0
+MAX_RETRY_AFTER = 60.0
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Returns the delay in seconds requested by a Retry-After header (seconds or HTTP date).
+    """
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+def key_fingerprint(api_key: Optional[str]) -> str:
+    """
+    Identifies an API key in usage statistics without revealing it.
+    """
+    return f"...{api_key[-4:]}" if api_key else "default"
+
+
+class ProviderQuota:
+    """
+    Request quota of one search API key: a requests-per-minute token bucket, a cap on concurrent
+    requests, and a shared pause set from the provider's Retry-After when it throttles us.
+
+    The bucket holds a minute's allowance by default, so a fan-out of sub-queries goes out at once
+    and only sustained traffic is spread over the minute.
+
+    Requests over the quota wait in line instead of failing. The bucket and pause are shared by
+    every event loop of the process; the concurrency cap is kept per event loop.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = DEFAULT_REQUESTS_PER_MINUTE,
+                 concurrency: int = DEFAULT_CONCURRENCY, burst: Optional[float] = None):
+        """
+        Args:
+            requests_per_minute: Sustained request rate, None or 0 for no rate limit
+            concurrency: Maximum number of requests in flight
+            burst: Requests that may be sent at once (defaults to `requests_per_minute`)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.concurrency = concurrency
+        self.bucket = None
+        if requests_per_minute and requests_per_minute > 0:
+            self.bucket = TokenBucket(requests_per_minute / 60, capacity=max(1.0, burst or requests_per_minute))
+        self.paused_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.queued_seconds = 0.0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(max(1, self.concurrency))
+        return semaphore
+
+    def pause(self, delay: float) -> None:
+        """
+        Holds back every request of this key for `delay` seconds.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + delay)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Waits until a request may be sent under the quota.
+        """
+        queued_at = time.monotonic()
+        async with self._semaphore():
+            while (delay := self.paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            self.queued_seconds += time.monotonic() - queued_at
+            self.requests += 1
+            yield
+
+    async def run(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Sends `request()` under the quota, retrying it when the provider throttles with 429/503.
+        Retries wait for the provider's Retry-After, or back off exponentially without one.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            async with self.slot():
+                try:
+                    return await request()
+                except aiohttp.ClientResponseError as e:
+                    if e.status not in THROTTLE_STATUSES:
+                        self.failures += 1
+                        raise
+                    self.throttled += 1
+                    if attempt == MAX_RETRIES:
+                        self.failures += 1
+                        raise
+                    delay = parse_retry_after(e.headers)
+                    if delay is None:
+                        delay = BACKOFF_BASE * 2 ** attempt * random.uniform(1, 1.5)
+                    self.pause(delay)
+                    self.retries += 1
+                except Exception:
+                    self.failures += 1
+                    raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+            "queued_seconds": round(self.queued_seconds, 3),
+            "requests_per_minute": self.requests_per_minute,
+            "concurrency": self.concurrency,
+        }
+
+
+class QuotaManager:
+    """
+    Process wide registry of the request quotas of the search APIs, one per provider and API key.
+
+    Limits are set per provider with `RETRIEVER_QUOTAS`, e.g.
+    `{"tavily": {"requests_per_minute": 100, "concurrency": 5}}`. Providers not listed are only
+    capped at `DEFAULT_CONCURRENCY` requests in flight; throttled requests are retried for all.
+    """
+
+    _instance: Optional["QuotaManager"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, float]]] = None):
+        self.limits = dict(limits or {})
+        self.quotas: Dict[tuple, ProviderQuota] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "QuotaManager":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def from_config(cls, cfg) -> "QuotaManager":
+        """
+        Returns the process wide manager with the limits of `RETRIEVER_QUOTAS` applied.
+        """
+        manager = cls.get_instance()
+        manager.configure(getattr(cfg, "retriever_quotas", None) or {})
+        return manager
+
+    def configure(self, limits: Dict[str, Dict[str, float]]) -> None:
+        with self._lock:
+            for provider, provider_limits in limits.items():
+                if self.limits.get(provider) == provider_limits:
+                    continue
+                self.limits[provider] = provider_limits
+                # Quotas pick up new limits the next time they are requested
+                for key in [key for key in self.quotas if key[0] == provider]:
+                    del self.quotas[key]
+
+    def get(self, provider: str, api_key: Optional[str] = None) -> ProviderQuota:
+        key = (provider, key_fingerprint(api_key))
+        with self._lock:
+            quota = self.quotas.get(key)
+            if quota is None:
+                limits = self.limits.get(provider, {})
+                quota = self.quotas[key] = ProviderQuota(
+                    requests_per_minute=limits.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE),
+                    concurrency=int(limits.get("concurrency", DEFAULT_CONCURRENCY)),
+                    burst=limits.get("burst"),
+                )
+            return quota
+
+    async def run(self, provider: str, request: Callable[[], Awaitable[Any]],
+                  api_key: Optional[str] = None) -> Any:
+        return await self.get(provider, api_key).run(request)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the usage counters of every provider and key, e.g. `{"tavily:...abcd": {...}}`.
+        """
+        with self._lock:
+            quotas = dict(self.quotas)
+        return {f"{provider}:{fingerprint}": quota.stats() for (provider, fingerprint), quota in quotas.items()}
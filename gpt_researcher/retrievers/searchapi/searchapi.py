@@ -5,6 +5,8 @@ import os
 import requests
 import urllib.parse
 
+from ..utils import request_json
+
 
 class SearchApiSearch():
     """
@@ -32,16 +34,10 @@ class SearchApiSearch():
                             "You can get a key at https://www.searchapi.io/")
         return api_key
 
-    def search(self, max_results=7):
+    def _request(self):
         """
-        Searches the query
-        Returns:
-
+        Builds the url, query parameters and headers of a search request.
         """
-        print("SearchApiSearch: Searching with query {0}...".format(self.query))
-        """Useful for general internet search queries using SearchApi."""
-
-
         url = "https://www.searchapi.io/api/v1/search"
         params = {
             "q": self.query,
@@ -53,32 +49,68 @@ class SearchApiSearch():
             'Authorization': f'Bearer {self.api_key}',
             'X-SearchApi-Source': 'gpt-researcher'
         }
+        return url, params, headers
+
+    def search(self, max_results=7):
+        """
+        Searches the query
+        Returns:
+
+        """
+        print("SearchApiSearch: Searching with query {0}...".format(self.query))
+        """Useful for general internet search queries using SearchApi."""
+
 
+        url, params, headers = self._request()
         encoded_url = url + "?" + urllib.parse.urlencode(params)
         search_response = []
 
         try:
             response = requests.get(encoded_url, headers=headers, timeout=20)
             if response.status_code == 200:
-                search_results = response.json()
-                if search_results:
-                    results = search_results["organic_results"]
-                    results_processed = 0
-                    for result in results:
-                        # skip youtube results
-                        if "youtube.com" in result["link"]:
-                            continue
-                        if results_processed >= max_results:
-                            break
-                        search_result = {
-                            "title": result["title"],
-                            "href": result["link"],
-                            "body": result["snippet"],
-                        }
-                        search_response.append(search_result)
-                        results_processed += 1
+                search_response = self._parse_results(response.json(), max_results)
         except Exception as e:
             print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
             search_response = []
 
         return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("SearchApiSearch: Searching with query {0}...".format(self.query))
+        url, params, headers = self._request()
+        try:
+            search_results = await request_json(
+                "GET", url, params=params, headers=headers, timeout=20, provider="searchapi", api_key=self.api_key
+            )
+            search_response = self._parse_results(search_results, max_results)
+        except Exception as e:
+            print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
+            search_response = []
+
+        return search_response
+
+    @staticmethod
+    def _parse_results(search_results, max_results):
+        search_response = []
+        if search_results:
+            results = search_results["organic_results"]
+            results_processed = 0
+            for result in results:
+                # skip youtube results
+                if "youtube.com" in result["link"]:
+                    continue
+                if results_processed >= max_results:
+                    break
+                search_result = {
+                    "title": result["title"],
+                    "href": result["link"],
+                    "body": result["snippet"],
+                }
+                search_response.append(search_result)
+                results_processed += 1
+        return search_response
@@ -1,7 +1,10 @@
 from typing import Dict, List
 
+import aiohttp
 import requests
 
+from ..utils import request_json
+
 
 class SemanticScholarSearch:
     """
@@ -22,6 +25,14 @@ class SemanticScholarSearch:
         assert sort in self.VALID_SORT_CRITERIA, "Invalid sort criterion"
         self.sort = sort.lower()
 
+    def _params(self, max_results: int) -> Dict[str, str]:
+        return {
+            "query": self.query,
+            "limit": max_results,
+            "fields": "title,abstract,url,venue,year,authors,isOpenAccess,openAccessPdf,externalIds",
+            "sort": self.sort,
+        }
+
     def search(self, max_results: int = 20) -> List[Dict[str, str]]:
         """
         Perform the search on Semantic Scholar and return results.
@@ -29,21 +40,35 @@ class SemanticScholarSearch:
         :param max_results: Maximum number of results to retrieve
         :return: List of dictionaries containing title, href, and body of each paper
         """
-        params = {
-            "query": self.query,
-            "limit": max_results,
-            "fields": "title,abstract,url,venue,year,authors,isOpenAccess,openAccessPdf",
-            "sort": self.sort,
-        }
-
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = requests.get(self.BASE_URL, params=self._params(max_results))
             response.raise_for_status()
         except requests.RequestException as e:
             print(f"An error occurred while accessing Semantic Scholar API: {e}")
             return []
 
-        results = response.json().get("data", [])
+        return self._parse_results(response.json())
+
+    async def asearch(self, max_results: int = 20) -> List[Dict[str, str]]:
+        """
+        Perform the search on Semantic Scholar without blocking the event loop.
+
+        :param max_results: Maximum number of results to retrieve
+        :return: List of dictionaries containing title, href, and body of each paper
+        """
+        try:
+            response = await request_json(
+                "GET", self.BASE_URL, params=self._params(max_results), provider="semantic_scholar"
+            )
+        except aiohttp.ClientError as e:
+            print(f"An error occurred while accessing Semantic Scholar API: {e}")
+            return []
+
+        return self._parse_results(response)
+
+    @staticmethod
+    def _parse_results(response: Dict) -> List[Dict[str, str]]:
+        results = response.get("data", [])
         search_result = []
 
         for result in results:
@@ -53,7 +78,21 @@ class SemanticScholarSearch:
                         "title": result.get("title", "No Title"),
                         "href": result["openAccessPdf"].get("url", "No URL"),
                         "body": result.get("abstract", "Abstract not available"),
+                        "paper_id": SemanticScholarSearch._paper_id(result),
                     }
                 )
 
         return search_result
+
+    @staticmethod
+    def _paper_id(result: Dict) -> str:
+        """
+        Identifies a paper by its arXiv id or DOI where it has one, so the same paper found by
+        other retrievers shares its id.
+        """
+        external_ids = result.get("externalIds") or {}
+        if external_ids.get("ArXiv"):
+            return f"arxiv:{external_ids['ArXiv']}"
+        if external_ids.get("DOI"):
+            return f"doi:{external_ids['DOI'].lower()}"
+        return f"s2:{result.get('paperId')}"
@@ -5,6 +5,8 @@ import os
 import requests
 import urllib.parse
 
+from ..utils import request_json
+
 
 class SerpApiSearch():
     """
@@ -32,6 +34,17 @@ class SerpApiSearch():
                             "You can get a key at https://serpapi.com/")
         return api_key
 
+    def _request(self):
+        """
+        Builds the url and query parameters of a search request.
+        """
+        url = "https://serpapi.com/search.json"
+        params = {
+            "q": self.query,
+            "api_key": self.api_key
+        }
+        return url, params
+
     def search(self, max_results=7):
         """
         Searches the query
@@ -42,35 +55,55 @@ class SerpApiSearch():
         """Useful for general internet search queries using SerpApi."""
 
 
-        url = "https://serpapi.com/search.json"
-        params = {
-            "q": self.query,
-            "api_key": self.api_key
-        }
+        url, params = self._request()
         encoded_url = url + "?" + urllib.parse.urlencode(params)
         search_response = []
         try:
             response = requests.get(encoded_url, timeout=10)
             if response.status_code == 200:
-                search_results = response.json()
-                if search_results:
-                    results = search_results["organic_results"]
-                    results_processed = 0
-                    for result in results:
-                        # skip youtube results
-                        if "youtube.com" in result["link"]:
-                            continue
-                        if results_processed >= max_results:
-                            break
-                        search_result = {
-                            "title": result["title"],
-                            "href": result["link"],
-                            "body": result["snippet"],
-                        }
-                        search_response.append(search_result)
-                        results_processed += 1
+                search_response = self._parse_results(response.json(), max_results)
         except Exception as e:
             print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
             search_response = []
 
         return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("SerpApiSearch: Searching with query {0}...".format(self.query))
+        url, params = self._request()
+        try:
+            search_results = await request_json(
+                "GET", url, params=params, timeout=10, provider="serpapi", api_key=self.api_key
+            )
+            search_response = self._parse_results(search_results, max_results)
+        except Exception as e:
+            print(f"Error: {e}. Failed fetching sources. Resulting in empty response.")
+            search_response = []
+
+        return search_response
+
+    @staticmethod
+    def _parse_results(search_results, max_results):
+        search_response = []
+        if search_results:
+            results = search_results["organic_results"]
+            results_processed = 0
+            for result in results:
+                # skip youtube results
+                if "youtube.com" in result["link"]:
+                    continue
+                if results_processed >= max_results:
+                    break
+                search_result = {
+                    "title": result["title"],
+                    "href": result["link"],
+                    "body": result["snippet"],
+                }
+                search_response.append(search_result)
+                results_processed += 1
+        return search_response
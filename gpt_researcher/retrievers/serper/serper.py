@@ -5,6 +5,8 @@ import os
 import requests
 import json
 
+from ..utils import request_json
+
 
 class SerperSearch():
     """
@@ -32,16 +34,10 @@ class SerperSearch():
                             "You can get a key at https://serper.dev/")
         return api_key
 
-    def search(self, max_results=7):
+    def _request(self, max_results):
         """
-        Searches the query
-        Returns:
-
+        Builds the url, headers and body of a search request.
         """
-        print("Searching with query {0}...".format(self.query))
-        """Useful for general internet search queries using the Serp API."""
-
-
         # Search the query (see https://serper.dev/playground for the format)
         url = "https://google.serper.dev/search"
 
@@ -50,7 +46,18 @@ class SerperSearch():
         'Content-Type': 'application/json'
         }
         data = json.dumps({"q": self.query, "num": max_results})
+        return url, headers, data
+
+    def search(self, max_results=7):
+        """
+        Searches the query
+        Returns:
 
+        """
+        print("Searching with query {0}...".format(self.query))
+        """Useful for general internet search queries using the Serp API."""
+
+        url, headers, data = self._request(max_results)
         resp = requests.request("POST", url, timeout=10, headers=headers, data=data)
 
         # Preprocess the results
@@ -60,6 +67,26 @@ class SerperSearch():
             search_results = json.loads(resp.text)
         except Exception:
             return
+        return self._parse_results(search_results)
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        print("Searching with query {0}...".format(self.query))
+        url, headers, data = self._request(max_results)
+        try:
+            search_results = await request_json(
+                "POST", url, headers=headers, data=data, timeout=10, provider="serper", api_key=self.api_key
+            )
+        except Exception:
+            return
+        return self._parse_results(search_results)
+
+    @staticmethod
+    def _parse_results(search_results):
         if search_results is None:
             return
 
@@ -6,12 +6,17 @@ from typing import Literal, Sequence, Optional
 import requests
 import json
 
+from ..utils import request_json
+
 
 class TavilySearch():
     """
     Tavily API Retriever
     """
 
+    # Set to return the extracted page text of the results in `raw_content`
+    include_raw_content = False
+
     def __init__(self, query, headers=None, topic="general"):
         """
         Initializes the TavilySearch object
@@ -43,24 +48,23 @@ class TavilySearch():
                 return ""
         return api_key
 
-    def _search(self,
-                query: str,
-                search_depth: Literal["basic", "advanced"] = "basic",
-                topic: str = "general",
-                days: int = 2,
-                max_results: int = 5,
-                include_domains: Sequence[str] = None,
-                exclude_domains: Sequence[str] = None,
-                include_answer: bool = False,
-                include_raw_content: bool = False,
-                include_images: bool = False,
-                use_cache: bool = True,
-                ) -> dict:
+    def _request_data(self,
+                      query: str,
+                      search_depth: Literal["basic", "advanced"] = "basic",
+                      topic: str = "general",
+                      days: int = 2,
+                      max_results: int = 5,
+                      include_domains: Sequence[str] = None,
+                      exclude_domains: Sequence[str] = None,
+                      include_answer: bool = False,
+                      include_raw_content: bool = False,
+                      include_images: bool = False,
+                      use_cache: bool = True,
+                      ) -> dict:
         """
-        Internal search method to send the request to the API.
+        Builds the body of a search request.
         """
-
-        data = {
+        return {
             "query": query,
             "search_depth": search_depth,
             "topic": topic,
@@ -75,6 +79,12 @@ class TavilySearch():
             "use_cache": use_cache,
         }
 
+    def _search(self, query: str, **kwargs) -> dict:
+        """
+        Internal search method to send the request to the API.
+        """
+        data = self._request_data(query, **kwargs)
+
         response = requests.post(self.base_url, data=json.dumps(
             data), headers=self.headers, timeout=100)
 
@@ -84,6 +94,28 @@ class TavilySearch():
             # Raises a HTTPError if the HTTP request returned an unsuccessful status code
             response.raise_for_status()
 
+    async def _asearch(self, query: str, **kwargs) -> dict:
+        """
+        Sends the search request on the pooled async HTTP session.
+        """
+        data = self._request_data(query, **kwargs)
+        return await request_json(
+            "POST", self.base_url, headers=self.headers, json=data, timeout=100, provider="tavily", api_key=self.api_key
+        )
+
+    @staticmethod
+    def _parse_results(results: dict) -> list:
+        sources = results.get("results", [])
+        if not sources:
+            raise Exception("No results found with Tavily API search.")
+        search_response = []
+        for obj in sources:
+            search_result = {"href": obj["url"], "body": obj["content"]}
+            if obj.get("raw_content"):
+                search_result["raw_content"] = obj["raw_content"]
+            search_response.append(search_result)
+        return search_response
+
     def search(self, max_results=7):
         """
         Searches the query
@@ -93,13 +125,27 @@ class TavilySearch():
         try:
             # Search the query
             results = self._search(
-                self.query, search_depth="basic", max_results=max_results, topic=self.topic)
-            sources = results.get("results", [])
-            if not sources:
-                raise Exception("No results found with Tavily API search.")
+                self.query, search_depth="basic", max_results=max_results, topic=self.topic,
+                include_raw_content=self.include_raw_content)
             # Return the results
-            search_response = [{"href": obj["url"],
-                                "body": obj["content"]} for obj in sources]
+            search_response = self._parse_results(results)
+        except Exception as e:
+            print(
+                f"Error: {e}. Failed fetching sources. Resulting in empty response.")
+            search_response = []
+        return search_response
+
+    async def asearch(self, max_results=7):
+        """
+        Searches the query without blocking the event loop
+        Returns:
+
+        """
+        try:
+            results = await self._asearch(
+                self.query, search_depth="basic", max_results=max_results, topic=self.topic,
+                include_raw_content=self.include_raw_content)
+            search_response = self._parse_results(results)
         except Exception as e:
             print(
                 f"Error: {e}. Failed fetching sources. Resulting in empty response.")
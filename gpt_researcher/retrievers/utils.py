@@ -1,5 +1,19 @@
+import asyncio
 import importlib.util
 import os
+import weakref
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+# Retriever API calls share one keep-alive connection pool per event loop
+DEFAULT_TIMEOUT = 30
+_MAX_CONNECTIONS = 50
+_DNS_CACHE_TTL = 300
+_KEEPALIVE_TIMEOUT = 30
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
 
 VALID_RETRIEVERS = [
     "arxiv",
@@ -8,6 +22,7 @@ VALID_RETRIEVERS = [
     "duckduckgo",
     "exa",
     "google",
+    "local_index",
     "searchapi",
     "searx",
     "semantic_scholar",
@@ -26,6 +41,87 @@ def check_pkg(pkg: str) -> None:
             f"`pip install -U {pkg_kebab}`"
         )
 
+def get_session() -> aiohttp.ClientSession:
+    """
+    Returns the pooled HTTP session shared by the retrievers running on the current event loop.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=_MAX_CONNECTIONS,
+            ttl_dns_cache=_DNS_CACHE_TTL,
+            keepalive_timeout=_KEEPALIVE_TIMEOUT,
+        )
+        session = _sessions[loop] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+async def request_json(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None, json: Any = None,
+                       timeout: float = DEFAULT_TIMEOUT, data: Any = None,
+                       provider: Optional[str] = None, api_key: Optional[str] = None) -> Any:
+    """
+    Sends a request on the pooled session and returns the decoded JSON body.
+
+    Query parameters are encoded like `requests` does (None values are dropped, other values are
+    converted with `str`). With a `provider`, the request waits for the provider's (and `api_key`'s)
+    quota and is retried when the provider throttles it, see `QuotaManager`.
+
+    Raises:
+        aiohttp.ClientResponseError: If the response status is not 2xx
+    """
+    if params is not None:
+        params = {key: value if isinstance(value, str) else str(value)
+                  for key, value in params.items() if value is not None}
+
+    async def send():
+        async with get_session().request(
+            method, url, params=params, headers=headers, json=json, data=data,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    if provider is None:
+        return await send()
+
+    from .quota import QuotaManager
+
+    return await QuotaManager.get_instance().run(provider, send, api_key=api_key)
+
+
+async def search_async(retriever, max_results: Optional[int] = None, cache=None) -> List[Dict[str, Any]]:
+    """
+    Runs a retriever's search without blocking the event loop.
+
+    Built-in retrievers implement `asearch`; custom retriever classes that only provide the
+    blocking `search` are run in a worker thread. Without `max_results` the retriever's own
+    default is used. With a `SearchCache`, cached results are returned without searching and
+    non-empty results are stored for later searches; the cache is read and written in worker
+    threads.
+    """
+    if cache is not None:
+        from .cache import retriever_options
+
+        cache_key = (type(retriever).__name__, retriever.query, max_results, retriever_options(retriever))
+        cached_results = await asyncio.to_thread(cache.get, *cache_key)
+        if cached_results is not None:
+            return cached_results
+
+    kwargs = {} if max_results is None else {"max_results": max_results}
+    if hasattr(retriever, "asearch"):
+        results = await retriever.asearch(**kwargs)
+    else:
+        results = await asyncio.to_thread(retriever.search, **kwargs)
+
+    # Retrievers report failures as empty results, which must not be cached
+    if cache is not None and results:
+        name, query, max_results, options = cache_key
+        await asyncio.to_thread(cache.set, name, query, max_results, results, options=options)
+    return results or []
+
+
 # Get a list of all retriever names to be used as validators for supported retrievers
 def get_all_retriever_names() -> list:
     try:
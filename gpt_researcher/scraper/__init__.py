@@ -1,18 +1,24 @@
 
 from .beautiful_soup.beautiful_soup import BeautifulSoupScraper
+from .lxml_scraper.lxml_scraper import LxmlScraper
 from .web_base_loader.web_base_loader import WebBaseLoaderScraper
 from .arxiv.arxiv import ArxivScraper
 from .pymupdf.pymupdf import PyMuPDFScraper
 from .browser.browser import BrowserScraper
 from .tavily_extract.tavily_extract import TavilyExtract
+from .plain_text.plain_text import PlainTextScraper
+from .docx_document.docx_document import DocxScraper
 from .scraper import Scraper
 
 __all__ = [
     "BeautifulSoupScraper",
+    "LxmlScraper",
     "WebBaseLoaderScraper",
     "ArxivScraper",
     "PyMuPDFScraper",
     "BrowserScraper",
     "TavilyExtract",
+    "PlainTextScraper",
+    "DocxScraper",
     "Scraper"
 ]
\ No newline at end of file
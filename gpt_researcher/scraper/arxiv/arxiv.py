@@ -13,10 +13,10 @@ class ArxivScraper:
         of the first document.
         
         Returns:
-          The code is returning the page content of the first document retrieved by the ArxivRetriever
-        for a given query extracted from the link.
+          The page content of the first document retrieved by the ArxivRetriever for a given query
+        extracted from the link, with no images, and its title.
         """
         query = self.link.split("/")[-1]
         retriever = ArxivRetriever(load_max_docs=2, doc_content_chars_max=None)
         docs = retriever.invoke(query=query)
-        return docs[0].page_content
+        return docs[0].page_content, [], docs[0].metadata.get("Title", "")
@@ -4,6 +4,7 @@ from urllib.parse import urljoin
 from ..utils import get_relevant_images, extract_title
 
 class BeautifulSoupScraper:
+    timeout = 4
 
     def __init__(self, link, session=None):
         self.link = link
@@ -21,29 +22,34 @@ class BeautifulSoupScraper:
         occurs during the process, an error message is printed and an empty string is returned.
         """
         try:
-            response = self.session.get(self.link, timeout=4)
-            soup = BeautifulSoup(
-                response.content, "lxml", from_encoding=response.encoding
-            )
+            response = self.session.get(self.link, timeout=self.timeout)
+            return self.extract(response)
 
-            for script_or_style in soup(["script", "style"]):
-                script_or_style.extract()
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
+
+    def extract(self, response) -> tuple:
+        """
+        Extracts the cleaned text content, relevant images and title from an already downloaded
+        response (anything exposing `content` and `encoding`).
+        """
+        soup = BeautifulSoup(response.content, "lxml", from_encoding=response.encoding)
 
-            raw_content = self.get_content_from_url(soup)
-            lines = (line.strip() for line in raw_content.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            content = "\n".join(chunk for chunk in chunks if chunk)
+        for script_or_style in soup(["script", "style"]):
+            script_or_style.extract()
 
-            image_urls = get_relevant_images(soup, self.link)
-            
-            # Extract the title using the utility function
-            title = extract_title(soup)
+        raw_content = self.get_content_from_url(soup)
+        lines = (line.strip() for line in raw_content.splitlines())
+        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+        content = "\n".join(chunk for chunk in chunks if chunk)
 
-            return content, image_urls, title
+        image_urls = get_relevant_images(soup, self.link)
 
-        except Exception as e:
-            print("Error! : " + str(e))
-            return "", [], ""
+        # Extract the title using the utility function
+        title = extract_title(soup)
+
+        return content, image_urls, title
 
     def get_content_from_url(self, soup: BeautifulSoup) -> str:
         """Get the relevant text from the soup with improved filtering"""
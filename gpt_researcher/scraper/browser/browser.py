@@ -1,18 +1,16 @@
 from __future__ import annotations
 
 import traceback
-import pickle
+from functools import partial
 from pathlib import Path
 from sys import platform
 import time
-import random
-import string
-import os
 
 from bs4 import BeautifulSoup
 
 from .processing.scrape_skills import (scrape_pdf_with_pymupdf,
                                        scrape_pdf_with_arxiv)
+from .driver_pool import DriverPool, DEFAULT_POOL_SIZE, DEFAULT_MAX_PAGES_PER_DRIVER
 
 from urllib.parse import urljoin
 
@@ -22,145 +20,73 @@ from ..utils import get_relevant_images, extract_title
 
 
 class BrowserScraper:
+    pool_size = DEFAULT_POOL_SIZE
+    max_pages_per_driver = DEFAULT_MAX_PAGES_PER_DRIVER
+    # Settings of the drivers started by the shared pool
+    selenium_web_browser = "chrome"
+    headless = True
+    user_agent = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/128.0.0.0 Safari/537.36")
+    use_browser_cookies = False
+
     def __init__(self, url: str, session=None):
         self.url = url
         self.session = session
-        self.selenium_web_browser = "chrome"
-        self.headless = False
-        self.user_agent = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                           "AppleWebKit/537.36 (KHTML, like Gecko) "
-                           "Chrome/128.0.0.0 Safari/537.36")
         self.driver = None
-        self.use_browser_cookies = False
-        self._import_selenium()  # Import only if used to avoid unnecessary dependencies
-        self.cookie_filename = f"{self._generate_random_string(8)}.pkl"
+        _import_selenium()  # Import only if used to avoid unnecessary dependencies
+
+    @classmethod
+    def configure_pool(cls, cfg) -> None:
+        """Size the shared driver pool from the config (BROWSER_POOL_SIZE, BROWSER_MAX_PAGES_PER_DRIVER)"""
+        cls.pool_size = getattr(cfg, "browser_pool_size", DEFAULT_POOL_SIZE)
+        cls.max_pages_per_driver = getattr(cfg, "browser_max_pages_per_driver", DEFAULT_MAX_PAGES_PER_DRIVER)
+
+    @classmethod
+    def get_pool(cls) -> DriverPool:
+        """The process wide driver pool, started with this class' driver settings on first use"""
+        factory = partial(create_driver, cls.selenium_web_browser, cls.headless, cls.user_agent,
+                          cls.use_browser_cookies)
+        return DriverPool.get_instance(factory, cls.pool_size, cls.max_pages_per_driver)
+
+    @classmethod
+    def get_executor(cls):
+        """
+        Threads reserved for browser scrapes. Waiting for a driver blocks a thread, so browser
+        scrapes must not run on asyncio's default executor, which every other extractor shares.
+        """
+        return cls.get_pool().executor
 
     def scrape(self) -> tuple:
         if not self.url:
             print("URL not specified")
             return "A URL was not specified, cancelling request to browse website.", [], ""
 
+        pool = self.get_pool()
+        pooled = pool.acquire()
+        self.driver = pooled.driver
+        failed = False
         try:
-            self.setup_driver()
-            self._visit_google_and_save_cookies()
-            self._load_saved_cookies()
             self._add_header()
 
             text, image_urls, title = self.scrape_text_with_selenium()
             return text, image_urls, title
         except Exception as e:
+            failed = True
             print(f"An error occurred during scraping: {str(e)}")
             print("Full stack trace:")
             print(traceback.format_exc())
             return f"An error occurred: {str(e)}\n\nStack trace:\n{traceback.format_exc()}", [], ""
         finally:
-            if self.driver:
-                self.driver.quit()
-            self._cleanup_cookie_file()
-
-    def _import_selenium(self):
-        try:
-            global webdriver, By, EC, WebDriverWait, TimeoutException, WebDriverException
-            from selenium import webdriver
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.webdriver.support.wait import WebDriverWait
-            from selenium.common.exceptions import TimeoutException, WebDriverException
-
-            global ChromeOptions, FirefoxOptions, SafariOptions
-            from selenium.webdriver.chrome.options import Options as ChromeOptions
-            from selenium.webdriver.firefox.options import Options as FirefoxOptions
-            from selenium.webdriver.safari.options import Options as SafariOptions
-        except ImportError as e:
-            print(f"Failed to import Selenium: {str(e)}")
-            print("Please install Selenium and its dependencies to use BrowserScraper.")
-            print("You can install Selenium using pip:")
-            print("    pip install selenium")
-            print("If you're using a virtual environment, make sure it's activated.")
-            raise ImportError(
-                "Selenium is required but not installed. See error message above for installation instructions.") from e
-
-    def setup_driver(self) -> None:
-        # print(f"Setting up {self.selenium_web_browser} driver...")
-
-        options_available = {
-            "chrome": ChromeOptions,
-            "firefox": FirefoxOptions,
-            "safari": SafariOptions,
-        }
-
-        options = options_available[self.selenium_web_browser]()
-        options.add_argument(f"user-agent={self.user_agent}")
-        if self.headless:
-            options.add_argument("--headless")
-        options.add_argument("--enable-javascript")
-
-        try:
-            if self.selenium_web_browser == "firefox":
-                self.driver = webdriver.Firefox(options=options)
-            elif self.selenium_web_browser == "safari":
-                self.driver = webdriver.Safari(options=options)
-            else:  # chrome
-                if platform == "linux" or platform == "linux2":
-                    options.add_argument("--disable-dev-shm-usage")
-                    options.add_argument("--remote-debugging-port=9222")
-                options.add_argument("--no-sandbox")
-                options.add_experimental_option("prefs", {"download_restrictions": 3})
-                self.driver = webdriver.Chrome(options=options)
-
-            if self.use_browser_cookies:
-                self._load_browser_cookies()
-
-            # print(f"{self.selenium_web_browser.capitalize()} driver set up successfully.")
-        except Exception as e:
-            print(f"Failed to set up {self.selenium_web_browser} driver: {str(e)}")
-            print("Full stack trace:")
-            print(traceback.format_exc())
-            raise
-
-    def _load_saved_cookies(self):
-        """Load saved cookies before visiting the target URL"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            cookies = pickle.load(open(self.cookie_filename, "rb"))
-            for cookie in cookies:
-                self.driver.add_cookie(cookie)
-        else:
-            print("No saved cookies found.")
-
-    def _load_browser_cookies(self):
-        """Load cookies directly from the browser"""
-        try:
-            import browser_cookie3
-        except ImportError:
-            print("browser_cookie3 is not installed. Please install it using: pip install browser_cookie3")
-            return
-
-        if self.selenium_web_browser == "chrome":
-            cookies = browser_cookie3.chrome()
-        elif self.selenium_web_browser == "firefox":
-            cookies = browser_cookie3.firefox()
-        else:
-            print(f"Cookie loading not supported for {self.selenium_web_browser}")
-            return
-
-        for cookie in cookies:
-            self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain})
-
-    def _cleanup_cookie_file(self):
-        """Remove the cookie file"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            try:
-                os.remove(self.cookie_filename)
-            except Exception as e:
-                print(f"Failed to remove cookie file: {str(e)}")
-        else:
-            print("No cookie file found to remove.")
+            # Healthy drivers go back to the pool warm, crashed ones are restarted
+            pool.release(pooled, discard=failed)
+            self.driver = None
 
-    def _generate_random_string(self, length):
-        """Generate a random string of specified length"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
+    def setup_driver(self):
+        """Start a new browser driver with this scraper's settings"""
+        self.driver = create_driver(self.selenium_web_browser, self.headless, self.user_agent,
+                                    self.use_browser_cookies)
+        return self.driver
 
     def _get_domain(self):
         """Extract domain from URL"""
@@ -169,22 +95,6 @@ class BrowserScraper:
         domain = urlparse(self.url).netloc
         return domain[4:] if domain.startswith('www.') else domain
 
-    def _visit_google_and_save_cookies(self):
-        """Visit Google and save cookies before navigating to the target URL"""
-        try:
-            self.driver.get("https://www.google.com")
-            time.sleep(2)  # Wait for cookies to be set
-
-            # Save cookies to a file
-            cookies = self.driver.get_cookies()
-            pickle.dump(cookies, open(self.cookie_filename, "wb"))
-
-            # print("Google cookies saved successfully.")
-        except Exception as e:
-            print(f"Failed to visit Google and save cookies: {str(e)}")
-            print("Full stack trace:")
-            print(traceback.format_exc())
-
     def scrape_text_with_selenium(self) -> tuple:
         self.driver.get(self.url)
 
@@ -270,3 +180,88 @@ class BrowserScraper:
     def _add_header(self) -> None:
         """Add a header to the website"""
         self.driver.execute_script(open(f"{FILE_DIR}/browser/js/overlay.js", "r").read())
+
+
+def _import_selenium():
+    try:
+        global webdriver, By, EC, WebDriverWait, TimeoutException, WebDriverException
+        from selenium import webdriver
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.wait import WebDriverWait
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        global ChromeOptions, FirefoxOptions, SafariOptions
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        from selenium.webdriver.safari.options import Options as SafariOptions
+    except ImportError as e:
+        print(f"Failed to import Selenium: {str(e)}")
+        print("Please install Selenium and its dependencies to use BrowserScraper.")
+        print("You can install Selenium using pip:")
+        print("    pip install selenium")
+        print("If you're using a virtual environment, make sure it's activated.")
+        raise ImportError(
+            "Selenium is required but not installed. See error message above for installation instructions.") from e
+
+
+def create_driver(selenium_web_browser: str, headless: bool, user_agent: str, use_browser_cookies: bool = False):
+    """
+    Start a new browser driver. Used as the DriverPool factory, so it must not keep the driver
+    anywhere: the pool calls it from whichever thread needs a fresh driver.
+    """
+    _import_selenium()
+    options_available = {
+        "chrome": ChromeOptions,
+        "firefox": FirefoxOptions,
+        "safari": SafariOptions,
+    }
+
+    options = options_available[selenium_web_browser]()
+    options.add_argument(f"user-agent={user_agent}")
+    if headless:
+        options.add_argument("--headless=new" if selenium_web_browser == "chrome" else "--headless")
+    options.add_argument("--enable-javascript")
+
+    try:
+        if selenium_web_browser == "firefox":
+            driver = webdriver.Firefox(options=options)
+        elif selenium_web_browser == "safari":
+            driver = webdriver.Safari(options=options)
+        else:  # chrome
+            if platform == "linux" or platform == "linux2":
+                # No fixed --remote-debugging-port: pooled drivers run side by side
+                options.add_argument("--disable-dev-shm-usage")
+            options.add_argument("--no-sandbox")
+            options.add_experimental_option("prefs", {"download_restrictions": 3})
+            driver = webdriver.Chrome(options=options)
+
+        if use_browser_cookies:
+            _load_browser_cookies(driver, selenium_web_browser)
+
+        return driver
+    except Exception as e:
+        print(f"Failed to set up {selenium_web_browser} driver: {str(e)}")
+        print("Full stack trace:")
+        print(traceback.format_exc())
+        raise
+
+
+def _load_browser_cookies(driver, selenium_web_browser: str):
+    """Load cookies directly from the browser"""
+    try:
+        import browser_cookie3
+    except ImportError:
+        print("browser_cookie3 is not installed. Please install it using: pip install browser_cookie3")
+        return
+
+    if selenium_web_browser == "chrome":
+        cookies = browser_cookie3.chrome()
+    elif selenium_web_browser == "firefox":
+        cookies = browser_cookie3.firefox()
+    else:
+        print(f"Cookie loading not supported for {selenium_web_browser}")
+        return
+
+    for cookie in cookies:
+        driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain})
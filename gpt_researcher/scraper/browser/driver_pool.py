@@ -0,0 +1,172 @@
+import atexit
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_POOL_SIZE = 3
+DEFAULT_MAX_PAGES_PER_DRIVER = 50
+DEFAULT_ACQUIRE_TIMEOUT = 120
+COOKIE_WARMUP_URL = "https://www.google.com"
+
+
+class PooledDriver:
+    """
+    A selenium driver owned by the DriverPool, with the number of pages it has served.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages_served = 0
+
+
+class DriverPool:
+    """
+    Bounded, thread-safe pool of warm selenium drivers shared by all BrowserScraper instances.
+
+    Drivers are created lazily up to `max_drivers` and handed to one page at a time. A driver is
+    recycled after `max_pages_per_driver` pages, and replaced whenever it fails a health check or
+    raises during a scrape. The cookies harvested when warming up the first driver are kept in
+    memory and loaded into every new driver instead of being pickled to disk per page.
+
+    Scrapes run on the pool's own `executor`, which has one thread per driver: a scrape waiting
+    for a driver never holds one of the threads shared by the rest of the event loop.
+    """
+
+    _instance: Optional["DriverPool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, factory: Callable, max_drivers: int = DEFAULT_POOL_SIZE,
+                 max_pages_per_driver: int = DEFAULT_MAX_PAGES_PER_DRIVER):
+        """
+        Args:
+            factory: Callable returning a new selenium driver
+            max_drivers: Maximum number of drivers alive at the same time
+            max_pages_per_driver: Pages served by a driver before it is restarted
+        """
+        self.factory = factory
+        self.executor = ThreadPoolExecutor(max_workers=max_drivers, thread_name_prefix="browser-driver")
+        self.max_drivers = max_drivers
+        self.max_pages_per_driver = max_pages_per_driver
+        self.cookies: List[Dict] = []
+        self._idle: "queue.LifoQueue[PooledDriver]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_drivers)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.restarted = 0
+
+    @classmethod
+    def get_instance(cls, factory: Callable, max_drivers: int = DEFAULT_POOL_SIZE,
+                     max_pages_per_driver: int = DEFAULT_MAX_PAGES_PER_DRIVER) -> "DriverPool":
+        """
+        Returns the process wide pool, creating it with the given settings on first use.
+        """
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance._closed:
+                cls._instance = cls(factory, max_drivers, max_pages_per_driver)
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    def acquire(self, timeout: float = DEFAULT_ACQUIRE_TIMEOUT) -> PooledDriver:
+        """
+        Blocks until a driver is available and returns it. Idle drivers are health checked and
+        replaced if they crashed; a new driver is started if the pool is not yet full.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser driver became available within {timeout} seconds")
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if self._is_healthy(pooled):
+                    return pooled
+                self._quit(pooled)
+                self.restarted += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled: PooledDriver, discard: bool = False) -> None:
+        """
+        Returns a driver to the pool after serving a page. Drivers that errored or reached their
+        page budget are quit instead, freeing the slot for a fresh one.
+        """
+        try:
+            pooled.pages_served += 1
+            if discard or self._closed or pooled.pages_served >= self.max_pages_per_driver:
+                self._quit(pooled)
+                if not self._closed:
+                    self.restarted += 1
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    def _create(self) -> PooledDriver:
+        driver = self.factory()
+        pooled = PooledDriver(driver)
+        self._load_cookies(driver)
+        with self._lock:
+            self.created += 1
+        return pooled
+
+    def _load_cookies(self, driver) -> None:
+        """
+        Warms the driver up with Google cookies. Only the first driver waits for the cookies to be
+        set; later drivers reuse the in-memory jar.
+        """
+        try:
+            driver.get(COOKIE_WARMUP_URL)
+            with self._lock:
+                cookies = list(self.cookies)
+            if not cookies:
+                time.sleep(2)  # Wait for cookies to be set
+                cookies = driver.get_cookies()
+                with self._lock:
+                    self.cookies = cookies
+                return
+            for cookie in cookies:
+                driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"Failed to load cookies into browser driver: {str(e)}")
+            print(f"Full stack trace:\n{traceback.format_exc()}")
+
+    @staticmethod
+    def _is_healthy(pooled: PooledDriver) -> bool:
+        try:
+            return bool(pooled.driver.window_handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_drivers": self.max_drivers,
+            "idle": self._idle.qsize(),
+            "created": self.created,
+            "restarted": self.restarted,
+        }
+
+    def close(self) -> None:
+        """
+        Quits every idle driver. Drivers in use are quit when they are released.
+        """
+        self._closed = True
+        self.executor.shutdown(wait=False)
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..utils.disk_cache import DiskCache
+
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+DEFAULT_CACHE_MAX_SIZE_MB = 512
+
+# Query parameters that only track the visitor and never change the page content. `ref` is not one
+# of them: some sites select content with it (e.g. the branch of a GitHub page)
+_TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref_src"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a url so that trivially different spellings of the same page share a cache entry.
+
+    The scheme and host are lowercased, default ports and fragments are dropped, tracking query
+    parameters are removed and the remaining parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+class PageCache:
+    """
+    Persistent cache of scraped pages keyed by normalized url.
+
+    Each entry stores the extracted `raw_content`, `title` and `image_urls` of a page along with the
+    ETag / Last-Modified validators of the response it was extracted from, so expired entries can be
+    revalidated with a conditional GET instead of being downloaded and parsed again.
+    """
+
+    _instances: Dict[str, "PageCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, ttl: float = DEFAULT_CACHE_TTL,
+                 max_size_mb: float = DEFAULT_CACHE_MAX_SIZE_MB):
+        self.store = DiskCache(path, ttl=ttl, max_size_bytes=int(max_size_mb * 1024 * 1024))
+        self.revalidated = 0
+
+    @classmethod
+    def from_config(cls, cfg) -> Optional["PageCache"]:
+        """
+        Returns the process wide cache configured by `SCRAPER_CACHE_PATH`, or None when disabled.
+        """
+        path = getattr(cfg, "scraper_cache_path", None)
+        if not path:
+            return None
+        if os.path.isdir(path) or not os.path.splitext(path)[1]:
+            path = os.path.join(path, "pages.sqlite")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(
+                    path,
+                    ttl=getattr(cfg, "scraper_cache_ttl", DEFAULT_CACHE_TTL),
+                    max_size_mb=getattr(cfg, "scraper_cache_max_size_mb", DEFAULT_CACHE_MAX_SIZE_MB),
+                )
+            return cls._instances[path]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached page for the url, or None on a miss.
+
+        With `allow_stale`, expired pages are returned with `stale` set to True so the caller can
+        revalidate them using the `etag` and `last_modified` validators.
+        """
+        entry = self.store.get(self._key(url), allow_stale=allow_stale)
+        if entry is None:
+            return None
+        page = json.loads(entry.value)
+        page["url"] = url
+        page["stale"] = entry.is_stale
+        return page
+
+    def set(self, url: str, raw_content: str, title: str, image_urls: list,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        page = {
+            "raw_content": raw_content,
+            "title": title,
+            "image_urls": image_urls,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        self.store.set(self._key(url), json.dumps(page).encode("utf-8"))
+
+    def mark_revalidated(self, url: str) -> None:
+        """
+        Refreshes the TTL of a page after the origin answered a conditional GET with 304.
+        """
+        self.revalidated += 1
+        self.store.touch(self._key(url))
+
+    @staticmethod
+    def conditional_headers(page: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Builds the If-None-Match / If-Modified-Since headers to revalidate a cached page.
+        """
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        return headers
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss/revalidation counters and the size of the cache.
+        """
+        return {**self.store.stats(), "revalidated": self.revalidated}
+
+
+class PaperCache:
+    """
+    Persistent cache of the extracted full text of academic papers keyed by paper id (e.g.
+    `arxiv:2101.00001v1` or `doi:10.1000/xyz`), so a paper found again, by any retriever and under
+    any url, is not downloaded and parsed again. Versioned papers don't change, so entries never
+    expire and are only evicted by size.
+    """
+
+    _instances: Dict[str, "PaperCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str, max_size_mb: float = DEFAULT_CACHE_MAX_SIZE_MB):
+        self.store = DiskCache(path, ttl=None, max_size_bytes=int(max_size_mb * 1024 * 1024))
+
+    @classmethod
+    def from_config(cls, cfg) -> Optional["PaperCache"]:
+        """
+        Returns the process wide cache stored next to the page cache of `SCRAPER_CACHE_PATH`, or
+        None when caching is disabled.
+        """
+        path = getattr(cfg, "scraper_cache_path", None)
+        if not path:
+            return None
+        if os.path.isdir(path) or not os.path.splitext(path)[1]:
+            path = os.path.join(path, "papers.sqlite")
+        else:
+            path = os.path.join(os.path.dirname(path), "papers.sqlite")
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(
+                    path, max_size_mb=getattr(cfg, "scraper_cache_max_size_mb", DEFAULT_CACHE_MAX_SIZE_MB)
+                )
+            return cls._instances[path]
+
+    def get(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached paper (`raw_content`, `title`, `image_urls`), or None on a miss.
+        """
+        entry = self.store.get(paper_id)
+        return json.loads(entry.value) if entry is not None else None
+
+    def set(self, paper_id: str, raw_content: str, title: str, image_urls: list) -> None:
+        paper = {"raw_content": raw_content, "title": title, "image_urls": image_urls}
+        self.store.set(paper_id, json.dumps(paper).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
@@ -0,0 +1,99 @@
+from typing import Optional
+
+HTML = "text/html"
+XHTML = "application/xhtml+xml"
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PLAIN_TEXT = "text/plain"
+MARKDOWN = "text/markdown"
+CSV = "text/csv"
+JSON = "application/json"
+XML = "application/xml"
+OCTET_STREAM = "application/octet-stream"
+
+# Number of leading body bytes inspected before deciding how to handle a response
+SNIFF_BYTES = 2048
+
+# Magic numbers of formats we can extract, or that we recognise as useless binaries
+_SIGNATURES = [
+    (b"%PDF-", PDF),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"Rar!\x1a\x07", "application/vnd.rar"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+    (b"\x1aE\xdf\xa3", "video/webm"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+]
+
+_HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body", b"<title", b"<meta", b"<div", b"<p")
+
+# Sniffed types that are only guesses about text bodies and never override a specific header
+_WEAK_SNIFFS = {HTML, XHTML, XML, JSON, OCTET_STREAM}
+
+# Header values that say nothing about the actual payload
+_GENERIC_TYPES = {"", OCTET_STREAM, "binary/octet-stream", "application/download",
+                  "application/force-download", "application/x-download", "application/unknown"}
+
+
+def parse_mime_type(content_type_header: Optional[str]) -> str:
+    """
+    Returns the bare, lowercased MIME type of a Content-Type header value (without parameters).
+    """
+    if not content_type_header:
+        return ""
+    return content_type_header.split(";", 1)[0].strip().lower()
+
+
+def sniff_mime_type(prefix: bytes) -> Optional[str]:
+    """
+    Guesses the MIME type from the first bytes of a body, or returns None if nothing matches.
+    """
+    for signature, mime_type in _SIGNATURES:
+        if prefix.startswith(signature):
+            return mime_type
+
+    if prefix[8:12] == b"WEBP" and prefix.startswith(b"RIFF"):
+        return "image/webp"
+    if prefix[4:8] == b"ftyp":
+        return "video/mp4"
+    if prefix.startswith(b"PK\x03\x04"):
+        # Office Open XML files are zip archives; word documents keep their parts under word/
+        return DOCX if b"word/" in prefix else "application/zip"
+
+    head = prefix.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if head.startswith(_HTML_MARKERS):
+        return HTML
+    if head.startswith(b"<?xml"):
+        return XHTML if b"<html" in head else XML
+    if head.startswith((b"{", b"[")):
+        return JSON
+    if b"\x00" in prefix:
+        return OCTET_STREAM
+    return None
+
+
+def detect_content_type(content_type_header: Optional[str], prefix: bytes) -> str:
+    """
+    Decides the effective MIME type of a response from its Content-Type header and body prefix.
+
+    Magic numbers of binary formats win over the header (servers commonly send PDFs as
+    `application/octet-stream` or even `text/html`); text formats are only sniffed when the
+    header is missing or generic.
+    """
+    declared = parse_mime_type(content_type_header)
+    sniffed = sniff_mime_type(prefix)
+
+    if sniffed and sniffed not in _WEAK_SNIFFS:
+        if sniffed == "application/zip" and declared == DOCX:
+            return DOCX
+        return sniffed
+    if declared and declared not in _GENERIC_TYPES:
+        return declared
+    if sniffed:
+        return sniffed
+    return PLAIN_TEXT if prefix else HTML
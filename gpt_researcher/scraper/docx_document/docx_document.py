@@ -0,0 +1,44 @@
+import io
+
+import requests
+
+
+class DocxScraper:
+    """
+    Extractor for Word (.docx) documents, parsed in memory with python-docx.
+    """
+    timeout = 10
+
+    def __init__(self, link, session=None):
+        self.link = link
+        self.session = session or requests.Session()
+
+    def scrape(self) -> tuple:
+        """
+        Downloads the document and returns its text content, an empty image list and its title.
+        """
+        try:
+            response = self.session.get(self.link, timeout=self.timeout)
+            return self.extract(response)
+
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
+
+    def extract(self, response) -> tuple:
+        """
+        Extracts the paragraphs of the document followed by its table rows, along with the title
+        from the document properties.
+        """
+        from docx import Document
+
+        document = Document(io.BytesIO(response.content))
+        blocks = [paragraph.text.strip() for paragraph in document.paragraphs if paragraph.text.strip()]
+        for table in document.tables:
+            for row in table.rows:
+                cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if cells:
+                    blocks.append(" | ".join(cells))
+
+        title = document.core_properties.title or ""
+        return "\n".join(blocks), [], title
@@ -0,0 +1,204 @@
+import asyncio
+import importlib.util
+import time
+import weakref
+from typing import Callable, Dict, Mapping, Optional
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .content_type import SNIFF_BYTES, detect_content_type
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 6
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+# Seconds a whole download may take, however steadily its body arrives
+DEFAULT_DOWNLOAD_TIMEOUT = 60
+
+class UnsupportedContentType(Exception):
+    """
+    Raised when a download is aborted because no extractor can handle its content type.
+    """
+
+    def __init__(self, url: str, content_type: str):
+        super().__init__(f"Unsupported content type {content_type} for {url}")
+        self.url = url
+        self.content_type = content_type
+
+
+class ResponseTooLarge(Exception):
+    """
+    Raised when a download is aborted because its body exceeds the size limit for its content type.
+    """
+
+    def __init__(self, url: str, content_type: str, max_bytes: int):
+        super().__init__(f"{content_type} body of {url} exceeds {max_bytes} bytes")
+        self.url = url
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+
+
+# aiohttp only decodes brotli bodies when a brotli package is importable
+_BROTLI_AVAILABLE = bool(
+    importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+)
+ACCEPT_ENCODING = "gzip, deflate, br" if _BROTLI_AVAILABLE else "gzip, deflate"
+
+
+class FetchResponse:
+    """
+    The downloaded body and metadata of a single HTTP response.
+    """
+
+    def __init__(self, url: str, status: int, headers: Mapping[str, str], content: bytes,
+                 encoding: Optional[str] = None, content_type: Optional[str] = None,
+                 first_byte_time: Optional[float] = None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.content_type = content_type
+        # Seconds from sending the request until the response headers arrived
+        self.first_byte_time = first_byte_time
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class AsyncFetcher:
+    """
+    Non-blocking HTTP client shared by all scrapers running on the same event loop.
+
+    A single aiohttp session is kept per event loop so that connections, keep-alive sockets
+    and cached DNS lookups are reused across sub-queries and concurrent researches.
+    """
+
+    _instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFetcher]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 download_timeout: Optional[float] = DEFAULT_DOWNLOAD_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.download_timeout = download_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, cfg=None) -> "AsyncFetcher":
+        """
+        Returns the fetcher bound to the running event loop, creating it from the config if needed.
+        """
+        loop = asyncio.get_running_loop()
+        fetcher = cls._instances.get(loop)
+        if fetcher is None or fetcher.closed:
+            fetcher = cls(
+                max_connections=getattr(cfg, "scraper_max_connections", DEFAULT_MAX_CONNECTIONS),
+                max_connections_per_host=getattr(
+                    cfg, "scraper_max_connections_per_host", DEFAULT_MAX_CONNECTIONS_PER_HOST
+                ),
+                download_timeout=getattr(cfg, "scraper_download_timeout", DEFAULT_DOWNLOAD_TIMEOUT) or None,
+            )
+            cls._instances[loop] = fetcher
+        return fetcher
+
+    @property
+    def closed(self) -> bool:
+        return self._session is not None and self._session.closed
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Accept-Encoding": ACCEPT_ENCODING},
+            )
+        return self._session
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  timeout: float = 4, accept: Optional[Callable[[str], bool]] = None,
+                  max_bytes: Optional[Callable[[str], Optional[int]]] = None) -> FetchResponse:
+        """
+        Downloads the url and returns the full decoded body.
+
+        The effective content type is detected from the Content-Type header and the first bytes
+        of the body before the rest is downloaded.
+
+        Args:
+            url: The url to fetch
+            headers: Extra request headers (e.g. User-Agent)
+            timeout: Timeout for connecting, for the response headers and for every read of the
+                body, in seconds. The whole download is bounded by the fetcher's `download_timeout`,
+                so a large document arriving steadily is not cut short
+            accept: Predicate on the detected MIME type of a successful response. If it returns
+                False the download is aborted and UnsupportedContentType is raised
+            max_bytes: Returns the body size limit for the detected MIME type, or None for no limit.
+                Larger downloads are aborted (from Content-Length when the server sends it) and
+                ResponseTooLarge is raised
+
+        Returns:
+            FetchResponse: The response status, headers, detected content type and body
+        """
+        start = time.monotonic()
+        async with self.session.get(
+            url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(
+                total=self.download_timeout, sock_connect=timeout, sock_read=timeout
+            ),
+        ) as response:
+            first_byte_time = time.monotonic() - start
+            prefix = b""
+            while len(prefix) < SNIFF_BYTES:
+                chunk = await response.content.read(SNIFF_BYTES - len(prefix))
+                if not chunk:
+                    break
+                prefix += chunk
+
+            content_type = detect_content_type(response.headers.get("Content-Type"), prefix)
+            if accept is not None and 200 <= response.status < 300 and not accept(content_type):
+                # Leaving the context without reading the body closes the connection
+                raise UnsupportedContentType(url, content_type)
+
+            limit = max_bytes(content_type) if max_bytes is not None and 200 <= response.status < 300 else None
+            if limit is None:
+                content = prefix + await response.content.read()
+            else:
+                if (response.content_length or 0) > limit:
+                    raise ResponseTooLarge(url, content_type, limit)
+                chunks = [prefix]
+                size = len(prefix)
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    size += len(chunk)
+                    if size > limit:
+                        raise ResponseTooLarge(url, content_type, limit)
+                    chunks.append(chunk)
+                content = b"".join(chunks)
+            return FetchResponse(
+                url=str(response.url),
+                status=response.status,
+                headers=CIMultiDict(response.headers),
+                content=content,
+                encoding=response.charset,
+                content_type=content_type,
+                first_byte_time=first_byte_time,
+            )
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
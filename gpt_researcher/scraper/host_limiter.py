@@ -0,0 +1,259 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from ..utils.rate_limit import TokenBucket
+
+DEFAULT_MAX_CONCURRENCY_PER_HOST = 6
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN = 60.0
+LATENCY_SAMPLES = 100
+# Adaptive timeouts: a multiple of the host's p95 time to first byte, once enough requests were
+# observed. Only the wait for the connection, the headers and each read adapts: the time a whole
+# download takes depends on its size, not just on the host
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 5
+ADAPTIVE_TIMEOUT_FACTOR = 3.0
+ADAPTIVE_TIMEOUT_MIN = 1.0
+ADAPTIVE_TIMEOUT_MAX_FACTOR = 2.0
+
+# Statuses that mean the host is overloaded or blocking us, as opposed to a missing page
+_FAILURE_STATUSES = {403, 429, 500, 502, 503, 504}
+_FAILURE_EXCEPTIONS = (asyncio.TimeoutError, TimeoutError, ConnectionError, aiohttp.ClientError)
+
+
+class HostUnavailable(Exception):
+    """
+    Raised instead of contacting a host whose circuit breaker is open.
+    """
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Skipping {host} after repeated failures, retry in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class HostSlot:
+    """
+    Handed to the caller while it holds a host slot, to report failures that are not exceptions.
+    """
+
+    def __init__(self):
+        self.failed = False
+        self.first_byte_time: Optional[float] = None
+
+    def record_status(self, status: int) -> None:
+        if status in _FAILURE_STATUSES:
+            self.failed = True
+
+    def record_first_byte(self, seconds: Optional[float]) -> None:
+        """Reports how long the response headers took, sampled instead of the time of the block"""
+        self.first_byte_time = seconds
+
+
+class HostState:
+    """
+    Concurrency, rate, circuit breaker and latency bookkeeping of a single host.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_second: float):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.bucket = TokenBucket(requests_per_second, capacity=max_concurrency) if requests_per_second else None
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def circuit(self, now: float) -> str:
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if now < self.open_until or self.probing else "half_open"
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(percentile / 100 * len(ordered)))]
+
+
+class HostLimiter:
+    """
+    Per-host politeness and failure isolation for the scraper, shared by all scrapes on an event
+    loop.
+
+    Every host gets a cap on concurrent requests and a token bucket limiting how fast new requests
+    are started, so result lists clustered on a few domains don't hammer them. After
+    `failure_threshold` consecutive failures (timeouts, connection errors, 403/429/5xx) the host's
+    circuit opens and it is skipped for `cooldown` seconds; then a single probe request decides
+    whether it closes again.
+    """
+
+    _instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostLimiter]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_COOLDOWN):
+        """
+        Args:
+            max_concurrency_per_host: Requests in flight to one host at the same time
+            requests_per_second: Rate at which requests to one host are started (0 disables it)
+            failure_threshold: Consecutive failures before a host is skipped (0 disables it)
+            cooldown: Seconds a failing host is skipped before it is probed again
+        """
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.requests_per_second = requests_per_second
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hosts: Dict[str, HostState] = {}
+
+    @classmethod
+    def from_config(cls, cfg=None) -> "HostLimiter":
+        """
+        Returns the limiter bound to the running event loop, creating it from the config if needed.
+        """
+        loop = asyncio.get_running_loop()
+        limiter = cls._instances.get(loop)
+        if limiter is None:
+            limiter = cls(
+                max_concurrency_per_host=getattr(
+                    cfg, "scraper_max_connections_per_host", DEFAULT_MAX_CONCURRENCY_PER_HOST
+                ),
+                requests_per_second=getattr(cfg, "scraper_host_requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+                failure_threshold=getattr(cfg, "scraper_host_failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                cooldown=getattr(cfg, "scraper_host_cooldown", DEFAULT_COOLDOWN),
+            )
+            cls._instances[loop] = limiter
+        return limiter
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).hostname or url
+
+    def _state(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.max_concurrency_per_host, self.requests_per_second)
+        return state
+
+    def _check_circuit(self, host: str, state: HostState) -> bool:
+        """
+        Raises HostUnavailable while the circuit is open. Returns True if the request is the probe
+        of a half-open circuit.
+        """
+        now = time.monotonic()
+        circuit = state.circuit(now)
+        if circuit == "closed":
+            return False
+        if circuit == "half_open":
+            state.probing = True
+            return True
+        state.skipped += 1
+        raise HostUnavailable(host, max(0.0, state.open_until - now))
+
+    @asynccontextmanager
+    async def acquire(self, url: str):
+        """
+        Holds a slot of the url's host for the duration of the block, after waiting for the host's
+        rate limit. The time to first byte reported on the yielded HostSlot, or else the time spent
+        in the block, is recorded as the host's latency, and exceptions or statuses reported on
+        the slot count as failures of the host.
+
+        Raises:
+            HostUnavailable: If the host's circuit breaker is open
+        """
+        host = self.host_of(url)
+        state = self._state(host)
+        slot = HostSlot()
+        async with state.semaphore:
+            if state.bucket is not None:
+                await state.bucket.acquire()
+            # Checked once a slot is free, so requests queued behind a failing host are skipped too
+            probe = self._check_circuit(host, state)
+            state.in_flight += 1
+            state.requests += 1
+            start = time.monotonic()
+            try:
+                yield slot
+            except asyncio.CancelledError:
+                # A cancelled request says nothing about the host
+                state.in_flight -= 1
+                state.probing = False
+                raise
+            except _FAILURE_EXCEPTIONS as e:
+                slot.failed = True
+                if isinstance(e, (asyncio.TimeoutError, TimeoutError)):
+                    state.timeouts += 1
+                self._record(state, start, slot, probe)
+                raise
+            except BaseException:
+                self._record(state, start, slot, probe)
+                raise
+            else:
+                self._record(state, start, slot, probe)
+
+    def _record(self, state: HostState, start: float, slot: HostSlot, probe: bool) -> None:
+        state.in_flight -= 1
+        if probe:
+            state.probing = False
+        if not slot.failed:
+            # Only successful requests are sampled, a timeout would just echo the timeout back
+            latency = slot.first_byte_time
+            state.latencies.append(latency if latency is not None else time.monotonic() - start)
+            state.consecutive_failures = 0
+            state.open_until = 0.0
+            return
+        state.failures += 1
+        state.consecutive_failures += 1
+        if probe or (self.failure_threshold and state.consecutive_failures >= self.failure_threshold):
+            state.open_until = time.monotonic() + self.cooldown
+
+    def first_byte_timeout(self, url: str, default: float) -> Optional[float]:
+        """
+        Returns the timeout for connecting to the url's host, receiving its response headers and
+        each read of the body, or None while the host's latency is unknown.
+
+        Once `ADAPTIVE_TIMEOUT_MIN_SAMPLES` successful requests were observed it is
+        `ADAPTIVE_TIMEOUT_FACTOR` times the host's p95 time to first byte, between
+        `ADAPTIVE_TIMEOUT_MIN` seconds and `ADAPTIVE_TIMEOUT_MAX_FACTOR` times `default`: hosts
+        that stop answering are given up on quickly, while a large document from a fast host still
+        has the full total timeout to download.
+        """
+        state = self.hosts.get(self.host_of(url))
+        if state is None or len(state.latencies) < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+            return None
+        timeout = state.latency_percentile(95) * ADAPTIVE_TIMEOUT_FACTOR
+        return min(max(timeout, ADAPTIVE_TIMEOUT_MIN), default * ADAPTIVE_TIMEOUT_MAX_FACTOR)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-host request, failure and latency statistics (time to first byte of successful
+        requests, or their duration when it wasn't reported, in seconds).
+        """
+        now = time.monotonic()
+        return {
+            host: {
+                "requests": state.requests,
+                "failures": state.failures,
+                "timeouts": state.timeouts,
+                "skipped": state.skipped,
+                "in_flight": state.in_flight,
+                "p50_latency": state.latency_percentile(50),
+                "p95_latency": state.latency_percentile(95),
+                "circuit": state.circuit(now),
+            }
+            for host, state in self.hosts.items()
+        }
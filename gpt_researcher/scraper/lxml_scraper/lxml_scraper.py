@@ -0,0 +1,185 @@
+from urllib.parse import urljoin
+
+import requests
+from lxml import etree, html
+
+from ..utils import score_image, select_relevant_images
+
+# Subtrees that never contain readable content
+SKIPPED_TAGS = {
+    "script", "style", "noscript", "template", "svg", "math", "iframe", "canvas", "object",
+    "embed", "video", "audio", "select", "option", "button", "input", "textarea", "form",
+    "nav", "footer", "aside",
+}
+
+# Elements that start a new line of text
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "body", "caption", "dd", "details", "div", "dl", "dt",
+    "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+    "ol", "p", "pre", "section", "summary", "table", "tbody", "tfoot", "thead", "tr", "ul", "br",
+}
+
+# Table cells stay on the line of their row, separated by a space
+CELL_TAGS = {"td", "th"}
+
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# class / id tokens of containers that hold navigation and other page chrome
+BOILERPLATE_TOKENS = {
+    "nav", "navbar", "navigation", "menu", "sidebar", "footer", "breadcrumb", "breadcrumbs",
+    "cookie", "cookies", "cookie-banner", "banner", "advert", "advertisement", "ads", "share",
+    "social", "related", "newsletter", "subscribe", "popup", "modal", "skip-link",
+}
+
+# Blocks whose text is mostly link text are menus, tag clouds or pagination
+MAX_LINK_DENSITY = 0.5
+MIN_BLOCK_WORDS = 3
+
+
+class _Block:
+    """Text collected for one run of a block element, with the share of it that is link text."""
+
+    __slots__ = ("parts", "link_chars", "heading", "preformatted")
+
+    def __init__(self, heading: bool = False, preformatted: bool = False):
+        self.parts = []
+        self.link_chars = 0
+        self.heading = heading
+        self.preformatted = preformatted
+
+
+class LxmlScraper:
+    """
+    Single pass HTML extractor built on lxml.
+
+    The tree is walked exactly once. Every text node is appended to the block element that
+    encloses it, so nested containers never emit the same text twice, and boilerplate blocks are
+    dropped by link density. The title and image candidates are collected during the same walk.
+    """
+    timeout = 4
+
+    def __init__(self, link, session=None):
+        self.link = link
+        self.session = session or requests.Session()
+
+    def scrape(self) -> tuple:
+        """
+        Downloads the page and returns its cleaned text content, relevant images and title.
+        """
+        try:
+            response = self.session.get(self.link, timeout=self.timeout)
+            return self.extract(response)
+
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
+
+    def extract(self, response) -> tuple:
+        """
+        Extracts the cleaned text content, relevant images and title from an already downloaded
+        response (anything exposing `content` and `encoding`).
+        """
+        parser = html.HTMLParser(remove_comments=True, remove_pis=True, encoding=response.encoding)
+        root = html.fromstring(response.content, parser=parser)
+        return self.extract_from_tree(root)
+
+    def extract_from_tree(self, root) -> tuple:
+        return extract_from_tree(root, self.link)
+
+
+def extract_from_tree(root, link: str = "") -> tuple:
+    """
+    Extracts the cleaned text content, relevant images and title of a parsed page. Image urls are
+    resolved against `link`.
+    """
+    lines = []
+    images = []
+    title = ""
+
+    stack = [_Block()]  # open blocks, innermost last; the root block catches stray text
+    link_depth = 0
+    skipped = None  # element whose subtree was just skipped; its end event still fires
+    walker = etree.iterwalk(root, events=("start", "end"))
+    for event, element in walker:
+        tag = element.tag if isinstance(element.tag, str) else ""
+
+        if event == "start":
+            if tag == "title":
+                title = title or (element.text or "").strip()
+                walker.skip_subtree()
+                skipped = element
+                continue
+            if tag == "img":
+                _add_image_candidate(element, images, link)
+            if tag in SKIPPED_TAGS or _is_boilerplate(element):
+                walker.skip_subtree()
+                skipped = element
+                continue
+            if tag in BLOCK_TAGS:
+                if stack:
+                    _flush(stack[-1], lines)
+                stack.append(_Block(heading=tag in HEADING_TAGS, preformatted=tag == "pre"))
+            elif tag in CELL_TAGS and stack:
+                stack[-1].parts.append(" ")
+            if tag == "a":
+                link_depth += 1
+            if element.text and stack:
+                _append(stack[-1], element.text, link_depth > 0)
+            continue
+
+        # end event: close the element, then its tail belongs to the enclosing block
+        if element is not skipped:
+            if tag == "a":
+                link_depth -= 1
+            if tag in BLOCK_TAGS and stack:
+                _flush(stack.pop(), lines)
+        if element.tail and stack:
+            _append(stack[-1], element.tail, link_depth > 0)
+
+    while stack:
+        _flush(stack.pop(), lines)
+
+    return "\n".join(lines), select_relevant_images(images), title
+
+
+def _append(block: _Block, text: str, in_link: bool) -> None:
+    block.parts.append(text)
+    if in_link:
+        block.link_chars += len(text.strip())
+
+
+def _flush(block: _Block, lines: list) -> None:
+    """Emits the pending text of a block as one line if it passes the density filters."""
+    if not block.parts:
+        return
+    text = "".join(block.parts)
+    text = text.strip("\n") if block.preformatted else " ".join(text.split())
+    link_chars = block.link_chars
+    block.parts = []
+    block.link_chars = 0
+    if not text.strip():
+        return
+    if not block.heading and len(text.split()) < MIN_BLOCK_WORDS:
+        return
+    if link_chars / len(text) > MAX_LINK_DENSITY:
+        return
+    lines.append(text)
+
+
+def _is_boilerplate(element) -> bool:
+    if element.get("role") in ("navigation", "banner", "contentinfo", "complementary"):
+        return True
+    tokens = f"{element.get('class', '')} {element.get('id', '')}".lower().split()
+    return any(token in BOILERPLATE_TOKENS for token in tokens)
+
+
+def _add_image_candidate(element, images: list, link: str) -> None:
+    src = element.get("src")
+    if not src:
+        return
+    img_src = urljoin(link, src)
+    score = score_image(
+        img_src, element.get("class", "").split(), element.get("width"), element.get("height")
+    )
+    if score is not None:
+        images.append({"url": img_src, "score": score})
@@ -0,0 +1,133 @@
+import asyncio
+import atexit
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+DEFAULT_PARSE_WORKERS = 0
+DEFAULT_PARSE_BATCH_SIZE = 8
+# How long a partial batch waits for more pages before it is shipped anyway
+BATCH_WINDOW = 0.01
+
+
+def extract_batch(jobs: List[Tuple[type, str, object]]) -> List[tuple]:
+    """
+    Runs in a worker process: extracts every (extractor class, link, response) job and returns
+    only the compact (content, image_urls, title) results, or the error message of failed jobs.
+    """
+    results = []
+    for extractor_class, link, response in jobs:
+        try:
+            results.append(("ok", extractor_class(link).extract(response)))
+        except Exception as e:
+            results.append(("error", f"{type(e).__name__}: {e}"))
+    return results
+
+
+class _Batch:
+    """Jobs waiting to be shipped to the pool, with the futures of their callers."""
+
+    def __init__(self):
+        self.jobs = []
+        self.futures = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class ParsePool:
+    """
+    Process pool running the CPU-bound HTML extraction outside the event loop's process.
+
+    Downloaded responses are shipped to worker processes in batches of up to `batch_size` pages
+    (amortizing the pickling round trip), and only the extracted text, images and title come
+    back. The pool is shared by the whole process; batching is done per event loop.
+    """
+
+    _instance: Optional["ParsePool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers: int, batch_size: int = DEFAULT_PARSE_BATCH_SIZE):
+        """
+        Args:
+            workers: Number of worker processes
+            batch_size: Pages sent to a worker in a single task
+        """
+        self.workers = workers
+        self.batch_size = max(1, batch_size)
+        self.executor = self._new_executor()
+        self._tasks = set()
+        self._batches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Batch]" = weakref.WeakKeyDictionary()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: the scraper runs alongside threads, which fork doesn't play well with
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    @classmethod
+    def from_config(cls, cfg=None) -> Optional["ParsePool"]:
+        """
+        Returns the process wide pool configured by `SCRAPER_PARSE_WORKERS`, or None when disabled.
+        """
+        workers = getattr(cfg, "scraper_parse_workers", DEFAULT_PARSE_WORKERS)
+        if not workers or workers <= 0:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(workers, getattr(cfg, "scraper_parse_batch_size", DEFAULT_PARSE_BATCH_SIZE))
+                atexit.register(cls._instance.close)
+            return cls._instance
+
+    async def extract(self, extractor_class: type, link: str, response) -> tuple:
+        """
+        Extracts the response with `extractor_class(link).extract(response)` in a worker process.
+
+        Returns:
+            tuple: The content, image urls and title returned by the extractor
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(loop)
+        if batch is None:
+            batch = self._batches[loop] = _Batch()
+
+        future = loop.create_future()
+        batch.jobs.append((extractor_class, link, response))
+        batch.futures.append(future)
+        if len(batch.jobs) >= self.batch_size:
+            self._flush(loop)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(BATCH_WINDOW, self._flush, loop)
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        batch = self._batches.pop(loop, None)
+        if batch is None or not batch.jobs:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = loop.create_task(self._run_batch(loop, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, loop: asyncio.AbstractEventLoop, batch: _Batch) -> None:
+        try:
+            results = await loop.run_in_executor(self.executor, extract_batch, batch.jobs)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A crashed worker (e.g. killed by the OOM killer) breaks the whole pool
+                self.executor = self._new_executor()
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, (status, value) in zip(batch.futures, results):
+            if future.done():
+                continue
+            if status == "ok":
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
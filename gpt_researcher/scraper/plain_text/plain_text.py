@@ -0,0 +1,40 @@
+import json
+
+import requests
+
+
+class PlainTextScraper:
+    """
+    Extractor for text payloads that need no HTML parsing (plain text, markdown, csv and json).
+    """
+    timeout = 4
+
+    def __init__(self, link, session=None):
+        self.link = link
+        self.session = session or requests.Session()
+
+    def scrape(self) -> tuple:
+        """
+        Downloads the link and returns its text content, an empty image list and an empty title.
+        """
+        try:
+            response = self.session.get(self.link, timeout=self.timeout)
+            return self.extract(response)
+
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
+
+    def extract(self, response) -> tuple:
+        """
+        Decodes the body of an already downloaded response. JSON documents are re-indented so the
+        keys and values end up on separate lines when the content is chunked.
+        """
+        text = response.content.decode(response.encoding or "utf-8", errors="replace")
+        content_type = (response.headers.get("Content-Type") or "").lower()
+        if "json" in content_type or text.lstrip().startswith(("{", "[")):
+            try:
+                text = json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+            except ValueError:
+                pass
+        return text.strip(), [], ""
@@ -1,11 +1,52 @@
+import multiprocessing
 import os
-import requests
-import tempfile
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
 from urllib.parse import urlparse
-from langchain_community.document_loaders import PyMuPDFLoader
+
+import pymupdf
+import requests
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_SIZE_MB = 20
+# Worker processes are off by default: each one imports the package on start (about 2 s), while
+# the default 50 page cap is extracted in a fraction of a second
+DEFAULT_EXTRACT_WORKERS = 1
+# Documents shorter than this are not worth handing to worker processes
+PARALLEL_MIN_PAGES = 200
+
+_TEXT_FLAGS = pymupdf.TEXTFLAGS_TEXT | pymupdf.TEXT_DEHYPHENATE
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_TRAILING_SPACES = re.compile(r"[ \t]+\n")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def clean_page_text(text: str) -> str:
+    """Removes control characters, trailing spaces and runs of blank lines from a page's text"""
+    text = _CONTROL_CHARS.sub("", text)
+    text = _TRAILING_SPACES.sub("\n", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """
+    Extracts the cleaned text of pages [start, stop) of an in-memory PDF. Runs in worker
+    processes, each of which opens the document itself since MuPDF documents can't be shared.
+    """
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        return [clean_page_text(doc[number].get_text(flags=_TEXT_FLAGS)) for number in range(start, stop)]
 
 
 class PyMuPDFScraper:
+    timeout = 5
+    max_pages = DEFAULT_MAX_PAGES
+    max_bytes = DEFAULT_MAX_SIZE_MB * 1024 * 1024
+    extract_workers = DEFAULT_EXTRACT_WORKERS
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
 
     def __init__(self, link, session=None):
         """
@@ -18,6 +59,13 @@ class PyMuPDFScraper:
         self.link = link
         self.session = session
 
+    @classmethod
+    def configure(cls, cfg) -> None:
+        """Apply the PDF limits from the config (PDF_MAX_PAGES, PDF_MAX_SIZE_MB, PDF_EXTRACT_WORKERS)"""
+        cls.max_pages = getattr(cfg, "pdf_max_pages", DEFAULT_MAX_PAGES)
+        cls.max_bytes = int(getattr(cfg, "pdf_max_size_mb", DEFAULT_MAX_SIZE_MB) * 1024 * 1024)
+        cls.extract_workers = getattr(cfg, "pdf_extract_workers", DEFAULT_EXTRACT_WORKERS)
+
     def is_url(self) -> bool:
         """
         Check if the provided `link` is a valid URL.
@@ -31,35 +79,103 @@ class PyMuPDFScraper:
         except Exception:
             return False
 
-    def scrape(self) -> str:
+    def scrape(self) -> tuple:
         """
-        The `scrape` function uses PyMuPDFLoader to load a document from the provided link (either URL or local file)
-        and returns the document as a string.
+        The `scrape` function downloads the PDF from the provided link (or reads the local file)
+        into memory and returns its text.
 
         Returns:
-          str: A string representation of the loaded document.
+          tuple: The text of the document, an empty image list and the title.
         """
         try:
             if self.is_url():
-                response = requests.get(self.link, timeout=5, stream=True)
+                response = (self.session or requests).get(self.link, timeout=self.timeout, stream=True)
                 response.raise_for_status()
+                if int(response.headers.get("Content-Length") or 0) > self.max_bytes:
+                    raise ValueError(f"PDF is larger than {self.max_bytes} bytes")
+                data = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    data += chunk
+                    if len(data) > self.max_bytes:
+                        raise ValueError(f"PDF is larger than {self.max_bytes} bytes")
+                return self.extract_bytes(bytes(data))
 
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                    temp_filename = temp_file.name  # Get the temporary file name
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)  # Write the downloaded content to the temporary file
+            if os.path.getsize(self.link) > self.max_bytes:
+                raise ValueError(f"PDF is larger than {self.max_bytes} bytes")
+            with open(self.link, "rb") as f:
+                return self.extract_bytes(f.read())
+
+        except requests.exceptions.Timeout:
+            print(f"Download timed out. Please check the link : {self.link}")
+        except Exception as e:
+            print(f"Error loading PDF : {self.link} {e}")
+        return "", [], ""
 
-                loader = PyMuPDFLoader(temp_filename)
-                doc = loader.load()
+    def extract(self, response) -> tuple:
+        """
+        Parses the PDF straight from an already downloaded response.
 
-                os.remove(temp_filename)
+        Returns:
+          tuple: The text of the document, an empty image list and the title.
+        """
+        return self.extract_bytes(response.content)
+
+    def extract_bytes(self, data: bytes) -> tuple:
+        """
+        Extracts the text of the first `max_pages` pages of an in-memory PDF.
+
+        Each page is preceded by a `[Page N]` marker so chunks of the text can still be cited by
+        page. With `PDF_EXTRACT_WORKERS` above 1, documents of at least `PARALLEL_MIN_PAGES`
+        pages are split into page ranges extracted in parallel worker processes.
+
+        Returns:
+          tuple: The text of the document, an empty image list and the title.
+        """
+        with pymupdf.open(stream=data, filetype="pdf") as doc:
+            page_count = min(doc.page_count, self.max_pages) if self.max_pages else doc.page_count
+            title = (doc.metadata or {}).get("title") or ""
+            if page_count < PARALLEL_MIN_PAGES or self._workers() <= 1:
+                pages = [clean_page_text(doc[number].get_text(flags=_TEXT_FLAGS)) for number in range(page_count)]
             else:
-                loader = PyMuPDFLoader(self.link)
-                doc = loader.load()
+                pages = None
 
-            return str(doc)
+        if pages is None:
+            pages = self._extract_parallel(data, page_count)
 
-        except requests.exceptions.Timeout:
-            print(f"Download timed out. Please check the link : {self.link}")
+        parts = [f"[Page {number}]\n{text}" for number, text in enumerate(pages, start=1) if text]
+        return "\n\n".join(parts), [], title
+
+    def _workers(self) -> int:
+        return min(self.extract_workers or 1, os.cpu_count() or 1)
+
+    def _extract_parallel(self, data: bytes, page_count: int) -> List[str]:
+        workers = self._workers()
+        step = -(-page_count // workers)
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        try:
+            executor = self._get_executor(workers)
+            futures = [executor.submit(extract_page_range, data, start, stop) for start, stop in ranges]
+            return [text for future in futures for text in future.result()]
         except Exception as e:
-            print(f"Error loading PDF : {self.link} {e}")
+            # A broken pool must not lose the document; fall back to extracting in this process
+            print(f"Parallel PDF extraction failed, extracting sequentially: {e}")
+            self._reset_executor()
+            with pymupdf.open(stream=data, filetype="pdf") as doc:
+                return [clean_page_text(doc[number].get_text(flags=_TEXT_FLAGS)) for number in range(page_count)]
+
+    @classmethod
+    def _get_executor(cls, workers: int) -> ProcessPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                # spawn: the scraper runs alongside threads, which fork doesn't play well with
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._executor
+
+    @classmethod
+    def _reset_executor(cls) -> None:
+        with cls._executor_lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
@@ -1,7 +1,6 @@
-from concurrent.futures.thread import ThreadPoolExecutor
-from functools import partial
 from colorama import Fore, init
 
+import asyncio
 import requests
 import subprocess
 import sys
@@ -10,11 +9,22 @@ import importlib
 from . import (
     ArxivScraper,
     BeautifulSoupScraper,
+    LxmlScraper,
     PyMuPDFScraper,
     WebBaseLoaderScraper,
     BrowserScraper,
-    TavilyExtract
+    TavilyExtract,
+    PlainTextScraper,
+    DocxScraper,
 )
+from . import content_type
+from .content_type import HTML, XHTML
+from .fetcher import AsyncFetcher
+from .cache import PageCache
+from .host_limiter import HostLimiter
+from .parse_pool import ParsePool
+
+HTML_TYPES = {HTML, XHTML}
 
 
 class Scraper:
@@ -22,28 +32,95 @@ class Scraper:
     Scraper class to extract the content from the links
     """
 
-    def __init__(self, urls, user_agent, scraper):
+    SCRAPER_CLASSES = {
+        "pdf": PyMuPDFScraper,
+        "arxiv": ArxivScraper,
+        "bs": BeautifulSoupScraper,
+        "lxml": LxmlScraper,
+        "web_base_loader": WebBaseLoaderScraper,
+        "browser": BrowserScraper,
+        "tavily_extract": TavilyExtract
+    }
+
+    # Extractors for the non-HTML content types we can use, keyed by detected MIME type
+    EXTRACTOR_CLASSES = {
+        content_type.PDF: PyMuPDFScraper,
+        content_type.DOCX: DocxScraper,
+        content_type.PLAIN_TEXT: PlainTextScraper,
+        content_type.MARKDOWN: PlainTextScraper,
+        content_type.CSV: PlainTextScraper,
+        content_type.JSON: PlainTextScraper,
+    }
+
+    def __init__(self, urls, user_agent, scraper, cfg=None):
         """
         Initialize the Scraper class.
         Args:
             urls:
+            user_agent: User-Agent header sent with every request
+            scraper: The default scraper key (see `get_scraper`)
+            cfg: Config (optional), used to tune the shared async fetcher and the page cache
         """
         self.urls = urls
+        self.user_agent = user_agent
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": user_agent})
         self.scraper = scraper
+        self.cfg = cfg
+        self.page_cache = PageCache.from_config(cfg)
+        self.host_limiter = None
+        self.parse_pool = ParsePool.from_config(cfg)
         if self.scraper == "tavily_extract":
             self._check_pkg(self.scraper)
+        if self.scraper == "browser":
+            BrowserScraper.configure_pool(cfg)
+        PyMuPDFScraper.configure(cfg)
+
+    async def run(self):
+        """
+        Extracts the content from the links concurrently without blocking the event loop.
 
-    def run(self):
+        With `SCRAPER_QUORUM` set to K, scraping stops as soon as K pages with content have
+        arrived and the fetches still in flight are cancelled, so a few slow pages don't hold up
+        the sub-query. Results keep the order of `urls`.
         """
-        Extracts the content from the links
+        tasks = self.start()
+        quorum = getattr(self.cfg, "scraper_quorum", 0)
+        if not quorum or quorum >= len(tasks):
+            contents = await asyncio.gather(*tasks)
+            return [content for content in contents if content["raw_content"] is not None]
+
+        scraped = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                content = await next_done
+                if content["raw_content"] is not None:
+                    scraped += 1
+                    if scraped >= quorum:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return [
+            task.result() for task in tasks
+            if not task.cancelled() and task.result()["raw_content"] is not None
+        ]
+
+    def start(self):
         """
-        partial_extract = partial(self.extract_data_from_url, session=self.session)
-        with ThreadPoolExecutor(max_workers=20) as executor:
-            contents = executor.map(partial_extract, self.urls)
-        res = [content for content in contents if content["raw_content"] is not None]
-        return res
+        Starts extracting the content of every link in the background on the running event loop.
+
+        Returns:
+            list: The task of each link, in the order of `urls`
+        """
+        fetcher = AsyncFetcher.from_config(self.cfg)
+        self.host_limiter = HostLimiter.from_config(self.cfg)
+        return [
+            asyncio.ensure_future(self.extract_data_from_url(url, self.session, fetcher))
+            for url in self.urls
+        ]
 
     def _check_pkg(self, scrapper_name : str) -> None:
         """
@@ -69,22 +146,115 @@ class Scraper:
                                f"`pip install -U {pkg_inst_name}`"
                 )
 
-    def extract_data_from_url(self, link, session):
+    async def extract_data_from_url(self, link, session, fetcher=None):
         """
-        Extracts the data from the link
+        Extracts the data from the link.
+
+        Scrapers implementing the extractor interface (`extract(response)`) never touch the
+        network themselves: the page is downloaded exactly once through the shared `AsyncFetcher`
+        and the same bytes and headers are handed to the extractor. HTML is extracted in the
+        process pool when `SCRAPER_PARSE_WORKERS` is set, other types in a worker thread. Scrapers
+        without it (selenium, arxiv, tavily) fetch on their own and are run in a worker thread, browser
+        scrapes on the threads of the driver pool.
+
+        Requests go through the per-host limiter: at most `SCRAPER_MAX_CONNECTIONS_PER_HOST`
+        requests in flight and `SCRAPER_HOST_REQUESTS_PER_SECOND` started per host, and hosts that
+        keep failing are skipped for `SCRAPER_HOST_COOLDOWN` seconds. Page cache lookups and writes
+        run in worker threads too.
         """
         try:
+            cached_page = None
+            if self.page_cache:
+                cached_page = await asyncio.to_thread(self.page_cache.get, link, allow_stale=True)
+            if cached_page and not cached_page["stale"]:
+                return self._page_result(link, cached_page)
+
             Scraper = self.get_scraper(link)
-            scraper = Scraper(link, session)
-            content, image_urls, title = scraper.scrape()
+            response = None
+            if fetcher is not None and hasattr(Scraper, "extract"):
+                headers = {"User-Agent": self.user_agent}
+                if cached_page:
+                    headers.update(PageCache.conditional_headers(cached_page))
+                # Downloads nobody can extract, or that are too large for their extractor, are
+                # aborted as soon as their type is known
+                timeout = self._timeout(link, Scraper.timeout)
+                async with self._host_slot(link) as slot:
+                    response = await fetcher.get(
+                        link, headers=headers, timeout=timeout,
+                        accept=lambda mime_type: self.get_extractor(mime_type) is not None,
+                        max_bytes=lambda mime_type: getattr(self.get_extractor(mime_type), "max_bytes", None),
+                    )
+                    slot.record_status(response.status)
+                    slot.record_first_byte(response.first_byte_time)
+                if cached_page and response.status == 304:
+                    await asyncio.to_thread(self.page_cache.mark_revalidated, link)
+                    return self._page_result(link, cached_page)
+                if not response.ok:
+                    return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
+                extractor_class = self.get_extractor(response.content_type)
+                if self.parse_pool is not None and response.content_type in HTML_TYPES:
+                    content, image_urls, title = await self.parse_pool.extract(extractor_class, link, response)
+                else:
+                    extractor = extractor_class(link, session)
+                    content, image_urls, title = await asyncio.to_thread(extractor.extract, response)
+            else:
+                scraper = Scraper(link, session)
+                # Scrapers that block on a shared resource (the browser driver pool) bring their own threads
+                get_executor = getattr(Scraper, "get_executor", None)
+                async with self._host_slot(link):
+                    if get_executor is not None:
+                        loop = asyncio.get_running_loop()
+                        content, image_urls, title = await loop.run_in_executor(get_executor(), scraper.scrape)
+                    else:
+                        content, image_urls, title = await asyncio.to_thread(scraper.scrape)
 
             if len(content) < 100:
                 return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
-            
+
+            if self.page_cache:
+                headers = response.headers if response is not None else {}
+                await asyncio.to_thread(
+                    self.page_cache.set, link, content, title, image_urls,
+                    etag=headers.get("ETag"), last_modified=headers.get("Last-Modified"),
+                )
+
             return {"url": link, "raw_content": content, "image_urls": image_urls, "title": title}
         except Exception as e:
             return {"url": link, "raw_content": None, "image_urls": [], "title": ""}
 
+    def _host_slot(self, link):
+        """
+        Slot of the link's host in the per-host limiter, which run() sets up for the event loop.
+        """
+        if self.host_limiter is None:
+            self.host_limiter = HostLimiter.from_config(self.cfg)
+        return self.host_limiter.acquire(link)
+
+    def _timeout(self, link, default):
+        """
+        The connect and read timeout of a request: the scraper class' timeout or, unless
+        `SCRAPER_ADAPTIVE_TIMEOUT` is disabled, one following the host's observed latency.
+        """
+        if not getattr(self.cfg, "scraper_adaptive_timeout", True) or self.host_limiter is None:
+            return default
+        first_byte_timeout = self.host_limiter.first_byte_timeout(link, default)
+        return default if first_byte_timeout is None else first_byte_timeout
+
+    def host_stats(self):
+        """
+        Returns per-host request, failure and latency statistics of the scrapes on this event loop.
+        """
+        return self.host_limiter.stats() if self.host_limiter else {}
+
+    @staticmethod
+    def _page_result(link, page):
+        return {
+            "url": link,
+            "raw_content": page["raw_content"],
+            "image_urls": page["image_urls"],
+            "title": page["title"],
+        }
+
     def get_scraper(self, link):
         """
         The function `get_scraper` determines the appropriate scraper class based on the provided link
@@ -99,18 +269,10 @@ class Scraper:
           The `get_scraper` method returns the scraper class based on the provided link. The method
         checks the link to determine the appropriate scraper class to use based on predefined mappings
         in the `SCRAPER_CLASSES` dictionary. If the link ends with ".pdf", it selects the
-        `PyMuPDFScraper` class. If the link contains "arxiv.org", it selects the `ArxivScraper
+        `PyMuPDFScraper` class. If the link contains "arxiv.org", it selects the `ArxivScraper`.
+        When the selected class is an extractor, the final extractor is chosen from the content type
+        of the downloaded response (see `get_extractor`).
         """
-
-        SCRAPER_CLASSES = {
-            "pdf": PyMuPDFScraper,
-            "arxiv": ArxivScraper,
-            "bs": BeautifulSoupScraper,
-            "web_base_loader": WebBaseLoaderScraper,
-            "browser": BrowserScraper,
-            "tavily_extract": TavilyExtract
-        }
-
         scraper_key = None
 
         if link.endswith(".pdf"):
@@ -120,8 +282,26 @@ class Scraper:
         else:
             scraper_key = self.scraper
 
-        scraper_class = SCRAPER_CLASSES.get(scraper_key)
+        scraper_class = self.SCRAPER_CLASSES.get(scraper_key)
         if scraper_class is None:
             raise Exception("Scraper not found.")
 
         return scraper_class
+
+    @classmethod
+    def register_extractor(cls, mime_type: str, extractor_class) -> None:
+        """
+        Registers the extractor class used for responses of the given MIME type. The class must
+        accept `(link, session)` and implement `extract(response) -> (content, image_urls, title)`.
+        """
+        cls.EXTRACTOR_CLASSES[mime_type.lower()] = extractor_class
+
+    def get_extractor(self, mime_type: str):
+        """
+        Returns the extractor class for a detected MIME type, or None if the content is unusable.
+        HTML is handled by the configured scraper when it is an extractor, LxmlScraper otherwise.
+        """
+        if mime_type in HTML_TYPES:
+            html_extractor = self.SCRAPER_CLASSES.get(self.scraper)
+            return html_extractor if hasattr(html_extractor, "extract") else LxmlScraper
+        return self.EXTRACTOR_CLASSES.get(mime_type)
@@ -13,43 +13,54 @@ def get_relevant_images(soup: BeautifulSoup, url: str) -> list:
         
         for img in all_images:
             img_src = urljoin(url, img['src'])
-            if img_src.startswith(('http://', 'https://')):
-                score = 0
-                # Check for relevant classes
-                if any(cls in img.get('class', []) for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
-                    score = 4  # Higher score
-                # Check for size attributes
-                elif img.get('width') and img.get('height'):
-                    width = parse_dimension(img['width'])
-                    height = parse_dimension(img['height'])
-                    if width and height:
-                        if width >= 2000 and height >= 1000:
-                            score = 3  # Medium score (very large images)
-                        elif width >= 1600 or height >= 800:
-                            score = 2  # Lower score
-                        elif width >= 800 or height >= 500:
-                            score = 1  # Lowest score
-                        elif width >= 500 or height >= 300:
-                            score = 0  # Lowest score
-                        else:
-                            continue  # Skip small images
-                
+            score = score_image(img_src, img.get('class', []), img.get('width'), img.get('height'))
+            if score is not None:
                 image_urls.append({'url': img_src, 'score': score})
-        
-        # Sort images by score (highest first)
-        sorted_images = sorted(image_urls, key=lambda x: x['score'], reverse=True)
-        
-        # Select all images with score 3 and 2, then add score 1 images up to a total of 10
-        high_score_images = [img for img in sorted_images if img['score'] in [3, 2]]
-        low_score_images = [img for img in sorted_images if img['score'] == 1]
-        
-        result = high_score_images + low_score_images[:max(0, 10 - len(high_score_images))]
-        return result[:10]  # Ensure we don't return more than 10 images in total
+
+        return select_relevant_images(image_urls)
     
     except Exception as e:
         logging.error(f"Error in get_relevant_images: {e}")
         return []
 
+def score_image(img_src: str, classes: list, width: str = None, height: str = None):
+    """Score an image candidate from its attributes, returns None for images that should be skipped"""
+    if not img_src.startswith(('http://', 'https://')):
+        return None
+
+    score = 0
+    # Check for relevant classes
+    if any(cls in classes for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
+        score = 4  # Higher score
+    # Check for size attributes
+    elif width and height:
+        width = parse_dimension(width)
+        height = parse_dimension(height)
+        if width and height:
+            if width >= 2000 and height >= 1000:
+                score = 3  # Medium score (very large images)
+            elif width >= 1600 or height >= 800:
+                score = 2  # Lower score
+            elif width >= 800 or height >= 500:
+                score = 1  # Lowest score
+            elif width >= 500 or height >= 300:
+                score = 0  # Lowest score
+            else:
+                return None  # Skip small images
+    return score
+
+def select_relevant_images(image_urls: list) -> list:
+    """Select the most relevant of the scored image candidates"""
+    # Sort images by score (highest first)
+    sorted_images = sorted(image_urls, key=lambda x: x['score'], reverse=True)
+
+    # Select all images with score 3 and 2, then add score 1 images up to a total of 10
+    high_score_images = [img for img in sorted_images if img['score'] in [3, 2]]
+    low_score_images = [img for img in sorted_images if img['score'] == 1]
+
+    result = high_score_images + low_score_images[:max(0, 10 - len(high_score_images))]
+    return result[:10]  # Ensure we don't return more than 10 images in total
+
 def parse_dimension(value: str) -> int:
     """Parse dimension value, handling px units"""
     if value.lower().endswith('px'):
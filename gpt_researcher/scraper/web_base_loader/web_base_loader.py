@@ -4,6 +4,7 @@ import requests
 from ..utils import get_relevant_images, extract_title
 
 class WebBaseLoaderScraper:
+    timeout = 10
 
     def __init__(self, link, session=None):
         self.link = link
@@ -11,33 +12,33 @@ class WebBaseLoaderScraper:
 
     def scrape(self) -> tuple:
         """
-        This Python function scrapes content from a webpage using a WebBaseLoader object and returns the
-        concatenated page content.
-        
+        This Python function scrapes content from a webpage the same way langchain's `WebBaseLoader`
+        does and returns the page text together with the relevant images and title.
+
         Returns:
           The `scrape` method is returning a string variable named `content` which contains the
-        concatenated page content from the documents loaded by the `WebBaseLoader`. If an exception
-        occurs during the process, an error message is printed and an empty string is returned.
+        text of the page as extracted by `extract`. If an exception occurs during the process, an
+        error message is printed and an empty string is returned.
         """
         try:
-            from langchain_community.document_loaders import WebBaseLoader
-            loader = WebBaseLoader(self.link)
-            loader.requests_kwargs = {"verify": False}
-            docs = loader.load()
-            content = ""
-
-            for doc in docs:
-                content += doc.page_content
-
-            response = self.session.get(self.link)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            image_urls = get_relevant_images(soup, self.link)
-            
-            # Extract the title using the utility function
-            title = extract_title(soup)
-
-            return content, image_urls, title
+            response = self.session.get(self.link, verify=False, timeout=self.timeout)
+            return self.extract(response)
 
         except Exception as e:
             print("Error! : " + str(e))
             return "", [], ""
+
+    def extract(self, response) -> tuple:
+        """
+        Extracts the page text like `WebBaseLoader` (html.parser + `get_text`), along with the
+        relevant images and title, from a single already downloaded response. The page is parsed
+        once and never downloaded again for images or title.
+        """
+        soup = BeautifulSoup(response.content, 'html.parser', from_encoding=response.encoding)
+        content = soup.get_text()
+        image_urls = get_relevant_images(soup, self.link)
+
+        # Extract the title using the utility function
+        title = extract_title(soup)
+
+        return content, image_urls, title
@@ -1,7 +1,9 @@
+import asyncio
 from typing import List, Dict
 
 from ..actions.utils import stream_output
 from ..actions.web_scraping import scrape_urls
+from ..scraper import Scraper
 from ..scraper.utils import get_image_hash  # Add this import
 
 
@@ -10,6 +12,39 @@ class BrowserManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
+        # url -> background scrape started by `prefetch`
+        self.prefetched: Dict[str, asyncio.Task] = {}
+
+    def prefetch(self, urls: List[str]) -> None:
+        """
+        Starts scraping the URLs in the background. `browse_urls` picks up their pages later
+        instead of scraping them again, e.g. to overlap scraping with sub-query generation.
+
+        Args:
+            urls (List[str]): List of URLs to scrape.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url and url not in self.prefetched]
+        if not urls:
+            return
+        cfg = self.researcher.cfg
+        scraper = Scraper(urls, cfg.user_agent, cfg.scraper, cfg)
+        self.prefetched.update(zip(urls, scraper.start()))
+
+    def discard_prefetched(self) -> None:
+        """
+        Cancels the background scrapes of prefetched URLs that were never browsed.
+        """
+        for task in self.prefetched.values():
+            task.cancel()
+        self.prefetched.clear()
+
+    async def _collect_prefetched(self, urls: List[str]) -> List[Dict]:
+        tasks = [self.prefetched.pop(url) for url in urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [
+            result for result in results
+            if isinstance(result, dict) and result.get("raw_content") is not None
+        ]
 
     async def browse_urls(self, urls: List[str]) -> List[Dict]:
         """
@@ -29,7 +64,15 @@ class BrowserManager:
                 self.researcher.websocket,
             )
 
-        scraped_content, images = scrape_urls(urls, self.researcher.cfg)
+        # Pages prefetched in the background are collected while the other URLs are scraped
+        prefetched_urls = [url for url in urls if url in self.prefetched]
+        urls = [url for url in urls if url not in self.prefetched]
+        prefetched_content, (scraped_content, images) = await asyncio.gather(
+            self._collect_prefetched(prefetched_urls),
+            scrape_urls(urls, self.researcher.cfg),
+        )
+        scraped_content = prefetched_content + scraped_content
+        images = [image for content in prefetched_content for image in content.get("image_urls", [])] + images
         self.researcher.add_research_sources(scraped_content)
         new_images = self.select_top_images(images, k=4)  # Select top 2 images
         self.researcher.add_research_images(new_images)
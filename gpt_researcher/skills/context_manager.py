@@ -1,7 +1,12 @@
 import asyncio
 from typing import List, Dict, Optional, Set
 
-from ..context.compression import ContextCompressor, WrittenContentCompressor, VectorstoreCompressor
+from ..context.compression import (
+    ContextCompressor,
+    WrittenContentCompressor,
+    VectorstoreCompressor,
+    format_chunks,
+)
 from ..actions.utils import stream_output
 
 
@@ -21,12 +26,68 @@ class ContextManager:
             )
 
         context_compressor = ContextCompressor(
-            documents=pages, embeddings=self.researcher.memory.get_embeddings()
+            documents=pages,
+            embeddings=self.researcher.memory.get_embeddings(),
+            similarity_threshold=self.researcher.cfg.similarity_threshold,
+            fallback_results=self.researcher.cfg.similarity_fallback_results,
+            prefilter_chunks=self.researcher.cfg.context_prefilter_chunks,
         )
         return await context_compressor.async_get_context(
             query=query, max_results=10, cost_callback=self.researcher.add_costs
         )
+
+    async def get_similar_content_by_queries(self, queries: List[str], pages) -> List[str]:
+        """Selects the relevant content of the same pages for several queries at once."""
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "fetching_query_content",
+                f"📚 Getting relevant content based on queries: {queries}...",
+                self.researcher.websocket,
+            )
+
+        context_compressor = ContextCompressor(
+            documents=pages,
+            embeddings=self.researcher.memory.get_embeddings(),
+            similarity_threshold=self.researcher.cfg.similarity_threshold,
+            fallback_results=self.researcher.cfg.similarity_fallback_results,
+            prefilter_chunks=self.researcher.cfg.context_prefilter_chunks,
+        )
+        return await context_compressor.async_get_contexts(
+            queries=queries, max_results=10, cost_callback=self.researcher.add_costs
+        )
         
+    async def get_similar_content_by_queries_from_index(self, queries: List[str], document_index) -> List[str]:
+        """Selects the relevant content of the indexed local documents for several queries at once."""
+        embeddings = self.researcher.memory.get_embeddings()
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "indexing_local_documents",
+                f"🗃️ Indexing new and changed documents in {document_index.doc_path}...",
+                self.researcher.websocket,
+            )
+        await asyncio.to_thread(
+            document_index.update, embeddings, self.researcher.memory.model_id, self.researcher.add_costs
+        )
+
+        if self.researcher.verbose:
+            await stream_output(
+                "logs",
+                "fetching_query_content",
+                f"📚 Getting relevant content based on queries: {queries}...",
+                self.researcher.websocket,
+            )
+        query_vectors = await asyncio.gather(*[embeddings.aembed_query(query) for query in queries])
+        results = await asyncio.to_thread(
+            document_index.search,
+            query_vectors,
+            max_results=10,
+            similarity_threshold=self.researcher.cfg.similarity_threshold,
+            fallback_results=self.researcher.cfg.similarity_fallback_results,
+        )
+        return [format_chunks(chunks) for chunks in results]
+
     async def get_similar_content_by_query_with_vectorstore(self, query, filter): 
         if self.researcher.verbose:
             await stream_output(
@@ -1,15 +1,24 @@
 import asyncio
-import random
 import json
 from typing import Dict, Optional
 import logging
 
 from ..actions.utils import stream_output
-from ..actions.query_processing import plan_research_outline, get_search_results
-from ..document import DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader
+from ..actions.query_processing import plan_research_outline
+from ..actions.ranking import fuse_search_results
+from ..actions.retriever import get_retriever
+from ..context.compression import charge_embedding_cost, similarity_matrix
+from ..document import DocumentIndex, DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader
+from ..retrievers.cache import SearchCache
+from ..retrievers.quota import QuotaManager
+from ..retrievers.utils import search_async
+from ..scraper.cache import PaperCache
 from ..utils.enum import ReportSource, ReportType, Tone
 from ..utils.logging_config import get_json_handler, get_research_logger
 
+# Search results with at least this much page text skip scraping
+MIN_RAW_CONTENT_LENGTH = 500
+
 
 class ResearchConductor:
     """Manages and coordinates the research process."""
@@ -18,8 +27,17 @@ class ResearchConductor:
         self.researcher = researcher
         self.logger = logging.getLogger('research')
         self.json_handler = get_json_handler()
+        self.search_cache = SearchCache.from_config(researcher.cfg)
+        self.quota_manager = QuotaManager.from_config(researcher.cfg)
+        self.paper_cache = PaperCache.from_config(researcher.cfg)
+        # (retriever class, query) -> (max_results, results) of the searches of the current research
+        self._search_results = {}
 
-    async def plan_research(self, query):
+    async def plan_research(self, query, prefetch: bool = False):
+        """
+        Searches the query and plans the sub-queries of the research. With `prefetch`, set when the
+        sub-queries will scrape web search results, the top results are scraped meanwhile.
+        """
         self.logger.info(f"Planning research for query: {query}")
         
         await stream_output(
@@ -29,9 +47,20 @@ class ResearchConductor:
             self.researcher.websocket,
         )
 
-        search_results = await get_search_results(query, self.researcher.retrievers[0])
+        search_results = await self._search_with_retriever(self.researcher.retrievers[0], query)
         self.logger.info(f"Initial search results obtained: {len(search_results)} results")
 
+        # Scrape the top results while the sub-queries are generated, they are likely to be used
+        prefetch_urls = self.researcher.cfg.prefetch_planning_urls
+        if prefetch and prefetch_urls and prefetch_urls > 0:
+            urls = [
+                result.get("href") or result.get("url") for result in search_results
+                if not self._has_page_text(result)
+            ]
+            urls = [url for url in urls if url not in self.researcher.visited_urls][:prefetch_urls]
+            self.logger.info(f"Prefetching {len(urls)} planning search results")
+            self.researcher.scraper_manager.prefetch(urls)
+
         await stream_output(
             "logs",
             "planning_research",
@@ -60,6 +89,7 @@ class ResearchConductor:
         
         # Reset visited_urls and source_urls at the start of each research task
         self.researcher.visited_urls.clear()
+        self._search_results.clear()
         research_data = []
 
         if self.researcher.verbose:
@@ -96,22 +126,34 @@ class ResearchConductor:
         # ... rest of the conditions ...
         elif self.researcher.report_source == ReportSource.Local.value:
             self.logger.info("Using local search")
-            document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
-            self.logger.info(f"Loaded {len(document_data)} documents")
-            if self.researcher.vector_store:
-                self.researcher.vector_store.load(document_data)
+            document_index = self._get_document_index()
+            if document_index:
+                research_data = await self._get_context_by_web_search(
+                    self.researcher.query, document_index=document_index
+                )
+            else:
+                document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+                self.logger.info(f"Loaded {len(document_data)} documents")
+                if self.researcher.vector_store:
+                    self.researcher.vector_store.load(document_data)
 
-            research_data = await self._get_context_by_web_search(self.researcher.query, document_data)
+                research_data = await self._get_context_by_web_search(self.researcher.query, document_data)
 
         # Hybrid search including both local documents and web sources
         elif self.researcher.report_source == ReportSource.Hybrid.value:
-            if self.researcher.document_urls:
-                document_data = await OnlineDocumentLoader(self.researcher.document_urls).load()
+            document_index = None if self.researcher.document_urls else self._get_document_index()
+            if document_index:
+                docs_context = await self._get_context_by_web_search(
+                    self.researcher.query, document_index=document_index
+                )
             else:
-                document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
-            if self.researcher.vector_store:
-                self.researcher.vector_store.load(document_data)
-            docs_context = await self._get_context_by_web_search(self.researcher.query, document_data)
+                if self.researcher.document_urls:
+                    document_data = await OnlineDocumentLoader(self.researcher.document_urls).load()
+                else:
+                    document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+                if self.researcher.vector_store:
+                    self.researcher.vector_store.load(document_data)
+                docs_context = await self._get_context_by_web_search(self.researcher.query, document_data)
             web_context = await self._get_context_by_web_search(self.researcher.query)
             research_data = f"Context from local documents: {docs_context}\n\nContext from web sources: {web_context}"
 
@@ -145,7 +187,13 @@ class ResearchConductor:
                 self.json_handler.update_content("costs", self.researcher.get_costs())
                 self.json_handler.update_content("context", self.researcher.context)
 
+        self.researcher.scraper_manager.discard_prefetched()
         self.logger.info(f"Research completed. Context size: {len(str(self.researcher.context))}")
+        if self.search_cache:
+            self.logger.info(f"Search cache: {self.search_cache.stats()}")
+        self.logger.info(f"Search API usage: {self.quota_manager.stats()}")
+        if self.researcher.memory.embedding_cache:
+            self.logger.info(f"Embedding cache: {self.researcher.memory.embedding_cache.stats()}")
         return self.researcher.context
 
     async def _get_context_by_urls(self, urls):
@@ -202,7 +250,14 @@ class ResearchConductor:
         )
         return context
 
-    async def _get_context_by_web_search(self, query, scraped_data: list = []):
+    def _get_document_index(self) -> Optional[DocumentIndex]:
+        """Returns the persistent index of the local documents, unless they go to a vector store."""
+        if self.researcher.vector_store:
+            return None
+        return DocumentIndex.from_config(self.researcher.cfg)
+
+    async def _get_context_by_web_search(self, query, scraped_data: list = [],
+                                         document_index: Optional[DocumentIndex] = None):
         """
         Generates the context for the research task by searching the query and scraping the results
         Returns:
@@ -210,8 +265,9 @@ class ResearchConductor:
         """
         self.logger.info(f"Starting web search for query: {query}")
         
-        # Generate Sub-Queries including original query
-        sub_queries = await self.plan_research(query)
+        # Generate Sub-Queries including original query. Only sub-queries without documents scrape
+        # the web, so only then are the planning results worth prefetching
+        sub_queries = await self.plan_research(query, prefetch=not scraped_data and document_index is None)
         self.logger.info(f"Generated sub-queries: {sub_queries}")
         
         # If this is not part of a sub researcher, add original query to research for better results
@@ -230,10 +286,11 @@ class ResearchConductor:
 
         # Using asyncio.gather to process the sub_queries asynchronously
         try:
+            contents = await self._get_similar_content_by_queries(sub_queries, scraped_data, document_index)
             context = await asyncio.gather(
                 *[
-                    self._process_sub_query(sub_query, scraped_data)
-                    for sub_query in sub_queries
+                    self._process_sub_query(sub_query, scraped_data, content, document_index)
+                    for sub_query, content in zip(sub_queries, contents)
                 ]
             )
             self.logger.info(f"Gathered context from {len(context)} sub-queries")
@@ -248,8 +305,34 @@ class ResearchConductor:
             self.logger.error(f"Error during web search: {e}", exc_info=True)
             return []
 
-    async def _process_sub_query(self, sub_query: str, scraped_data: list = []):
-        """Takes in a sub query and scrapes urls based on it and gathers context."""
+    async def _get_similar_content_by_queries(self, sub_queries, scraped_data: list,
+                                              document_index: Optional[DocumentIndex]) -> list:
+        """
+        Selects the context of all sub-queries over the same documents together, embedding each
+        chunk once. Returns None for every sub-query whose context must be selected on its own:
+        all of them for web research, and all of them when the batch fails, so one error doesn't
+        lose the context of every sub-query.
+        """
+        contents = [None] * len(sub_queries)
+        try:
+            if document_index is not None:
+                contents = await self.researcher.context_manager.get_similar_content_by_queries_from_index(
+                    sub_queries, document_index
+                )
+            elif scraped_data:
+                contents = await self.researcher.context_manager.get_similar_content_by_queries(
+                    sub_queries, scraped_data
+                )
+        except Exception as e:
+            self.logger.warning(f"Selecting the context of all sub-queries at once failed, selecting per sub-query: {e}")
+            contents = [None] * len(sub_queries)
+        return contents
+
+    async def _process_sub_query(self, sub_query: str, scraped_data: list = [], content: Optional[str] = None,
+                                 document_index: Optional[DocumentIndex] = None):
+        """Takes in a sub query and scrapes urls based on it and gathers context.
+        The context can be given when it was already selected for all sub-queries together.
+        With a document index, the context is retrieved from it instead of scraping."""
         if self.json_handler:
             self.json_handler.log_event("sub_query", {
                 "query": sub_query,
@@ -265,11 +348,17 @@ class ResearchConductor:
             )
 
         try:
-            if not scraped_data:
+            if document_index is not None:
+                if content is None:
+                    content = (await self.researcher.context_manager.get_similar_content_by_queries_from_index(
+                        [sub_query], document_index
+                    ))[0]
+            elif not scraped_data:
                 scraped_data = await self._scrape_data_by_urls(sub_query)
                 self.logger.info(f"Scraped data size: {len(scraped_data)}")
 
-            content = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
+            if content is None:
+                content = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
             self.logger.info(f"Content found for sub-query: {len(str(content)) if content else 0} chars")
 
             if content and self.researcher.verbose:
@@ -349,32 +438,172 @@ class ResearchConductor:
 
         return new_urls
 
-    async def _search_relevant_source_urls(self, query):
-        new_search_urls = []
+    async def _search_with_retriever(self, retriever_class, query, max_results=None):
+        """
+        Searches the query with a single retriever, giving up after `RETRIEVER_TIMEOUT` seconds.
+        A failing or slow retriever yields no results instead of failing the sub-query.
+
+        Results are memoized for the research, so a query that was already searched for at least
+        `max_results` results (e.g. the original query searched for planning, which comes back as
+        a sub-query) is answered from memory. A search without `max_results` returns the
+        retriever's default count, which may be fewer, so it is only reused for as many results
+        as it returned, or for another search without `max_results`.
+        """
+        memoized = self._search_results.get((retriever_class, query))
+        if memoized is not None:
+            memoized_max_results, results = memoized
+            if max_results is None:
+                if memoized_max_results is None:
+                    return results
+            elif len(results) >= max_results or (
+                memoized_max_results is not None and memoized_max_results >= max_results
+            ):
+                return results[:max_results]
 
-        # Iterate through all retrievers
-        for retriever_class in self.researcher.retrievers:
+        try:
             # Instantiate the retriever with the sub-query
             retriever = retriever_class(query)
+            if self.researcher.cfg.retriever_raw_content and hasattr(retriever, "include_raw_content"):
+                retriever.include_raw_content = True
+            results = await asyncio.wait_for(
+                search_async(retriever, max_results=max_results, cache=self.search_cache),
+                timeout=self.researcher.cfg.retriever_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"{retriever_class.__name__} timed out after {self.researcher.cfg.retriever_timeout}s for query: {query}"
+            )
+            return []
+        except Exception as e:
+            self.logger.error(f"{retriever_class.__name__} failed for query {query}: {e}")
+            return []
 
-            # Perform the search using the current retriever
-            search_results = await asyncio.to_thread(
-                retriever.search, max_results=self.researcher.cfg.max_search_results_per_query
+        if results:
+            self._search_results[(retriever_class, query)] = (max_results, results)
+        return results
+
+    def _retriever_weights(self):
+        """
+        Returns the `RETRIEVER_WEIGHTS` weight of each configured retriever, 1.0 when not set.
+        """
+        weights_by_class = {
+            get_retriever(name): weight
+            for name, weight in (self.researcher.cfg.retriever_weights or {}).items()
+        }
+        return [weights_by_class.get(retriever_class, 1.0) for retriever_class in self.researcher.retrievers]
+
+    async def _search_relevant_sources(self, query):
+        """
+        Searches the query with all retrievers and returns the best ranked results with new URLs,
+        each with its URL in `href`.
+        """
+        # Search with all retrievers concurrently
+        results_per_retriever = await asyncio.gather(
+            *[
+                self._search_with_retriever(retriever_class, query, self.researcher.cfg.max_search_results_per_query)
+                for retriever_class in self.researcher.retrievers
+            ]
+        )
+
+        # Rank the results of all retrievers together and only keep the best new URLs
+        ranked_results = fuse_search_results(query, results_per_retriever, weights=self._retriever_weights())
+        search_results = {}
+        for result in ranked_results:
+            url = result.get("href") or result.get("url")
+            if url not in self.researcher.visited_urls and url not in search_results:
+                search_results[url] = {**result, "href": url}
+
+        max_urls = self.researcher.cfg.max_scrape_urls_per_query
+        new_urls = list(search_results)
+        if max_urls and max_urls > 0:
+            new_urls = new_urls[:max_urls]
+
+        return [search_results[url] for url in await self._get_new_urls(new_urls)]
+
+    async def _rank_papers(self, query, papers, full_text_papers):
+        """
+        Orders papers by the embedding similarity of their title and abstract to the query, keeping
+        the search ranking if the abstracts can't be embedded. Nothing is embedded when every paper,
+        or none, is read in full, since the order can't change which ones are.
+        """
+        if not 0 < full_text_papers < len(papers):
+            return papers
+        texts = [f"{paper.get('title') or ''}\n{paper.get('body') or ''}" for paper in papers]
+        try:
+            embeddings = self.researcher.memory.get_embeddings()
+            query_vector, paper_vectors = await asyncio.gather(
+                embeddings.aembed_query(query), embeddings.aembed_documents(texts)
             )
+            charge_embedding_cost(embeddings, texts + [query], self.researcher.add_costs)
+        except Exception as e:
+            self.logger.warning(f"Failed to embed paper abstracts, keeping the search ranking: {e}")
+            return papers
 
-            # Collect new URLs from search results
-            search_urls = [url.get("href") for url in search_results]
-            new_search_urls.extend(search_urls)
+        scores = similarity_matrix([query_vector], paper_vectors)[0]
+        return [papers[i] for i in (-scores).argsort(kind="stable")]
 
-        # Get unique URLs
-        new_search_urls = await self._get_new_urls(new_search_urls)
-        random.shuffle(new_search_urls)
+    @staticmethod
+    def _has_page_text(result) -> bool:
+        """
+        Whether a search result carries the text of its page, so it needn't be scraped: at least
+        `MIN_RAW_CONTENT_LENGTH` characters of it, or any amount when the retriever marks it as
+        the whole document (`raw_content_complete`, e.g. local files that can't be scraped).
+        """
+        raw_content = result.get("raw_content") or ""
+        return len(raw_content) >= MIN_RAW_CONTENT_LENGTH or bool(raw_content and result.get("raw_content_complete"))
+
+    @staticmethod
+    def _search_result_content(result, raw_content):
+        return {
+            "url": result["href"],
+            "raw_content": raw_content,
+            "image_urls": [],
+            "title": result.get("title", ""),
+        }
+
+    async def _get_paper_content(self, query, search_results):
+        """
+        Academic fast path (`ACADEMIC_ABSTRACTS_FIRST`): search results that are papers (those with a
+        `paper_id`) are ranked by how similar their abstracts are to the query, and only the top
+        `ACADEMIC_FULL_TEXT_PAPERS` are read in full, from the paper cache when possible (looked up
+        in a worker thread). The other papers contribute their abstracts.
+
+        Returns:
+            tuple: The paper contents ready for use, the papers whose full text has to be scraped
+            by URL, and the search results that are not papers
+        """
+        papers = [result for result in search_results if result.get("paper_id")]
+        if not papers:
+            return [], {}, search_results
+        other_results = [result for result in search_results if not result.get("paper_id")]
+
+        paper_content = []
+        papers_to_scrape = {}
+        full_text_papers = max(0, self.researcher.cfg.academic_full_text_papers)
+        for position, paper in enumerate(await self._rank_papers(query, papers, full_text_papers)):
+            cached_paper = None
+            if position < full_text_papers and self.paper_cache:
+                cached_paper = await asyncio.to_thread(self.paper_cache.get, paper["paper_id"])
+
+            if position >= full_text_papers:
+                abstract = f"{paper.get('title') or ''}\n\n{paper.get('body') or ''}".strip()
+                paper_content.append(self._search_result_content(paper, abstract))
+            elif len(paper.get("raw_content") or "") >= MIN_RAW_CONTENT_LENGTH:
+                paper_content.append(self._search_result_content(paper, paper["raw_content"]))
+            elif cached_paper:
+                paper_content.append({"url": paper["href"], **cached_paper})
+            else:
+                papers_to_scrape[paper["href"]] = paper
 
-        return new_search_urls
+        self.logger.info(
+            f"Academic fast path: {len(papers)} papers, {len(papers_to_scrape)} full texts to download"
+        )
+        return paper_content, papers_to_scrape, other_results
 
     async def _scrape_data_by_urls(self, sub_query):
         """
         Runs a sub-query across multiple retrievers and scrapes the resulting URLs.
+        Results that already carry the page text are used as is instead of being scraped.
 
         Args:
             sub_query (str): The sub-query to search for.
@@ -382,7 +611,25 @@ class ResearchConductor:
         Returns:
             list: A list of scraped content results.
         """
-        new_search_urls = await self._search_relevant_source_urls(sub_query)
+        search_results = await self._search_relevant_sources(sub_query)
+
+        papers_to_scrape = {}
+        if self.researcher.cfg.academic_abstracts_first:
+            search_content, papers_to_scrape, search_results = await self._get_paper_content(sub_query, search_results)
+        else:
+            search_content = []
+
+        search_content += [
+            self._search_result_content(result, result["raw_content"])
+            for result in search_results
+            if self._has_page_text(result)
+        ]
+        if search_content:
+            self.logger.info(f"Using the content of {len(search_content)} search results without scraping")
+            self.researcher.add_research_sources(search_content)
+        content_urls = {content["url"] for content in search_content}
+        new_search_urls = [result["href"] for result in search_results if result["href"] not in content_urls]
+        new_search_urls += list(papers_to_scrape)
 
         # Log the research process if verbose mode is on
         if self.researcher.verbose:
@@ -394,7 +641,28 @@ class ResearchConductor:
             )
 
         # Scrape the new URLs
-        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
+        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls) if new_search_urls else []
+
+        if papers_to_scrape:
+            scraped_urls = set()
+            for content in scraped_content:
+                paper = papers_to_scrape.get(content["url"])
+                if paper and self.paper_cache:
+                    await asyncio.to_thread(
+                        self.paper_cache.set,
+                        paper["paper_id"], content["raw_content"], content["title"], content["image_urls"],
+                    )
+                scraped_urls.add(content["url"])
+            # Papers whose full text couldn't be extracted still contribute their abstracts
+            abstracts = [
+                self._search_result_content(paper, f"{paper.get('title') or ''}\n\n{paper.get('body') or ''}".strip())
+                for url, paper in papers_to_scrape.items() if url not in scraped_urls
+            ]
+            if abstracts:
+                self.researcher.add_research_sources(abstracts)
+                search_content += abstracts
+
+        scraped_content = search_content + scraped_content
 
         if self.researcher.vector_store:
             self.researcher.vector_store.load(scraped_content)
@@ -0,0 +1,278 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+# Access times of hits are written in batches, once this many are pending or the oldest is this old
+ACCESS_FLUSH_BATCH = 64
+ACCESS_FLUSH_INTERVAL = 5.0
+# SQLite limits the number of parameters of a statement
+SQL_BATCH = 900
+
+# An upsert rather than INSERT OR REPLACE, whose implicit delete would skip the size trigger
+_UPSERT = (
+    "INSERT INTO entries (key, value, size, created_at, accessed_at, expires_at) "
+    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+    "size = excluded.size, created_at = excluded.created_at, "
+    "accessed_at = excluded.accessed_at, expires_at = excluded.expires_at"
+)
+
+
+class CacheEntry:
+    """
+    A value read from the DiskCache together with its bookkeeping data.
+    """
+
+    def __init__(self, key: str, value: bytes, created_at: float, expires_at: Optional[float]):
+        self.key = key
+        self.value = value
+        self.created_at = created_at
+        self.expires_at = expires_at
+
+    @property
+    def is_stale(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+
+class DiskCache:
+    """
+    Small SQLite backed key/value store with per entry TTLs and LRU size-based eviction.
+
+    Values are raw bytes; callers are responsible for serialization. The store is safe to share
+    between threads and processes (SQLite WAL mode), and keeps in-memory hit/miss counters.
+
+    The total size of the values is maintained by triggers, so enforcing the size limit doesn't
+    scan the table. Hits don't write: their access times are buffered and written in batches,
+    which only makes the LRU order a few seconds late.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_size_bytes: Optional[int] = None):
+        """
+        Args:
+            path: Location of the SQLite database file
+            ttl: Default time to live in seconds for new entries, None for no expiry
+            max_size_bytes: Evict least recently used entries once the stored values exceed this size
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> access time of the hits not yet written
+        self._accessed: Dict[str, float] = {}
+        self._accessed_since = 0.0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        # Stores created before the running total existed are summed once
+        self._conn.executescript(
+            "BEGIN IMMEDIATE;"
+            "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL);"
+            "INSERT OR IGNORE INTO totals (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM entries;"
+            "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN"
+            " UPDATE totals SET size = size + NEW.size WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN"
+            " UPDATE totals SET size = size + NEW.size - OLD.size WHERE id = 0; END;"
+            "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN"
+            " UPDATE totals SET size = size - OLD.size WHERE id = 0; END;"
+            "COMMIT;"
+        )
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Returns the entry for the key, or None on a miss.
+
+        Expired entries count as misses unless `allow_stale` is set, in which case they are returned
+        with `is_stale` set so the caller can revalidate them.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            entry = CacheEntry(key, row[0], row[1], row[2])
+            if entry.is_stale:
+                if not allow_stale:
+                    self.misses += 1
+                    return None
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+
+            self._record_access(key)
+            return entry
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Stores the value under the key, evicting least recently used entries if over capacity.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute(_UPSERT, (key, value, len(value), now, now, expires_at))
+            self._evict()
+            self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CacheEntry]:
+        """
+        Returns the fresh entries of the keys that are cached, read in batches of one query.
+        """
+        keys = list(dict.fromkeys(keys))
+        entries = {}
+        with self._lock:
+            for start in range(0, len(keys), SQL_BATCH):
+                batch = keys[start:start + SQL_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at, expires_at FROM entries WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, value, created_at, expires_at in rows:
+                    entry = CacheEntry(key, value, created_at, expires_at)
+                    if not entry.is_stale:
+                        entries[key] = entry
+            self.hits += len(entries)
+            self.misses += len(keys) - len(entries)
+            for key in entries:
+                self._record_access(key)
+        return entries
+
+    def set_many(self, values: Dict[str, bytes], ttl: Optional[float] = None) -> None:
+        """
+        Stores the values under their keys in one transaction, evicting once for all of them.
+        """
+        if not values:
+            return
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            for key in values:
+                self._accessed.pop(key, None)
+            self._conn.executemany(
+                _UPSERT,
+                [(key, value, len(value), now, now, expires_at) for key, value in values.items()],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str, ttl: Optional[float] = None) -> None:
+        """
+        Marks an existing entry as fresh again, e.g. after a successful revalidation.
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute(
+                "UPDATE entries SET created_at = ?, accessed_at = ?, expires_at = ? WHERE key = ?",
+                (now, now, expires_at, key),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered access times of recent hits.
+        """
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def _record_access(self, key: str) -> None:
+        now = time.time()
+        if not self._accessed:
+            self._accessed_since = now
+        self._accessed[key] = now
+        if len(self._accessed) >= ACCESS_FLUSH_BATCH or now - self._accessed_since >= ACCESS_FLUSH_INTERVAL:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _total_size(self) -> int:
+        return self._conn.execute("SELECT size FROM totals WHERE id = 0").fetchone()[0]
+
+    def _evict(self) -> None:
+        if self.max_size_bytes is None:
+            return
+        total = self._total_size()
+        if total <= self.max_size_bytes:
+            return
+        # Recent hits must not be evicted as if they were never read
+        self._flush_accessed()
+        while total > self.max_size_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.evictions += 1
+                total -= size
+                if total <= self.max_size_bytes:
+                    break
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns hit/miss counters for this process and the current size of the store.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._total_size()
+        lookups = self.hits + self.misses + self.stale_hits
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
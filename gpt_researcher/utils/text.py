@@ -0,0 +1,76 @@
+import math
+import re
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Frequent English words that carry no information about what a text is about
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these they this those
+through to too under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits a text into lowercase word tokens, dropping stopwords and single characters.
+    """
+    return [
+        token for token in _TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def cosine_similarity(query_tokens: List[str], text_tokens: List[str]) -> float:
+    """
+    Cosine similarity between the term frequency vectors of two token lists.
+    """
+    if not query_tokens or not text_tokens:
+        return 0.0
+    query_counts = Counter(query_tokens)
+    text_counts = Counter(text_tokens)
+    dot = sum(count * text_counts[token] for token, count in query_counts.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in query_counts.values())) * math.sqrt(sum(c * c for c in text_counts.values()))
+    return dot / norm
+
+
+def bm25_matrix(queries: List[str], texts: List[str], k1: float = 1.2, b: float = 0.75) -> np.ndarray:
+    """
+    BM25 scores of every text for every query, as a (queries x texts) matrix. The texts are the
+    corpus the term statistics are computed over.
+    """
+    query_terms = [set(tokenize(query)) for query in queries]
+    vocabulary = {term: i for i, term in enumerate(set().union(*query_terms))}
+    scores = np.zeros((len(queries), len(texts)), dtype=np.float32)
+    if not vocabulary or not texts:
+        return scores
+
+    # Term frequencies of the query terms only
+    frequencies = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    lengths = np.zeros(len(texts), dtype=np.float32)
+    for i, text in enumerate(texts):
+        counts = Counter(tokenize(text))
+        lengths[i] = sum(counts.values())
+        for term, j in vocabulary.items():
+            if term in counts:
+                frequencies[i, j] = counts[term]
+
+    document_frequencies = (frequencies > 0).sum(axis=0)
+    idf = np.log1p((len(texts) - document_frequencies + 0.5) / (document_frequencies + 0.5))
+    norms = k1 * (1 - b + b * lengths / max(float(lengths.mean()), 1.0))
+    weights = idf * frequencies * (k1 + 1) / (frequencies + norms[:, None])
+
+    query_matrix = np.zeros((len(queries), len(vocabulary)), dtype=np.float32)
+    for i, terms in enumerate(query_terms):
+        query_matrix[i, [vocabulary[term] for term in terms]] = 1.0
+    return query_matrix @ weights.T
@@ -1,3 +1,4 @@
 from .vector_store import VectorStoreWrapper
+from .vector_index import VectorIndex
 
-__all__ = ['VectorStoreWrapper']
\ No newline at end of file
+__all__ = ['VectorStoreWrapper', 'VectorIndex']
\ No newline at end of file
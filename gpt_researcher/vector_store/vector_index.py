@@ -0,0 +1,581 @@
+"""
+On-disk approximate nearest neighbour index of embedding vectors
+"""
+import json
+import logging
+import math
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Indexes smaller than this are searched exhaustively; larger ones are clustered into inverted lists
+MIN_TRAINING_VECTORS = 4096
+# The clustering is retrained, and every segment rewritten, once the index outgrows the number of
+# vectors it was trained on by this factor
+RETRAIN_GROWTH = 4
+KMEANS_ITERATIONS = 10
+# Vectors sampled per list to train the clustering
+TRAINING_SAMPLES_PER_LIST = 64
+# Writes add segments; once there are more than this, the smaller half is merged
+MAX_SEGMENTS = 8
+# Rows processed at once when assigning or copying vectors, bounding the memory of a build
+BLOCK_ROWS = 16384
+# Lists searched per query when not given, as a fraction of the lists (but at least MIN_NPROBE)
+NPROBE_RATIO = 1 / 32
+MIN_NPROBE = 16
+# SQLite limits the number of parameters of a statement
+SQL_BATCH = 900
+
+DTYPES = {"int8": np.int8, "float16": np.float16}
+# int8 vectors are scaled so their largest component is stored as INT8_MAX
+INT8_MAX = 127
+
+INDEX_VERSION = 1
+DB_FILE = "index.sqlite"
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """
+    IVF (inverted file) index of unit normalized vectors, each stored under an integer id with
+    JSON metadata.
+
+    Vectors are kept as int8 (scalar quantized with a scale per vector) or float16 arrays in
+    immutable segments, sorted by the cluster they are closest to, and memory mapped at search time: a query is compared to the cluster
+    centroids and only the vectors of the closest clusters are read, so search time and memory
+    stay flat as the index grows. Upserts write new segments and mark replaced and deleted vectors
+    in the old ones; segments are merged as they pile up. The ids, metadata and segment list are
+    kept in SQLite and committed in one transaction, so an interrupted write leaves the previous
+    state intact.
+    """
+
+    def __init__(self, path: str, dtype: str = "int8"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype {dtype}, expected one of {list(DTYPES)}")
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(path, DB_FILE), check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE TABLE IF NOT EXISTS segments (name TEXT PRIMARY KEY, size INTEGER, deleted TEXT);"
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            " id INTEGER PRIMARY KEY, segment TEXT, row INTEGER, metadata TEXT);"
+            "CREATE INDEX IF NOT EXISTS vectors_segment ON vectors (segment, row);"
+        )
+        self._lock = threading.RLock()
+        self.meta = self._read_meta(dtype)
+        self.dtype = self.meta["dtype"]
+        self._segments: Dict[str, _Segment] = {}
+        # (centroids, [(segment, deleted mask)]), swapped in as a whole
+        self._state: Tuple[np.ndarray, List[Tuple[_Segment, Optional[np.ndarray]]]] = (np.zeros((1, 0), np.float32), [])
+        self._remove_orphans()
+        self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self.meta.get("dim")
+
+    def upsert(self, ids: List[int], vectors, metadata: Optional[List[Any]] = None) -> None:
+        """
+        Adds the vectors under the ids, replacing the vectors and metadata already stored under
+        them.
+        """
+        if not len(ids):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError(f"Expected {len(ids)} vectors, got an array of shape {vectors.shape}")
+        metadata = metadata if metadata is not None else [None] * len(ids)
+        # The last vector of a repeated id wins
+        last = {int(vector_id): i for i, vector_id in enumerate(ids)}
+        if len(last) < len(ids):
+            positions = list(last.values())
+            ids, vectors, metadata = list(last), vectors[positions], [metadata[i] for i in positions]
+        ids = np.array([int(vector_id) for vector_id in ids], dtype=np.int64)
+
+        with self._lock:
+            if self.dim is None:
+                self.meta["dim"] = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+            deleted = self._deleted_masks(ids.tolist())
+            name = self._next_segment_name()
+            centroids = self._state[0] if self._state[0].shape[1] else np.zeros((1, self.dim), np.float32)
+            codes, scales = _encode(vectors, self.dtype)
+            order = _write_segment(
+                os.path.join(self.path, name), centroids, ids, [(codes, scales, np.arange(len(ids)))]
+            )
+            # Row of every id in the new segment, which is sorted by list
+            placement = np.empty(len(ids), dtype=np.int64)
+            placement[order] = np.arange(len(ids))
+            self._commit(
+                deleted,
+                new_segments={name: len(ids)},
+                rows=[
+                    (int(vector_id), name, int(row), json.dumps(entry, ensure_ascii=False))
+                    for vector_id, row, entry in zip(ids, placement, metadata)
+                ],
+            )
+            self._maintain()
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Deletes the vectors stored under the ids. Returns the number of vectors deleted.
+        """
+        ids = [int(vector_id) for vector_id in ids]
+        with self._lock:
+            deleted = self._deleted_masks(ids)
+            if not deleted:
+                return 0
+            count = sum(len(rows) for _, rows in deleted.values())
+            self._commit(deleted, removed_ids=ids)
+            self._maintain()
+            return count
+
+    def get(self, ids: Iterable[int]) -> Dict[int, Any]:
+        """
+        Returns the metadata stored under the ids.
+        """
+        metadata = {}
+        with self._lock:
+            for batch in _batches([int(vector_id) for vector_id in ids]):
+                query = f"SELECT id, metadata FROM vectors WHERE id IN ({','.join('?' * len(batch))})"
+                for vector_id, entry in self._db.execute(query, batch):
+                    metadata[vector_id] = json.loads(entry)
+        return metadata
+
+    def search(self, query_vectors, k: int = 10, nprobe: Optional[int] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Returns the (id, cosine similarity) of the (approximately) k nearest vectors of every query,
+        best first.
+        Args:
+            query_vectors: The query vectors, one per row.
+            k: The number of neighbours per query.
+            nprobe: The number of closest lists searched; more is slower and more exact.
+        """
+        centroids, segments = self._state
+        queries = _normalize(np.atleast_2d(np.asarray(query_vectors, dtype=np.float32)))
+        if not segments or k <= 0:
+            return [[] for _ in queries]
+        if queries.shape[1] != centroids.shape[1]:
+            raise ValueError(f"Expected query vectors of dimension {centroids.shape[1]}, got {queries.shape[1]}")
+
+        num_lists = len(centroids)
+        nprobe = min(num_lists, nprobe or max(MIN_NPROBE, math.ceil(num_lists * NPROBE_RATIO)))
+        centroid_scores = queries @ centroids.T
+        if nprobe < num_lists:
+            probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.broadcast_to(np.arange(num_lists), (len(queries), num_lists))
+
+        results = []
+        for query, query_probes in zip(queries, probes):
+            candidate_ids, candidate_scores = [], []
+            for segment, deleted in segments:
+                rows = segment.rows(query_probes)
+                if not len(rows):
+                    continue
+                # Converting int8 is several times faster than float16
+                scores = (segment.vectors[rows].astype(np.float32) @ query) * segment.scales[rows]
+                if deleted is not None:
+                    scores[deleted[rows]] = -np.inf
+                top = _top_k(scores, k)
+                candidate_ids.append(segment.ids[rows[top]])
+                candidate_scores.append(scores[top])
+            if not candidate_ids:
+                results.append([])
+                continue
+            ids, scores = np.concatenate(candidate_ids), np.concatenate(candidate_scores)
+            top = _top_k(scores, k)
+            results.append([(int(ids[i]), float(scores[i])) for i in top if scores[i] > -np.inf])
+        return results
+
+    def clear(self) -> None:
+        """
+        Deletes every vector, e.g. before indexing vectors of another embedding model.
+        """
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM vectors")
+                self._db.execute("DELETE FROM segments")
+            self.meta.update({"dim": None, "centroids": None, "trained_on": 0, "segments": {}})
+            self._write_meta()
+            self._load()
+            self._segments.clear()
+            self._remove_orphans()
+
+    def _read_meta(self, dtype: str) -> Dict[str, Any]:
+        stored = {key: json.loads(value) for key, value in self._db.execute("SELECT key, value FROM meta")}
+        if stored and stored.get("version") != INDEX_VERSION:
+            logger.warning(f"Rebuilding vector index {self.path} written by another version")
+            with self._db:
+                for table in ("meta", "segments", "vectors"):
+                    self._db.execute(f"DELETE FROM {table}")
+            stored = {}
+        meta = {"version": INDEX_VERSION, "dtype": dtype, "dim": None, "centroids": None,
+                "trained_on": 0, "next_segment": 1, "next_file": 1, **stored}
+        meta["segments"] = {
+            name: {"size": size, "deleted": deleted}
+            for name, size, deleted in self._db.execute("SELECT name, size, deleted FROM segments")
+        }
+        return meta
+
+    def _write_meta(self) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in self.meta.items() if key != "segments"],
+            )
+
+    def _next_segment_name(self) -> str:
+        name = f"seg-{self.meta['next_segment']:06d}"
+        self.meta["next_segment"] += 1
+        return name
+
+    def _next_file_name(self, prefix: str) -> str:
+        name = f"{prefix}-{self.meta['next_file']:06d}.npy"
+        self.meta["next_file"] += 1
+        return name
+
+    def _remove_orphans(self) -> None:
+        """
+        Removes the files of writes that were interrupted before they were committed.
+        """
+        live = {self.meta.get("centroids")}
+        for name, entry in self.meta["segments"].items():
+            live.update({name, entry["deleted"]})
+        for name in os.listdir(self.path):
+            if name.startswith(("seg-", "centroids-", "deleted-")) and name not in live:
+                path = os.path.join(self.path, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+
+    def _deleted_masks(self, ids: List[int]) -> Dict[str, Tuple[np.ndarray, List[int]]]:
+        """
+        Returns the updated deleted mask of every segment holding some of the ids, and the rows
+        of the ids in it.
+        """
+        rows: Dict[str, List[int]] = {}
+        for batch in _batches(ids):
+            query = f"SELECT segment, row FROM vectors WHERE id IN ({','.join('?' * len(batch))})"
+            for segment, row in self._db.execute(query, batch):
+                rows.setdefault(segment, []).append(row)
+        masks = {}
+        for name, segment_rows in rows.items():
+            mask = self._segments[name].load_deleted(self.meta["segments"][name]["deleted"]).copy()
+            mask[segment_rows] = True
+            masks[name] = (mask, segment_rows)
+        return masks
+
+    def _commit(self, deleted: Dict[str, Tuple[np.ndarray, List[int]]], new_segments: Optional[Dict[str, int]] = None,
+                rows: Optional[Iterable[Tuple]] = None, removed_ids: Optional[List[int]] = None,
+                moved: Optional[Iterable[Tuple]] = None, dropped: Iterable[str] = ()) -> None:
+        """
+        Writes the deleted masks, then commits the segment list, the ids and the metadata in one
+        transaction and swaps in the new state. Segments left without live vectors are dropped.
+        Args:
+            deleted: The updated deleted masks of segments, with the rows newly deleted.
+            new_segments: The size of every segment written.
+            rows: The (id, segment, row, metadata) of vectors added to new segments.
+            removed_ids: The ids of deleted vectors.
+            moved: The (segment, row, id) of vectors rewritten into new segments.
+            dropped: The segments to remove.
+        """
+        segments = dict(self.meta["segments"])
+        for name, size in (new_segments or {}).items():
+            segments[name] = {"size": size, "deleted": None}
+        dropped = set(dropped)
+        replaced_files = []
+        for name, (mask, _) in deleted.items():
+            if name not in segments:
+                continue
+            if mask.all():
+                dropped.add(name)
+                continue
+            file_name = self._next_file_name("deleted")
+            np.save(os.path.join(self.path, file_name), mask)
+            replaced_files.append(segments[name]["deleted"])
+            segments[name] = {**segments[name], "deleted": file_name}
+        for name in dropped:
+            entry = segments.pop(name, None)
+            if entry:
+                replaced_files.append(entry["deleted"])
+
+        with self._db:
+            if removed_ids:
+                for batch in _batches(removed_ids):
+                    self._db.execute(f"DELETE FROM vectors WHERE id IN ({','.join('?' * len(batch))})", batch)
+            if rows:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO vectors (id, segment, row, metadata) VALUES (?, ?, ?, ?)", rows
+                )
+            if moved:
+                self._db.executemany("UPDATE vectors SET segment = ?, row = ? WHERE id = ?", moved)
+            for name in dropped:
+                self._db.execute("DELETE FROM vectors WHERE segment = ?", (name,))
+            self._db.execute("DELETE FROM segments")
+            self._db.executemany(
+                "INSERT INTO segments (name, size, deleted) VALUES (?, ?, ?)",
+                [(name, entry["size"], entry["deleted"]) for name, entry in segments.items()],
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in self.meta.items() if key != "segments"],
+            )
+        self.meta["segments"] = segments
+        self._load()
+        for name in dropped:
+            self._drop_segment(name)
+        for file_name in replaced_files:
+            if file_name:
+                _remove_file(os.path.join(self.path, file_name))
+
+    def _drop_segment(self, name: str) -> None:
+        self._segments.pop(name, None)
+        shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+    def _load(self) -> None:
+        centroids = (
+            np.load(os.path.join(self.path, self.meta["centroids"]))
+            if self.meta.get("centroids")
+            else np.zeros((1, self.dim or 0), dtype=np.float32)
+        )
+        segments = []
+        for name, entry in self.meta["segments"].items():
+            segment = self._segments.get(name)
+            if segment is None:
+                segment = self._segments[name] = _Segment(os.path.join(self.path, name))
+            deleted = segment.load_deleted(entry["deleted"])
+            segments.append((segment, deleted if deleted.any() else None))
+        # Searches racing a write see either the old or the new segments
+        self._state = (centroids, segments)
+
+    def _live_count(self) -> int:
+        return sum(
+            len(segment.ids) - (int(deleted.sum()) if deleted is not None else 0)
+            for segment, deleted in self._state[1]
+        )
+
+    def _maintain(self) -> None:
+        """
+        Retrains the clustering when the index outgrew it, otherwise merges segments that piled up.
+        """
+        count = self._live_count()
+        if count >= MIN_TRAINING_VECTORS and count > RETRAIN_GROWTH * self.meta["trained_on"]:
+            self._retrain(count)
+        elif len(self.meta["segments"]) > MAX_SEGMENTS:
+            segments = sorted(self._state[1], key=lambda item: len(item[0].ids))
+            self._merge(segments[:len(segments) // 2 + 1])
+
+    def _retrain(self, count: int) -> None:
+        """
+        Clusters a sample of the vectors with k-means and rewrites all of them into one segment
+        sorted by the new lists.
+        """
+        num_lists = max(1, int(math.sqrt(count)))
+        sample = self._sample(num_lists * TRAINING_SAMPLES_PER_LIST)
+        centroids = _kmeans(sample, num_lists)
+        centroids_file = self._next_file_name("centroids")
+        np.save(os.path.join(self.path, centroids_file), centroids)
+        previous_centroids = self.meta.get("centroids")
+        self.meta.update({"centroids": centroids_file, "trained_on": count})
+        self._merge(self._state[1], centroids)
+        if previous_centroids:
+            _remove_file(os.path.join(self.path, previous_centroids))
+        logger.info(f"Trained vector index {self.path} with {num_lists} lists on {len(sample)} of {count} vectors")
+
+    def _sample(self, size: int) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        parts = []
+        count = max(1, self._live_count())
+        for segment, deleted in self._state[1]:
+            live = np.flatnonzero(~deleted) if deleted is not None else np.arange(len(segment.ids))
+            take = min(len(live), math.ceil(size * len(live) / count))
+            rows = np.sort(rng.choice(live, size=take, replace=False))
+            parts.append(_decode(segment.vectors[rows], segment.scales[rows]))
+        return np.concatenate(parts)
+
+    def _merge(self, segments: List[Tuple["_Segment", Optional[np.ndarray]]], centroids: Optional[np.ndarray] = None) -> None:
+        """
+        Rewrites the live vectors of the segments into a single segment sorted by list.
+        """
+        if centroids is None:
+            centroids = self._state[0]
+        sources, ids = [], []
+        for segment, deleted in segments:
+            live = np.flatnonzero(~deleted) if deleted is not None else np.arange(len(segment.ids))
+            if len(live):
+                sources.append((segment.vectors, segment.scales, live))
+                ids.append(segment.ids[live])
+        dropped = [os.path.basename(segment.path) for segment, _ in segments]
+        if not sources:
+            self._commit({}, dropped=dropped)
+            return
+        ids = np.concatenate(ids)
+        name = self._next_segment_name()
+        order = _write_segment(os.path.join(self.path, name), centroids, ids, sources)
+        self._commit(
+            {},
+            new_segments={name: len(ids)},
+            # Moved vectors keep their metadata, only their location changes
+            moved=((name, row, int(ids[position])) for row, position in enumerate(order.tolist())),
+            dropped=dropped,
+        )
+
+class _Segment:
+    """Read side of an immutable segment; vectors and ids stay memory mapped."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Plain array views of the mappings; slicing np.memmap itself is several times slower
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r").view(np.ndarray)
+        self.scales = np.load(os.path.join(path, "scales.npy"), mmap_mode="r").view(np.ndarray)
+        self.ids = np.load(os.path.join(path, "ids.npy"), mmap_mode="r").view(np.ndarray)
+        self.offsets = np.load(os.path.join(path, "offsets.npy"))
+
+    def load_deleted(self, file_name: Optional[str]) -> np.ndarray:
+        if file_name:
+            return np.load(os.path.join(os.path.dirname(self.path), file_name), mmap_mode="r").view(np.ndarray)
+        return np.zeros(len(self.ids), dtype=bool)
+
+    def rows(self, lists: np.ndarray) -> np.ndarray:
+        """
+        Returns the rows of the vectors in the lists.
+        """
+        lists = lists[lists < len(self.offsets) - 1]
+        starts, ends = self.offsets[lists], self.offsets[lists + 1]
+        lengths = ends - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+        # Ranges [start, end) of all lists as one array
+        shifts = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return shifts + np.arange(total)
+
+
+def _write_segment(path: str, centroids: np.ndarray, ids: np.ndarray,
+                   sources: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]) -> np.ndarray:
+    """
+    Writes the vectors sorted by their closest centroid. The vectors are given as (encoded
+    vectors, scales, rows) sources, which may be memory mapped, and are read in blocks.
+    Returns the input position of every row of the segment.
+    """
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    lists = np.concatenate([
+        _assign(_decode(vectors[block], scales[block]), centroids)
+        for vectors, scales, rows in sources
+        for start in range(0, len(rows), BLOCK_ROWS)
+        for block in [rows[start:start + BLOCK_ROWS]]
+    ])
+    order = np.argsort(lists, kind="stable")
+    offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(lists, minlength=len(centroids)), out=offsets[1:])
+
+    dim = sources[0][0].shape[1]
+    dtype = sources[0][0].dtype
+    out = np.lib.format.open_memmap(os.path.join(tmp_path, "vectors.npy"), mode="w+", dtype=dtype, shape=(len(ids), dim))
+    out_scales = np.empty(len(ids), dtype=np.float32)
+    source_starts = np.cumsum([0] + [len(rows) for _, _, rows in sources])
+    for start in range(0, len(order), BLOCK_ROWS):
+        positions = order[start:start + BLOCK_ROWS]
+        source_of = np.searchsorted(source_starts, positions, side="right") - 1
+        block = np.empty((len(positions), dim), dtype=dtype)
+        for source in np.unique(source_of):
+            selected = source_of == source
+            vectors, scales, rows = sources[source]
+            source_rows = rows[positions[selected] - source_starts[source]]
+            block[selected] = vectors[source_rows]
+            out_scales[start:start + len(positions)][selected] = scales[source_rows]
+        out[start:start + len(positions)] = block
+    out.flush()
+    del out
+    np.save(os.path.join(tmp_path, "scales.npy"), out_scales)
+    np.save(os.path.join(tmp_path, "ids.npy"), ids[order])
+    np.save(os.path.join(tmp_path, "offsets.npy"), offsets)
+    os.replace(tmp_path, path)
+    return order
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    if len(centroids) == 1:
+        return np.zeros(len(vectors), dtype=np.int64)
+    return np.argmax(vectors @ centroids.T, axis=1)
+
+
+def _kmeans(sample: np.ndarray, num_lists: int) -> np.ndarray:
+    """
+    Spherical k-means: centroids are unit vectors, so the closest centroid has the highest dot product.
+    """
+    rng = np.random.default_rng(0)
+    num_lists = min(num_lists, len(sample))
+    centroids = sample[rng.choice(len(sample), size=num_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        lists = np.concatenate([_assign(sample[start:start + BLOCK_ROWS], centroids)
+                                for start in range(0, len(sample), BLOCK_ROWS)])
+        counts = np.bincount(lists, minlength=num_lists)
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        order = np.argsort(lists, kind="stable")
+        starts = np.cumsum(counts) - counts
+        sums[~empty] = np.add.reduceat(sample[order], starts[~empty])
+        # Empty lists restart from random vectors
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids.astype(np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _encode(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the normalized vectors as stored, and the scale of every vector.
+    """
+    vectors = _normalize(vectors)
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / INT8_MAX
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.round(vectors / scales[:, None]), -INT8_MAX, INT8_MAX).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+
+
+def _decode(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    return np.asarray(codes, dtype=np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _batches(values: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(values), SQL_BATCH):
+        yield values[start:start + SQL_BATCH]
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,102 @@
+"""
+Measures what the BM25 pre-filter enabled by CONTEXT_PREFILTER_CHUNKS costs in recall: for every
+query, the k chunks most similar to it when every chunk is embedded are the baseline, and
+recall@k is the share of them still selected when only the pre-filtered chunks are embedded.
+
+Usage:
+    python tests/context-prefilter-eval.py [directory of .html, .txt and .md pages]
+        [--query QUERY ...] [--k 10] [--prefilter 25 50 100 200] [--embedding provider:model]
+
+Pages are split into chunks like scraped pages in ContextCompressor. Without queries the page
+titles are used. Embeddings come from the EMBEDDING configuration unless --embedding is given;
+the chunks are embedded once, for the baseline.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from lxml import html
+
+from gpt_researcher.config import Config
+from gpt_researcher.context.compression import (
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    lexical_candidates,
+    similarity_matrix,
+    top_k_indices,
+)
+from gpt_researcher.memory import Memory
+from gpt_researcher.scraper.lxml_scraper.lxml_scraper import LxmlScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "docs", "html")
+
+
+def load_pages(directory):
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        extension = os.path.splitext(name)[1].lower()
+        if extension in (".html", ".htm"):
+            with open(path, "rb") as f:
+                content, _, title = LxmlScraper(f"https://example.com/{name}").extract_from_tree(html.fromstring(f.read()))
+        elif extension in (".txt", ".md"):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                content = f.read()
+            title = next((line.strip("# \t") for line in content.splitlines() if line.strip()), name)
+        else:
+            continue
+        if content:
+            pages.append((title, content))
+    return pages
+
+
+async def evaluate(args):
+    pages = load_pages(args.directory)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks = list(dict.fromkeys(chunk for _, content in pages for chunk in splitter.split_text(content)))
+    queries = args.query or [title for title, _ in pages]
+    print(f"{len(pages)} pages, {len(chunks)} chunks, {len(queries)} queries, recall@{args.k}")
+
+    cfg = Config()
+    provider, model = Config.parse_embedding(args.embedding) if args.embedding else (cfg.embedding_provider, cfg.embedding_model)
+    embeddings = Memory(provider, model, **cfg.embedding_kwargs).get_embeddings()
+    start = time.perf_counter()
+    chunk_vectors, query_vectors = await asyncio.gather(
+        embeddings.aembed_documents(chunks),
+        asyncio.gather(*[embeddings.aembed_query(query) for query in queries]),
+    )
+    print(f"embedded every chunk with {provider}:{model} in {time.perf_counter() - start:.2f} s")
+
+    scores = similarity_matrix(query_vectors, chunk_vectors)
+    baseline = [set(top_k_indices(query_scores, args.k, -1.0).tolist()) for query_scores in scores]
+
+    print(f"{'prefilter':>10}{'embedded':>10}{'share':>8}{'recall':>8}{'bm25 ms':>10}")
+    for max_chunks in args.prefilter:
+        start = time.perf_counter()
+        candidates = np.array(lexical_candidates(queries, chunks, max_chunks))
+        elapsed = time.perf_counter() - start
+        recalls = [
+            len(set(candidates[top_k_indices(query_scores[candidates], args.k, -1.0)].tolist()) & expected)
+            / len(expected)
+            for query_scores, expected in zip(scores, baseline)
+            if expected
+        ]
+        print(f"{max_chunks:>10}{len(candidates):>10}{len(candidates) / len(chunks):>8.0%}"
+              f"{np.mean(recalls):>8.3f}{elapsed * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--query", action="append")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--prefilter", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--embedding")
+    asyncio.run(evaluate(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
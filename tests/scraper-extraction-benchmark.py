@@ -0,0 +1,78 @@
+"""
+Compares the HTML text extractors on saved pages: extraction time, output size and the share of
+duplicated lines in the output.
+
+Usage:
+    python tests/scraper-extraction-benchmark.py [directory of .html files] [--repeat N]
+
+Without a directory the fixtures in tests/docs/html are used.
+"""
+import argparse
+import os
+import time
+from collections import Counter
+
+from gpt_researcher.scraper import BeautifulSoupScraper, LxmlScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "docs", "html")
+EXTRACTORS = {
+    "bs": BeautifulSoupScraper,
+    "lxml": LxmlScraper,
+}
+
+
+class SavedPage:
+    """Minimal stand-in for a downloaded response, read from a saved file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.content = f.read()
+        self.encoding = None
+        self.headers = {"Content-Type": "text/html"}
+        self.url = "https://example.com/" + os.path.basename(path)
+
+
+def duplicate_ratio(content: str) -> float:
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    if not lines:
+        return 0.0
+    counts = Counter(lines)
+    return sum(count - 1 for count in counts.values()) / len(lines)
+
+
+def benchmark(pages, repeat):
+    print(f"{'page':<28}{'extractor':<10}{'ms/page':>10}{'chars':>10}{'lines':>8}{'dup %':>8}{'images':>8}")
+    totals = {name: [0.0, 0] for name in EXTRACTORS}
+    for page in pages:
+        for name, extractor_class in EXTRACTORS.items():
+            extractor = extractor_class(page.url)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                content, image_urls, title = extractor.extract(page)
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            totals[name][0] += elapsed
+            totals[name][1] += len(content)
+            print(f"{os.path.basename(page.url)[:27]:<28}{name:<10}{elapsed:>10.2f}{len(content):>10}"
+                  f"{len(content.splitlines()):>8}{duplicate_ratio(content) * 100:>8.1f}{len(image_urls):>8}")
+
+    print()
+    for name, (elapsed, chars) in totals.items():
+        print(f"{name:<10} total {elapsed:>10.2f} ms  {chars:>10} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.directory, name)
+        for name in os.listdir(args.directory)
+        if name.endswith((".html", ".htm"))
+    )
+    benchmark([SavedPage(path) for path in paths], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
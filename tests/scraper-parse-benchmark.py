@@ -0,0 +1,88 @@
+"""
+Compares extracting downloaded HTML pages in worker threads (the default) with the process pool
+enabled by SCRAPER_PARSE_WORKERS.
+
+Usage:
+    python tests/scraper-parse-benchmark.py [directory of .html files] [--pages N]
+        [--workers N] [--batch-size N] [--extractor lxml|bs|web_base_loader]
+
+Without a directory the fixtures in tests/docs/html are used. The corpus is repeated until it
+holds `--pages` pages, which are all extracted concurrently like the results of one research.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from gpt_researcher.scraper import Scraper
+from gpt_researcher.scraper.fetcher import FetchResponse
+from gpt_researcher.scraper.parse_pool import ParsePool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "docs", "html")
+
+
+def load_corpus(directory, pages):
+    bodies = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                bodies.append((name, f.read()))
+    corpus = []
+    while len(corpus) < pages:
+        name, content = bodies[len(corpus) % len(bodies)]
+        url = f"https://example.com/{len(corpus)}/{name}"
+        corpus.append(FetchResponse(url, 200, {"Content-Type": "text/html"}, content, content_type="text/html"))
+    return corpus
+
+
+async def extract_in_threads(extractor_class, corpus):
+    return await asyncio.gather(
+        *[asyncio.to_thread(extractor_class(response.url).extract, response) for response in corpus]
+    )
+
+
+async def extract_in_processes(pool, extractor_class, corpus):
+    return await asyncio.gather(
+        *[pool.extract(extractor_class, response.url, response) for response in corpus]
+    )
+
+
+async def benchmark(args):
+    extractor_class = Scraper.SCRAPER_CLASSES[args.extractor]
+    corpus = load_corpus(args.directory, args.pages)
+    size_mb = sum(len(response.content) for response in corpus) / 1024 / 1024
+    print(f"{len(corpus)} pages ({size_mb:.1f} MB), extractor {extractor_class.__name__}, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    threaded = await extract_in_threads(extractor_class, corpus)
+    elapsed = time.perf_counter() - start
+    print(f"{'threads':<32}{elapsed:>8.2f} s{len(corpus) / elapsed:>10.1f} pages/s")
+
+    pool = ParsePool(args.workers, args.batch_size)
+    try:
+        # Start the workers (spawn imports the package in every one) before timing
+        await extract_in_processes(pool, extractor_class, corpus[:args.workers * args.batch_size])
+        start = time.perf_counter()
+        pooled = await extract_in_processes(pool, extractor_class, corpus)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    label = f"processes ({args.workers} x batch {args.batch_size})"
+    print(f"{label:<32}{elapsed:>8.2f} s{len(corpus) / elapsed:>10.1f} pages/s")
+
+    mismatches = sum(1 for a, b in zip(threaded, pooled) if a[0] != b[0])
+    print(f"outputs differing between modes: {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--extractor", default="lxml", choices=["lxml", "bs", "web_base_loader"])
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.context.compression import ContextCompressor, lexical_candidates, similarity_matrix, top_k_indices
+
+VOCABULARY = ["battery", "fusion", "solar", "wind"]
+
+
+class KeywordEmbeddings(Embeddings):
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def _vector(self, text):
+        return [float(text.lower().count(word)) for word in VOCABULARY]
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self._vector(text)
+
+
+def test_top_k_indices():
+    scores = np.array([0.2, 0.9, 0.5, 0.36, 0.8], dtype=np.float32)
+    assert top_k_indices(scores, 2, 0.35).tolist() == [1, 4]
+    assert top_k_indices(scores, 10, 0.35).tolist() == [1, 4, 2, 3]
+    assert top_k_indices(scores, 3, 0.95).tolist() == []
+    assert top_k_indices(scores, 3, 0.95, fallback=2).tolist() == [1, 4]
+    assert top_k_indices(np.zeros(3, dtype=np.float32), 3, 0.95, fallback=2).tolist() == []
+
+
+def test_similarity_matrix_is_cosine():
+    scores = similarity_matrix([[1.0, 0.0], [0.0, 0.0]], [[3.0, 0.0], [1.0, 1.0]])
+    assert np.allclose(scores, [[1.0, np.sqrt(0.5)], [0.0, 0.0]])
+
+
+def test_chunks_are_embedded_once_for_all_queries():
+    pages = [
+        {"url": "https://example.com/a", "title": "A", "raw_content": "Battery chemistry and battery recycling"},
+        {"url": "https://example.com/b", "title": "B", "raw_content": "Fusion reactors"},
+        {"url": "https://example.com/c", "title": "C", "raw_content": "Fusion reactors"},
+    ]
+    embeddings = KeywordEmbeddings()
+    compressor = ContextCompressor(documents=pages, embeddings=embeddings)
+
+    battery, fusion, tides = asyncio.run(
+        compressor.async_get_contexts(["battery", "fusion", "tides"], max_results=5)
+    )
+
+    assert battery == (
+        "Source: https://example.com/a\nTitle: A\nRelevance: 1.00\n"
+        "Content: Battery chemistry and battery recycling\n"
+    )
+    assert fusion == "Source: https://example.com/b\nTitle: B\nRelevance: 1.00\nContent: Fusion reactors\n"
+    assert tides == ""
+    assert embeddings.documents == ["Battery chemistry and battery recycling", "Fusion reactors"]
+    assert embeddings.queries == ["battery", "fusion", "tides"]
+
+
+def test_best_chunks_are_kept_when_none_clears_the_threshold():
+    pages = [
+        {"url": "https://example.com/a", "title": "A", "raw_content": "Solar and wind"},
+        {"url": "https://example.com/b", "title": "B", "raw_content": "Fusion"},
+    ]
+    compressor = ContextCompressor(documents=pages, embeddings=KeywordEmbeddings(), similarity_threshold="0.9")
+
+    assert asyncio.run(compressor.async_get_context("solar battery")) == (
+        "Source: https://example.com/a\nTitle: A\nRelevance: 0.50\nContent: Solar and wind\n"
+    )
+    compressor.fallback_results = 0
+    assert asyncio.run(compressor.async_get_context("solar battery")) == ""
+
+
+def test_prefilter_embeds_only_keyword_matches():
+    pages = [
+        {"url": f"https://example.com/{i}", "title": str(i), "raw_content": text}
+        for i, text in enumerate(["Battery recycling plants", "Fusion reactors", "Battery chemistry", "Wind farms"])
+    ]
+    embeddings = KeywordEmbeddings()
+    compressor = ContextCompressor(documents=pages, embeddings=embeddings, prefilter_chunks=1)
+
+    battery, wind = asyncio.run(compressor.async_get_contexts(["battery chemistry", "wind"]))
+
+    assert embeddings.documents == ["Battery chemistry", "Wind farms"]
+    assert battery.startswith("Source: https://example.com/2\n")
+    assert wind.startswith("Source: https://example.com/3\n")
+    # Without any keyword match, every chunk is ranked
+    assert lexical_candidates(["tides"], ["Battery", "Wind"], 1) == [0, 1]
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.memory import CachedEmbeddings, EmbeddingCache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        time.sleep(self.delay)
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_chunks_are_embedded_once(tmp_path):
+    provider = CountingEmbeddings()
+    embeddings = CachedEmbeddings(provider, EmbeddingCache(str(tmp_path / "embeddings.sqlite")), "test:model")
+
+    assert embeddings.embed_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert embeddings.embed_documents(["bb", "ccc", "ccc"]) == [[2.0, 1.0], [3.0, 1.0], [3.0, 1.0]]
+    assert asyncio.run(embeddings.aembed_documents(["a", "ccc"])) == [[1.0, 1.0], [3.0, 1.0]]
+    assert provider.embedded == ["a", "bb", "ccc"]
+
+    # Queries are cached apart from documents, other models don't share vectors
+    assert embeddings.embed_query("a") == [1.0, 0.0]
+    CachedEmbeddings(provider, embeddings.cache, "test:other").embed_documents(["a"])
+    assert provider.embedded == ["a", "bb", "ccc", "a", "a"]
+
+    # Persisted vectors are reused by a new process
+    restarted = CachedEmbeddings(provider, EmbeddingCache(str(tmp_path / "embeddings.sqlite")), "test:model")
+    assert restarted.embed_documents(["bb"]) == [[2.0, 1.0]]
+    assert restarted.cache.stats()["disk_hits"] == 1
+    assert len(provider.embedded) == 5
+
+
+def test_concurrent_requests_share_one_embedding_call():
+    provider = CountingEmbeddings(delay=0.1)
+    cache = EmbeddingCache()
+    results = []
+
+    def embed():
+        results.append(CachedEmbeddings(provider, cache, "test:model").embed_documents(["page chunk"]))
+
+    threads = [threading.Thread(target=embed) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[[10.0, 1.0]]] * 4
+    assert provider.embedded == ["page chunk"]
+    assert cache.stats()["coalesced"] == 3
+
+
+def test_least_recently_used_vectors_are_evicted():
+    cache = EmbeddingCache(max_size_mb=120 / 1024 / 1024)  # room for two 8 byte vectors and their 52 byte keys
+    embeddings = CachedEmbeddings(CountingEmbeddings(), cache, "test:model")
+    for text in ["a", "b", "a", "c"]:
+        embeddings.embed_documents([text])
+
+    assert cache.stats()["evictions"] == 1
+    embeddings.embed_documents(["a"])
+    assert cache.stats()["misses"] == 3
+
+
+def test_async_embeddings_are_persisted_in_one_batch(tmp_path):
+    provider = CountingEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    texts = [f"chunk {i}" for i in range(300)]
+    asyncio.run(CachedEmbeddings(provider, cache, "test:model").aembed_documents(texts))
+    assert len(cache.store) == 300
+
+    restarted = CachedEmbeddings(provider, EmbeddingCache(str(tmp_path / "embeddings.sqlite")), "test:model")
+    assert asyncio.run(restarted.aembed_documents(texts[:2] + ["new"])) == [[7.0, 1.0], [7.0, 1.0], [3.0, 1.0]]
+    assert restarted.cache.stats()["disk_hits"] == 2
+    assert provider.embedded[300:] == ["new"]
+
+
+def test_only_texts_sent_to_the_provider_are_charged(tmp_path):
+    sent = []
+    embeddings = CachedEmbeddings(CountingEmbeddings(), EmbeddingCache(), "test:model", on_embed=sent.append)
+
+    embeddings.embed_documents(["a", "bb"])
+    asyncio.run(embeddings.aembed_documents(["a", "bb", "ccc"]))
+    embeddings.embed_query("a")
+
+    assert sent == [["a", "bb"], ["ccc"], ["a"]]
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.scraper.host_limiter import HostLimiter, HostUnavailable
+from gpt_researcher.utils.rate_limit import TokenBucket
+
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert not bucket.try_acquire()
+
+
+def test_concurrency_is_capped_per_host():
+    limiter = HostLimiter(max_concurrency_per_host=2, requests_per_second=0)
+    peak = {"a.com": 0, "b.com": 0}
+
+    async def fetch(url, host):
+        async with limiter.acquire(url):
+            peak[host] = max(peak[host], limiter.hosts[host].in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*[fetch(f"https://a.com/{i}", "a.com") for i in range(6)],
+                             *[fetch(f"https://b.com/{i}", "b.com") for i in range(1)])
+
+    asyncio.run(main())
+    assert peak == {"a.com": 2, "b.com": 1}
+    assert limiter.stats()["a.com"]["requests"] == 6
+
+
+def test_circuit_opens_after_consecutive_failures():
+    limiter = HostLimiter(requests_per_second=0, failure_threshold=2, cooldown=0.05)
+
+    async def fail():
+        async with limiter.acquire("https://slow.com/page"):
+            raise asyncio.TimeoutError()
+
+    async def succeed():
+        async with limiter.acquire("https://slow.com/page") as slot:
+            slot.record_status(200)
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await fail()
+        with pytest.raises(HostUnavailable):
+            await succeed()
+        assert limiter.stats()["slow.com"]["circuit"] == "open"
+
+        await asyncio.sleep(0.06)
+        await succeed()  # the probe closes the circuit again
+
+    asyncio.run(main())
+    stats = limiter.stats()["slow.com"]
+    assert stats["circuit"] == "closed"
+    assert (stats["failures"], stats["timeouts"], stats["skipped"]) == (2, 2, 1)
+
+
+def test_timeout_adapts_to_host_latency():
+    limiter = HostLimiter(requests_per_second=0)
+
+    async def fetch(delay):
+        async with limiter.acquire("https://fast.com/page"):
+            await asyncio.sleep(delay)
+
+    async def main():
+        assert limiter.first_byte_timeout("https://fast.com/page", 4) is None
+        for _ in range(5):
+            await fetch(0.01)
+
+    asyncio.run(main())
+    assert limiter.first_byte_timeout("https://fast.com/page", 4) == 1.0
+    assert limiter.first_byte_timeout("https://other.com/page", 4) is None
+
+
+def test_reported_first_byte_time_is_sampled():
+    limiter = HostLimiter(requests_per_second=0)
+
+    async def fetch():
+        async with limiter.acquire("https://docs.com/report.pdf") as slot:
+            slot.record_first_byte(1.0)
+            await asyncio.sleep(0.02)  # a long body download doesn't count as latency
+
+    async def main():
+        for _ in range(5):
+            await fetch()
+
+    asyncio.run(main())
+    assert limiter.first_byte_timeout("https://docs.com/report.pdf", 4) == 3.0
@@ -0,0 +1,69 @@
+import json
+import os
+
+from gpt_researcher.retrievers.local_index import local_index
+from gpt_researcher.retrievers.local_index.local_index import LocalIndex, LocalIndexSearch
+
+
+def _write_corpus(corpus):
+    (corpus / "pages").mkdir(parents=True)
+    (corpus / "pages" / "batteries.html").write_text(
+        "<html><head><title>Solid state batteries</title></head><body>"
+        "<p>Solid state batteries replace the liquid electrolyte with a solid one.</p></body></html>"
+    )
+    (corpus / "pages" / "fusion.md").write_text("# Fusion\n\nTokamaks confine plasma with magnetic fields.\n")
+    with open(corpus / "articles.jsonl", "w") as f:
+        for i, text in enumerate(["Lithium mining and battery recycling", "Growing tomatoes at home"]):
+            f.write(json.dumps({"url": f"https://example.com/{i}", "title": f"Article {i}", "content": text}) + "\n")
+
+
+def test_search_ranks_matching_documents(tmp_path, monkeypatch):
+    corpus = tmp_path / "corpus"
+    _write_corpus(corpus)
+    monkeypatch.setenv("LOCAL_INDEX_CORPUS", str(corpus))
+    monkeypatch.delenv("LOCAL_INDEX_PATH", raising=False)
+
+    results = LocalIndexSearch("solid electrolyte batteries").search(max_results=5)
+
+    assert [result["href"] for result in results] == [(corpus / "pages" / "batteries.html").as_uri()]
+    assert results[0]["title"] == "Solid state batteries"
+    assert "liquid electrolyte" in results[0]["raw_content"]
+    # Short documents are complete all the same, file:// urls can't be scraped
+    assert results[0]["raw_content_complete"] is True
+    assert LocalIndexSearch("battery recycling").search()[0]["href"] == "https://example.com/0"
+    assert os.path.isdir(f"{corpus}.index")
+
+
+def test_update_reindexes_changed_and_removed_files(tmp_path):
+    corpus = tmp_path / "corpus"
+    _write_corpus(corpus)
+    index = LocalIndex(str(tmp_path / "index"))
+    assert index.update(str(corpus)) == 4
+    assert index.update(str(corpus)) == 0
+
+    (corpus / "pages" / "fusion.md").write_text("# Fusion\n\nStellarators twist the magnetic field.\n")
+    (corpus / "articles.jsonl").unlink()
+    assert index.update(str(corpus)) == 1
+
+    assert index.num_docs == 2
+    assert [doc["title"] for doc in index.search("stellarators")] == ["Fusion"]
+    assert index.search("tokamaks") == []
+    assert index.search("tomatoes") == []
+
+    reopened = LocalIndex(str(tmp_path / "index"))
+    assert reopened.num_docs == 2
+    assert reopened.search("stellarators")[0]["content"].startswith("# Fusion")
+
+
+def test_later_refreshes_run_in_the_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_index, "REFRESH_INTERVAL", 0)
+    corpus = tmp_path / "corpus"
+    _write_corpus(corpus)
+    index = LocalIndex(str(tmp_path / "index"))
+    index.refresh(str(corpus))
+    assert index.num_docs == 4
+
+    (corpus / "notes.txt").write_text("Stellarators twist the magnetic field.")
+    index.refresh(str(corpus))
+    with index._refresh_lock:  # held until the background update is done
+        assert [doc["title"] for doc in index.search("stellarators")] == ["Stellarators twist the magnetic field."]
@@ -0,0 +1,40 @@
+import os
+
+from gpt_researcher.scraper import LxmlScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "docs", "html")
+
+
+class SavedPage:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.encoding = None
+
+
+def extract(html: bytes, link: str = "https://example.com/page"):
+    return LxmlScraper(link).extract(SavedPage(html))
+
+
+def test_nested_text_is_emitted_once():
+    content, _, title = extract(
+        b"<html><head><title>Nested</title></head><body>"
+        b"<div><div><div><p>The innermost paragraph has enough words.</p></div>"
+        b"Trailing text of the middle div.</div></div></body></html>"
+    )
+    assert title == "Nested"
+    assert content.splitlines() == [
+        "The innermost paragraph has enough words.",
+        "Trailing text of the middle div.",
+    ]
+
+
+def test_boilerplate_is_dropped():
+    with open(os.path.join(FIXTURES_DIR, "news.html"), "rb") as f:
+        content, image_urls, title = extract(f.read())
+
+    assert title == "City council approves new bike lanes - Daily Courier"
+    assert content.startswith("City council approves new bike lanes\n")
+    assert "construction is expected to begin in march" in content.lower()
+    for boilerplate in ("Subscribe now", "Politics", "Related: New bus routes", "Next page", "Advertise"):
+        assert boilerplate not in content
+    assert image_urls == [{"url": "https://cdn.dailycourier.example/photos/bike-lane.jpg", "score": 2}]
@@ -0,0 +1,79 @@
+from gpt_researcher.scraper.cache import PageCache, PaperCache, normalize_url
+from gpt_researcher.utils.disk_cache import DiskCache
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.com:443/a?b=2&a=1&utm_source=x#top") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("https://github.com/o/r/blob/x.py?ref=dev&fbclid=1") == "https://github.com/o/r/blob/x.py?ref=dev"
+
+
+def test_page_cache_roundtrip(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    url = "https://example.com/article"
+
+    assert cache.get(url) is None
+    cache.set(url, "content", "Title", [{"url": "https://example.com/a.png", "score": 2}], etag='"abc"')
+
+    page = cache.get(url + "#section")
+    assert page["raw_content"] == "content"
+    assert page["title"] == "Title"
+    assert page["stale"] is False
+    assert PageCache.conditional_headers(page) == {"If-None-Match": '"abc"'}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_page_cache_stale_and_revalidate(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"), ttl=0)
+    url = "https://example.com/article"
+    cache.set(url, "content", "Title", [], last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+
+    assert cache.get(url) is None
+    page = cache.get(url, allow_stale=True)
+    assert page["stale"] is True
+    assert PageCache.conditional_headers(page) == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    cache.mark_revalidated(url)
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_page_cache_lru_eviction(tmp_path):
+    cache = PageCache(str(tmp_path / "pages.sqlite"), max_size_mb=0.001)
+    for i in range(5):
+        cache.set(f"https://example.com/{i}", "x" * 400, "", [])
+
+    assert cache.get("https://example.com/0") is None
+    assert cache.get("https://example.com/4") is not None
+    assert cache.stats()["evictions"] > 0
+
+
+def test_disk_cache_tracks_size_across_replacements(tmp_path):
+    store = DiskCache(str(tmp_path / "store.sqlite"), max_size_bytes=1000)
+    store.set("a", b"x" * 400)
+    store.set("b", b"x" * 400)
+    store.set("a", b"x" * 100)
+    assert store.stats()["size_bytes"] == 500
+
+    # The hit on "a" is buffered, but still protects it from eviction
+    assert store.get("a") is not None
+    store.set("c", b"x" * 600)
+    assert store.get("b") is None
+    assert store.stats()["size_bytes"] == 700
+    store.close()
+
+    reopened = DiskCache(str(tmp_path / "store.sqlite"))
+    assert reopened.stats()["size_bytes"] == 700
+    assert reopened.get("a").value == b"x" * 100
+
+
+def test_paper_cache_roundtrip(tmp_path):
+    cache = PaperCache(str(tmp_path / "papers.sqlite"))
+
+    assert cache.get("arxiv:2101.00001v1") is None
+    cache.set("arxiv:2101.00001v1", "full text", "Paper", [])
+
+    assert cache.get("arxiv:2101.00001v1") == {"raw_content": "full text", "title": "Paper", "image_urls": []}
+    assert cache.stats()["hits"] == 1
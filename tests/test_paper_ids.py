@@ -0,0 +1,16 @@
+import arxiv
+
+from gpt_researcher.retrievers.arxiv.arxiv import ArxivSearch
+from gpt_researcher.retrievers.semantic_scholar.semantic_scholar import SemanticScholarSearch
+
+
+def test_arxiv_and_semantic_scholar_share_paper_ids():
+    arxiv_result = arxiv.Result(entry_id="http://arxiv.org/abs/2101.00001v2")
+    semantic_scholar_result = {
+        "paperId": "abc123",
+        "externalIds": {"ArXiv": "2101.00001", "DOI": "10.48550/arXiv.2101.00001"},
+    }
+
+    assert ArxivSearch._paper_id(arxiv_result) == "arxiv:2101.00001"
+    assert SemanticScholarSearch._paper_id(semantic_scholar_result) == ArxivSearch._paper_id(arxiv_result)
+    assert ArxivSearch._paper_id(arxiv.Result(entry_id="http://arxiv.org/abs/hep-th/9901001v1")) == "arxiv:hep-th/9901001"
@@ -0,0 +1,34 @@
+from gpt_researcher.retrievers.pubmed_central.pubmed_central import ArticleReader, PubMedCentralSearch
+
+
+def article(pmc_id, body=True):
+    return (
+        "<article><front><article-meta>"
+        f'<article-id pub-id-type="pmid">9{pmc_id}</article-id>'
+        f'<article-id pub-id-type="pmc">{pmc_id}</article-id>'
+        f"<title-group><article-title>Title {pmc_id}</article-title></title-group>"
+        f"<abstract><p>Abstract {pmc_id}</p></abstract>"
+        "</article-meta></front>"
+        + (f"<body><p>Body of {pmc_id}</p></body>" if body else "")
+        + "</article>"
+    )
+
+
+def test_article_reader_parses_batches_incrementally():
+    xml = ("<?xml version='1.0'?><pmc-articleset>" + article("12") + article("11", body=False)
+           + article("10") + "</pmc-articleset>").encode()
+
+    reader = ArticleReader()
+    for i in range(0, len(xml), 16):
+        reader.feed(xml[i:i + 16])
+    articles = reader.close()
+
+    assert list(articles) == ["12", "10"]
+    assert articles["10"] == {"title": "Title 10", "abstract": "Abstract 10", "body": "Body of 10"}
+
+    # Results keep the relevance order of the search, not the order of the efetch response
+    results = PubMedCentralSearch._search_response(["10", "11", "12"], articles, max_results=5)
+    assert [r["href"] for r in results] == [
+        "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC10/",
+        "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC12/",
+    ]
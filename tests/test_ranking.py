@@ -0,0 +1,24 @@
+from gpt_researcher.actions.ranking import fuse_search_results
+
+
+def results(*urls, body=""):
+    return [{"href": url, "body": body} for url in urls]
+
+
+def test_urls_found_by_several_retrievers_rank_first():
+    ranked = fuse_search_results("query", [
+        results("https://a.com", "https://b.com", "https://c.com"),
+        results("https://c.com/#top", "https://e.com", "https://d.com"),
+    ])
+    assert [r["href"] for r in ranked] == ["https://c.com", "https://a.com", "https://b.com", "https://e.com", "https://d.com"]
+
+
+def test_retriever_weights_and_snippets():
+    ranked = fuse_search_results("solar panel efficiency", [
+        results("https://a.com", body="celebrity gossip"),
+        results("https://b.com", body="solar panel efficiency records"),
+    ])
+    assert ranked[0]["href"] == "https://b.com"
+
+    ranked = fuse_search_results("query", [results("https://a.com"), results("https://b.com")], weights=[0.2, 1.0])
+    assert ranked[0]["href"] == "https://b.com"
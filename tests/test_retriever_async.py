@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from gpt_researcher.retrievers.utils import search_async
+
+
+class BlockingRetriever:
+    def __init__(self, query, delay=0.2):
+        self.query = query
+        self.delay = delay
+
+    def search(self, max_results=7):
+        time.sleep(self.delay)
+        return [{"href": f"https://blocking.com/{i}"} for i in range(max_results)]
+
+
+class AsyncRetriever(BlockingRetriever):
+    async def asearch(self, max_results=7):
+        await asyncio.sleep(self.delay)
+        return [{"href": f"https://async.com/{i}"} for i in range(max_results)]
+
+
+def test_search_async_uses_retriever_defaults():
+    results = asyncio.run(search_async(BlockingRetriever("query", delay=0)))
+    assert len(results) == 7
+
+
+def test_retrievers_are_searched_concurrently():
+    async def main():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            search_async(BlockingRetriever("query"), max_results=3),
+            search_async(AsyncRetriever("query"), max_results=2),
+            search_async(BlockingRetriever("query"), max_results=1),
+        )
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(main())
+    assert [len(r) for r in results] == [3, 2, 1]
+    assert elapsed < 0.5
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from gpt_researcher.retrievers.quota import ProviderQuota, QuotaManager, parse_retry_after
+from gpt_researcher.retrievers.utils import request_json
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "2"}) == 2.0
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+
+def test_throttled_requests_are_retried_after_the_pause():
+    attempts = []
+
+    async def search(request):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "0.2"})
+        return web.json_response({"results": [len(attempts)]})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/search", search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await request_json(
+                "GET", f"http://127.0.0.1:{port}/search", provider="test-throttle", api_key="secret-key-1234"
+            )
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == {"results": [2]}
+    assert attempts[1] - attempts[0] >= 0.2
+
+    stats = QuotaManager.get_instance().stats()["test-throttle:...1234"]
+    assert (stats["requests"], stats["throttled"], stats["retries"], stats["failures"]) == (2, 1, 1, 0)
+
+
+def test_requests_queue_for_concurrency_and_rate():
+    quota = ProviderQuota(requests_per_minute=600, concurrency=2, burst=10)
+    peak = 0
+    in_flight = 0
+
+    async def request():
+        nonlocal peak, in_flight
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*[quota.run(request) for _ in range(15)])
+        return time.monotonic() - start
+
+    # 10 requests/s with a burst of 10: the last 5 requests wait for tokens
+    assert asyncio.run(main()) >= 0.4
+    assert peak == 2
+    assert quota.stats()["requests"] == 15
+
+
+def test_fan_out_is_not_spaced_out():
+    async def request():
+        await asyncio.sleep(0.01)
+
+    async def main(quota):
+        start = time.monotonic()
+        await asyncio.gather(*[quota.run(request) for _ in range(5)])
+        return time.monotonic() - start
+
+    # Unconfigured providers have no rate limit, configured ones allow a minute's requests at once
+    assert asyncio.run(main(QuotaManager().get("unconfigured"))) < 0.2
+    assert asyncio.run(main(ProviderQuota(requests_per_minute=60))) < 0.2
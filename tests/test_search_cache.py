@@ -0,0 +1,41 @@
+import asyncio
+
+from gpt_researcher.retrievers.cache import SearchCache, normalize_query
+from gpt_researcher.retrievers.utils import search_async
+
+
+class CountingRetriever:
+    calls = 0
+
+    def __init__(self, query, topic="general"):
+        self.query = query
+        self.topic = topic
+
+    def search(self, max_results=7):
+        CountingRetriever.calls += 1
+        return [{"href": f"https://example.com/{i}", "body": self.query} for i in range(max_results)]
+
+
+def test_normalize_query():
+    assert normalize_query("  What is   RRF?\n") == "what is rrf?"
+
+
+def test_repeated_searches_are_served_from_cache(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite"))
+    CountingRetriever.calls = 0
+
+    async def main():
+        first = await search_async(CountingRetriever("What is RRF"), max_results=3, cache=cache)
+        again = await search_async(CountingRetriever("what is  rrf"), max_results=3, cache=cache)
+        more = await search_async(CountingRetriever("what is rrf"), max_results=5, cache=cache)
+        news = await search_async(CountingRetriever("what is rrf", topic="news"), max_results=3, cache=cache)
+        return first, again, more, news
+
+    first, again, more, news = asyncio.run(main())
+    assert again == first
+    assert len(more) == 5
+    assert CountingRetriever.calls == 3
+
+    stats = SearchCache(str(tmp_path / "search.sqlite")).stats()
+    assert stats["entries"] == 3
+    assert cache.stats()["hits_by_retriever"] == {"CountingRetriever": 1}
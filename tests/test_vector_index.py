@@ -0,0 +1,68 @@
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.document import DocumentIndex
+from gpt_researcher.vector_store import VectorIndex
+import gpt_researcher.vector_store.vector_index as vector_index
+
+VOCABULARY = ["battery", "fusion", "solar", "wind"]
+
+
+class KeywordEmbeddings(Embeddings):
+    def __init__(self):
+        self.documents = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(text.lower().count(word)) + 0.01 for word in VOCABULARY]
+
+
+def test_upserts_and_deletes_survive_reopening(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "MIN_TRAINING_VECTORS", 64)
+    monkeypatch.setattr(vector_index, "MAX_SEGMENTS", 3)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((400, 16)).astype(np.float32)
+    index = VectorIndex(str(tmp_path / "index"))
+    for start in range(0, 400, 50):
+        ids = list(range(start, start + 50))
+        index.upsert(ids, vectors[start:start + 50], [{"id": i} for i in ids])
+
+    vectors[:10] = -vectors[:10]
+    index.upsert(list(range(10)), vectors[:10], [{"id": i, "updated": True} for i in range(10)])
+    assert index.delete(range(10, 20)) == 10
+    assert len(index) == 390
+    assert len(index.meta["segments"]) <= 3
+    assert index.meta["centroids"] is not None
+
+    reopened = VectorIndex(str(tmp_path / "index"))
+    results = reopened.search(vectors[:20], k=1, nprobe=10**6)
+    assert [hits[0][0] for hits in results[:10]] == list(range(10))
+    assert all(hits[0][1] > 0.99 for hits in results[:10])
+    assert all(hits[0][0] not in range(10, 20) for hits in results[10:])
+    assert reopened.get([0, 15]) == {0: {"id": 0, "updated": True}}
+
+
+def test_document_index_only_embeds_changed_files(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "battery.txt").write_text("Battery recycling recovers lithium.")
+    (docs / "fusion.txt").write_text("Fusion reactors confine plasma.")
+    embeddings = KeywordEmbeddings()
+    index = DocumentIndex(str(docs), str(tmp_path / "index"))
+
+    assert index.update(embeddings, "test:model") == 2
+    assert index.update(embeddings, "test:model") == 0
+    (docs / "fusion.txt").write_text("Solar and wind power.")
+    (docs / "battery.txt").unlink()
+    assert index.update(embeddings, "test:model") == 1
+    assert embeddings.documents[-1] == "Solar and wind power."
+
+    reopened = DocumentIndex(str(docs), str(tmp_path / "index"))
+    battery, solar = reopened.search([embeddings.embed_query("battery"), embeddings.embed_query("solar")],
+                                     similarity_threshold=0.5)
+    assert battery == []
+    assert [(chunk["url"], chunk["content"]) for chunk in solar] == [("fusion.txt", "Solar and wind power.")]
+    assert reopened.update(embeddings, "test:other") == 1